@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Application Journal
+Append-only, crash-safe record of job applications.
+
+Every application is written as one JSON line and fsync'd immediately,
+so a crash mid-session loses at most the record being written. The
+journal is compacted (one line per job id) every so often, and loading
+it at startup is a single streaming pass.
+
+Record format (one per line):
+    {"id": "...", "ts": "2025-01-01T10:00:00", "title": "...", "company": "..."}
+
+An existing applied_jobs_history.json from older versions is imported
+the first time the journal is created.
+"""
+
+import json
+import os
+from datetime import datetime
+
+class ApplicationJournal:
+    def __init__(self, path='applied_jobs_journal.jsonl', legacy_path='applied_jobs_history.json', compact_every=500):
+        """
+        Initialize the application journal.
+
+        Args:
+            path (str): Journal file (JSON lines)
+            legacy_path (str): Old whole-file history to import once, if present
+            compact_every (int): Compact after this many appends
+        """
+        self.path = path
+        self.legacy_path = legacy_path
+        self.compact_every = compact_every
+        self.records = {}
+        self.appends_since_compact = 0
+        self.file = None
+
+    def load(self):
+        """Load the journal and return the set of applied job ids."""
+        self.records = {}
+
+        if os.path.exists(self.path):
+            line_count = 0
+            torn = 0
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line_count += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        torn += 1
+                        continue
+                    # A partial line can still parse, e.g. as a bare number
+                    if not isinstance(record, dict) or not isinstance(record.get('id'), (str, int)):
+                        torn += 1
+                        continue
+                    self.records[record['id']] = record
+            # Start compacting sooner if the file already carries duplicates
+            self.appends_since_compact = line_count - len(self.records)
+            if torn:
+                # A crash left a partial line; rewrite so new appends start clean
+                print(f"⚠️ Skipped {torn} damaged journal line(s)")
+                self.compact()
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            self._import_legacy()
+
+        return set(self.records)
+
+    def _import_legacy(self):
+        """Import job ids from the old applied_jobs_history.json format."""
+        try:
+            with open(self.legacy_path, 'r') as f:
+                data = json.load(f)
+            timestamp = data.get('last_updated') or datetime.now().isoformat()
+            for job_id in data.get('applied_jobs', []):
+                self.records[job_id] = {'id': job_id, 'ts': timestamp, 'title': '', 'company': ''}
+            self.compact()
+            print(f"📋 Imported {len(self.records)} jobs from {self.legacy_path}")
+        except Exception as e:
+            print(f"⚠️ Could not import legacy history: {e}")
+
+    def append(self, job_id, title='', company=''):
+        """Durably record one application."""
+        record = {
+            'id': job_id,
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'title': title,
+            'company': company
+        }
+
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+        self.records[job_id] = record
+        self.appends_since_compact += 1
+        if self.appends_since_compact >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal with one record per job id."""
+        self.close()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in self.records.values():
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._fsync_directory()
+        self.appends_since_compact = 0
+
+    def _fsync_directory(self):
+        """Make the rename itself durable (not supported on every platform)."""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """Close the append handle."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -10,43 +10,39 @@ Requirements:
     - selenium
     - webdriver-manager
     - Chrome browser installed
+    - requests (only for the browserless HTTP backend)
 """
 
 import time
 import sys
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_factory import create_driver
+from refresh_timing import RefreshTicker
+from change_detection import DOMChangeDetector
 
 class WebPageRefresher:
-    def __init__(self, url, refresh_interval=300):
+    def __init__(self, url, refresh_interval=300, missed_tick_policy='skip', change_regions=None):
         """
         Initialize the web page refresher.
         
         Args:
             url (str): The URL to refresh
             refresh_interval (int): Refresh interval in seconds (default: 300 = 5 minutes)
+            missed_tick_policy (str): 'skip' or 'coalesce' refreshes missed while a refresh overran
+            change_regions (dict): Region name -> CSS selector to watch for changes (default: whole page)
         """
         self.url = url
         self.refresh_interval = refresh_interval
+        self.missed_tick_policy = missed_tick_policy
         self.driver = None
+        self.change_detector = DOMChangeDetector(change_regions)
+        self.change_detector.on_change(self.report_change)
         
     def setup_driver(self):
         """Setup Chrome WebDriver with appropriate options."""
         try:
-            chrome_options = Options()
-            # Add options for better stability
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            # Automatically download and setup ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver = create_driver('refresh')
             
             print(f"✓ Chrome WebDriver initialized successfully")
             return True
@@ -76,6 +72,18 @@ class WebPageRefresher:
             print(f"✗ Error refreshing page: {e}")
             return False
     
+    def report_change(self, event):
+        """Print a change event from the change detector."""
+        print(f"🆕 Content changed in: {', '.join(event['regions'])}")
+    
+    def detect_changes(self):
+        """Hash the watched regions; returns the names of regions that changed, or None if the check failed."""
+        try:
+            return self.change_detector.check(self.driver)
+        except WebDriverException as e:
+            print(f"⚠️  Change detection failed: {e}")
+            return None
+    
     def start_auto_refresh(self):
         """Start the auto-refresh process."""
         if not self.setup_driver():
@@ -85,20 +93,29 @@ class WebPageRefresher:
             self.cleanup()
             return
         
+        # Baseline hashes for change detection
+        self.detect_changes()
+        
         print(f"\n🔄 Auto-refresh started!")
         print(f"📍 URL: {self.url}")
         print(f"⏰ Refresh interval: {self.refresh_interval} seconds ({self.refresh_interval//60} minutes)")
         print(f"\nPress Ctrl+C to stop the auto-refresh\n")
         
+        refresh_count = 0
+        ticker = RefreshTicker(self.refresh_interval, self.missed_tick_policy)
         try:
-            refresh_count = 0
             while True:
-                # Wait for the specified interval
-                time.sleep(self.refresh_interval)
+                # Wait for the next deadline on a fixed grid
+                ticker.wait()
                 
                 # Refresh the page
                 if self.refresh_page():
                     refresh_count += 1
+                    changed = self.detect_changes()
+                    if changed is None:
+                        print("? Content change unknown (check failed)")
+                    elif not changed:
+                        print("= No content change")
                     print(f"📊 Total refreshes: {refresh_count}")
                 else:
                     print("⚠️  Refresh failed, retrying...")
@@ -107,6 +124,7 @@ class WebPageRefresher:
         except KeyboardInterrupt:
             print(f"\n\n🛑 Auto-refresh stopped by user")
             print(f"📊 Total refreshes performed: {refresh_count}")
+            print(ticker.summary())
         except Exception as e:
             print(f"\n✗ Unexpected error: {e}")
         finally:
@@ -153,15 +171,23 @@ def get_user_input():
         except ValueError:
             print("❌ Please enter a valid number")
     
+    # Static pages can be kept alive without launching Chrome
+    needs_js = input("\nDoes this page need JavaScript/a real browser? (Y/n): ").strip().lower()
+    backend = 'http' if needs_js in ['n', 'no'] else 'browser'
+    
     interval_seconds = int(interval_minutes * 60)
-    return url, interval_seconds
+    return url, interval_seconds, backend
 
 def main():
     """Main function."""
     try:
-        url, interval = get_user_input()
+        url, interval, backend = get_user_input()
         
-        refresher = WebPageRefresher(url, interval)
+        if backend == 'http':
+            from http_refresh import HTTPRefresher
+            refresher = HTTPRefresher(url, interval)
+        else:
+            refresher = WebPageRefresher(url, interval)
         refresher.start_auto_refresh()
         
     except KeyboardInterrupt:
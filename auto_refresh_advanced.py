@@ -12,17 +12,24 @@ Features:
     - Enhanced error handling
     - Retry mechanism
     - Better logging
+    - Multi-URL monitoring from a single browser (one tab per URL)
 """
 
 import time
 import sys
 import os
+import heapq
+import threading
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException, TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_factory import create_driver
+from refresh_timing import RefreshTicker, AdaptiveIntervalPolicy
+from conditional_refresh import ConditionalRefreshChecker
+from change_detection import DOMChangeDetector, ScreenshotChangeDetector
+from resource_blocking import ResourceBlocker, resource_policy_for, format_bytes
+from network_capture import read_performance_log
+from refresh_metrics import RefreshMetrics
+from browser_profiles import BrowserInstance, prepare_template, DEFAULT_TEMPLATE_DIR, TMPFS_ROOT
 
 # Import configuration
 try:
@@ -46,6 +53,24 @@ except ImportError:
         'show_refresh_counter': True,
         'page_load_timeout': 30,
         'implicit_wait': 10,
+        'missed_tick_policy': 'skip',
+        'conditional_refresh': False,
+        'max_staleness_minutes': 15,
+        'screenshot_change_detection': False,
+        'screenshot_change_threshold': 0.02,
+        'resource_policies': {},
+        'refresh_metrics': False,
+        'metrics_history': 1000,
+        'metrics_prometheus_file': 'refresh_metrics.prom',
+        'metrics_csv_file': 'refresh_metrics.csv',
+        'adaptive_interval': False,
+        'adaptive_min_interval': 1,
+        'adaptive_max_interval': 60,
+        'adaptive_state_file': 'adaptive_intervals.json',
+        'tmpfs_profiles': False,
+        'tmpfs_root': '/dev/shm',
+        'profile_template_dir': '~/.cache/browser-auto-refresh/chrome-template',
+        'tmpfs_min_free_mb': 256,
     }
     QUICK_URLS = {}
     FAVORITE_URLS = {}
@@ -64,41 +89,56 @@ class AdvancedWebPageRefresher:
         self.driver = None
         self.retry_count = 0
         self.max_retries = CONFIG['max_retries']
+        self.conditional_checker = None
+        self.skipped_refreshes = 0
+        self.screenshot_detector = None
+        self.resource_policy = resource_policy_for(self.url, CONFIG.get('resource_policies'))
+        self.resource_blocker = None
+        self.metrics = None
+        if CONFIG.get('refresh_metrics'):
+            self.metrics = RefreshMetrics(
+                CONFIG.get('metrics_history', 1000),
+                CONFIG.get('metrics_prometheus_file', 'refresh_metrics.prom'),
+                CONFIG.get('metrics_csv_file', 'refresh_metrics.csv')
+            )
+        self.network_messages = []
+        self.profile_instance = None
+        self.adaptive_policy = None
+        self.change_detector = None
         
     def setup_driver(self):
         """Setup Chrome WebDriver with configuration options."""
         try:
-            chrome_options = Options()
-            
             # Apply configuration options
-            if CONFIG['chrome_options']['headless']:
-                chrome_options.add_argument("--headless")
+            arguments = []
             if CONFIG['chrome_options']['no_sandbox']:
-                chrome_options.add_argument("--no-sandbox")
+                arguments.append("--no-sandbox")
             if CONFIG['chrome_options']['disable_dev_shm_usage']:
-                chrome_options.add_argument("--disable-dev-shm-usage")
+                arguments.append("--disable-dev-shm-usage")
             if CONFIG['chrome_options']['disable_gpu']:
-                chrome_options.add_argument("--disable-gpu")
-            
-            # Set window size
-            chrome_options.add_argument(f"--window-size={CONFIG['window_width']},{CONFIG['window_height']}")
+                arguments.append("--disable-gpu")
             
-            # Additional stability options
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+            profile = {}
+            if CONFIG.get('tmpfs_profiles'):
+                profile = self.setup_ephemeral_profile()
             
-            # Setup service
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # Stealth flags and the navigator.webdriver patch match the 'activity' profile;
+            # network events carry the document status and what blocking saves
+            self.driver = create_driver(
+                'refresh',
+                arguments=arguments,
+                headless=CONFIG['chrome_options']['headless'],
+                window_size=(CONFIG['window_width'], CONFIG['window_height']),
+                stealth=True,
+                hide_webdriver=True,
+                performance_log=self.uses_performance_log(),
+                **profile
+            )
             
             # Set timeouts
             self.driver.set_page_load_timeout(CONFIG['page_load_timeout'])
             self.driver.implicitly_wait(CONFIG['implicit_wait'])
             
-            # Execute script to hide automation indicators
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
             self.log("✓ Chrome WebDriver initialized successfully")
             return True
             
@@ -106,6 +146,51 @@ class AdvancedWebPageRefresher:
             self.log(f"✗ Error setting up WebDriver: {e}")
             return False
     
+    def setup_ephemeral_profile(self):
+        """
+        Place a throwaway profile on tmpfs, seeded from the profile template.
+        
+        Returns:
+            dict: create_driver() overrides for the profile (empty if it could not be created)
+        """
+        try:
+            template_dir = prepare_template(CONFIG.get('profile_template_dir', DEFAULT_TEMPLATE_DIR), log=self.log)
+        except Exception as e:
+            self.log(f"⚠️  Could not create browser profile template: {e}")
+            template_dir = None
+        try:
+            self.profile_instance = BrowserInstance.ephemeral(
+                template_dir,
+                root=CONFIG.get('tmpfs_root', TMPFS_ROOT),
+                min_free_mb=CONFIG.get('tmpfs_min_free_mb', 256),
+                log=self.log
+            )
+        except OSError as e:
+            self.log(f"⚠️  Could not create ephemeral profile, letting Chrome create one: {e}")
+            return {}
+        return self.profile_instance.driver_settings()
+    
+    def uses_performance_log(self):
+        """Whether CDP network events are needed (metrics or resource savings)."""
+        return bool(self.metrics or self.resource_policy)
+    
+    def collect_page_metrics(self):
+        """
+        Drain the performance log once and record timing and status for the page just loaded.
+        
+        Returns:
+            dict: Metrics sample, or None when metrics are disabled
+        """
+        self.network_messages = read_performance_log(self.driver) if self.uses_performance_log() else []
+        if not self.metrics:
+            return None
+        sample = self.metrics.collect(self.driver, self.url, self.network_messages)
+        try:
+            self.metrics.export()
+        except OSError as e:
+            self.log(f"⚠️  Could not export metrics: {e}")
+        return sample
+    
     def log(self, message):
         """Log message with optional timestamp."""
         if CONFIG['show_timestamps']:
@@ -120,7 +205,13 @@ class AdvancedWebPageRefresher:
             try:
                 self.log(f"Loading page: {self.url}")
                 self.driver.get(self.url)
-                self.log("✓ Page loaded successfully")
+                sample = self.collect_page_metrics()
+                if sample and not sample['ok']:
+                    self.log(f"✗ Page returned HTTP {sample['status']} (attempt {attempt + 1}/{self.max_retries + 1})")
+                    if attempt < self.max_retries:
+                        time.sleep(CONFIG['retry_delay'])
+                    continue
+                self.log("✓ Page loaded successfully" + (f" ({self.metrics.format_sample(sample)})" if sample else ""))
                 return True
                 
             except TimeoutException:
@@ -142,7 +233,14 @@ class AdvancedWebPageRefresher:
         for attempt in range(self.max_retries + 1):
             try:
                 self.driver.refresh()
-                self.log("✓ Page refreshed successfully")
+                sample = self.collect_page_metrics()
+                if sample and not sample['ok']:
+                    # An error page still loads; count it as a failed refresh
+                    self.log(f"✗ Page refreshed with HTTP {sample['status']} (attempt {attempt + 1}/{self.max_retries + 1})")
+                    if attempt < self.max_retries:
+                        time.sleep(CONFIG['retry_delay'])
+                    continue
+                self.log("✓ Page refreshed successfully" + (f" ({self.metrics.format_sample(sample)})" if sample else ""))
                 return True
                 
             except WebDriverException as e:
@@ -153,6 +251,126 @@ class AdvancedWebPageRefresher:
                     
         return False
     
+    def setup_conditional_refresh(self):
+        """Prepare the HTTP validator check used to skip unneeded refreshes."""
+        if not CONFIG.get('conditional_refresh'):
+            return
+        try:
+            self.conditional_checker = ConditionalRefreshChecker(
+                self.url, max_staleness=CONFIG.get('max_staleness_minutes', 15) * 60
+            )
+            self.conditional_checker.sync_from_driver(self.driver)
+            self.conditional_checker.prime()
+            self.log("✓ Conditional refresh enabled (HTTP validator check before each refresh)")
+        except Exception as e:
+            self.log(f"⚠️  Conditional refresh unavailable, using full refreshes: {e}")
+            self.conditional_checker = None
+    
+    def setup_resource_blocking(self):
+        """Block this URL's unneeded resources, measured against a warm unblocked reload."""
+        if not self.resource_policy:
+            return
+        try:
+            blocker = ResourceBlocker(self.driver, self.resource_policy)
+        except ValueError as e:
+            self.log(f"⚠️  Invalid resource policy, not blocking: {e}")
+            return
+        
+        # The first load was cold; later refreshes hit the HTTP cache, so compare like with like
+        messages = self.network_messages
+        try:
+            self.driver.refresh()
+            messages = read_performance_log(self.driver)
+        except WebDriverException as e:
+            self.log(f"⚠️  Warm baseline reload failed, measuring against the first load: {e}")
+        baseline = blocker.record_baseline(messages)
+        if blocker.enable():
+            self.resource_blocker = blocker
+            self.log(f"✓ Blocking {len(blocker.patterns)} URL patterns "
+                     f"(baseline load: {baseline['finished']} requests, {format_bytes(baseline['bytes'])})")
+    
+    def report_resource_savings(self):
+        """Log requests blocked and bytes saved by the last refresh."""
+        if self.resource_blocker:
+            stats = self.resource_blocker.record_refresh(self.network_messages)
+            self.log(self.resource_blocker.format_refresh(stats))
+    
+    def setup_adaptive_interval(self):
+        """Let the page's change rate drive the interval, within the configured bounds."""
+        if not CONFIG.get('adaptive_interval'):
+            return
+        try:
+            self.adaptive_policy = AdaptiveIntervalPolicy(
+                self.url,
+                CONFIG.get('adaptive_min_interval', 1) * 60,
+                CONFIG.get('adaptive_max_interval', 60) * 60,
+                self.refresh_interval,
+                path=CONFIG.get('adaptive_state_file', 'adaptive_intervals.json')
+            )
+        except ValueError as e:
+            self.log(f"⚠️  Adaptive interval disabled: {e}")
+            return
+        self.change_detector = DOMChangeDetector()
+        self.change_detector.check(self.driver)
+        self.refresh_interval = round(self.adaptive_policy.interval)
+        self.log(f"✓ Adaptive interval enabled ({self.adaptive_policy.min_interval:.0f}-"
+                 f"{self.adaptive_policy.max_interval:.0f}s, starting at {self.refresh_interval}s)")
+    
+    def adapt_interval(self, ticker, refreshed):
+        """Feed the latest change signal to the adaptive policy and retune the ticker."""
+        changed = False
+        if refreshed:
+            try:
+                changed = bool(self.change_detector.check(self.driver))
+            except WebDriverException:
+                pass
+        interval = round(self.adaptive_policy.observe(changed))
+        if interval != ticker.interval:
+            ticker.set_interval(interval)
+            self.refresh_interval = interval
+            self.log(f"🎚️  Content {'changed' if changed else 'unchanged'}, refresh interval now {interval}s")
+    
+    def setup_screenshot_detection(self):
+        """Start perceptual screenshot diffs and take the baseline frame."""
+        if not CONFIG.get('screenshot_change_detection'):
+            return
+        try:
+            self.screenshot_detector = ScreenshotChangeDetector(CONFIG.get('screenshot_change_threshold', 0.02))
+            self.screenshot_detector.on_change(self.report_visual_change)
+            self.screenshot_detector.submit(self.driver)
+            self.log("✓ Screenshot change detection enabled")
+        except Exception as e:
+            self.log(f"⚠️  Screenshot change detection unavailable: {e}")
+            self.screenshot_detector = None
+    
+    def report_visual_change(self, event):
+        """Log a visual change found by the screenshot detector."""
+        self.log(f"🖼️  Visual change: {event['changed_fraction']:.1%} of blocks differ "
+                 f"(hash distance {event['hash_distance']})")
+    
+    def refresh_if_changed(self):
+        """
+        Refresh only if the HTTP check says the page changed.
+        
+        Returns:
+            tuple: (ok, refreshed) - refreshed is False when the refresh was skipped
+        """
+        if self.conditional_checker:
+            needs_refresh, reason = self.conditional_checker.check()
+            if not needs_refresh:
+                self.skipped_refreshes += 1
+                self.log(f"⏭️  Page unchanged ({reason}), skipped browser refresh")
+                return True, False
+            self.log(f"🔍 Refreshing: {reason}")
+        
+        if not self.refresh_page():
+            return False, False
+        
+        if self.conditional_checker:
+            self.conditional_checker.mark_refreshed()
+            self.conditional_checker.sync_from_driver(self.driver)
+        return True, True
+    
     def start_auto_refresh(self):
         """Start the auto-refresh process."""
         if not self.setup_driver():
@@ -162,29 +380,53 @@ class AdvancedWebPageRefresher:
             self.cleanup()
             return
         
+        self.setup_resource_blocking()
+        self.setup_conditional_refresh()
+        self.setup_screenshot_detection()
+        self.setup_adaptive_interval()
+        
         self.log("\n🔄 Auto-refresh started!")
         self.log(f"📍 URL: {self.url}")
         self.log(f"⏰ Refresh interval: {self.refresh_interval} seconds ({self.refresh_interval//60} minutes)")
         self.log(f"\nPress Ctrl+C to stop the auto-refresh\n")
         
+        refresh_count = 0
+        ticker = RefreshTicker(self.refresh_interval, CONFIG.get('missed_tick_policy', 'skip'))
         try:
-            refresh_count = 0
             while True:
-                # Wait for the specified interval
-                time.sleep(self.refresh_interval)
+                # Wait for the next deadline on a fixed grid
+                lateness = ticker.wait()
+                if lateness >= 1:
+                    self.log(f"⏱️  Refresh running {lateness:.1f}s behind schedule")
                 
-                # Refresh the page
-                if self.refresh_page():
+                # Refresh the page (or skip it if it has not changed)
+                ok, refreshed = self.refresh_if_changed()
+                if refreshed:
                     refresh_count += 1
                     if CONFIG['show_refresh_counter']:
                         self.log(f"📊 Total refreshes: {refresh_count}")
-                else:
+                    self.report_resource_savings()
+                    if self.screenshot_detector:
+                        # Capture now; decoding and diffing run in the background
+                        self.screenshot_detector.submit(self.driver)
+                elif not ok:
                     self.log("⚠️  All refresh attempts failed, continuing...")
+                
+                if ok and self.adaptive_policy:
+                    # Skipped refreshes (conditional check) count as unchanged
+                    self.adapt_interval(ticker, refreshed)
                     
         except KeyboardInterrupt:
             self.log(f"\n\n🛑 Auto-refresh stopped by user")
             if CONFIG['show_refresh_counter']:
                 self.log(f"📊 Total refreshes performed: {refresh_count}")
+                if self.conditional_checker:
+                    self.log(f"⏭️  Refreshes skipped (unchanged): {self.skipped_refreshes}")
+                if self.resource_blocker:
+                    self.log(self.resource_blocker.summary())
+            if self.metrics:
+                self.log(f"📈 Metrics exported to {self.metrics.prometheus_path} and {self.metrics.csv_path}")
+            self.log(ticker.summary())
         except Exception as e:
             self.log(f"\n✗ Unexpected error: {e}")
         finally:
@@ -192,12 +434,181 @@ class AdvancedWebPageRefresher:
     
     def cleanup(self):
         """Clean up resources."""
+        if self.conditional_checker:
+            self.conditional_checker.close()
+        if self.screenshot_detector:
+            self.screenshot_detector.close()
+        if self.adaptive_policy:
+            self.adaptive_policy.save()
         if self.driver:
             try:
                 self.driver.quit()
                 self.log("✓ Browser closed successfully")
             except Exception as e:
                 self.log(f"⚠️  Error closing browser: {e}")
+        if self.profile_instance:
+            self.profile_instance.cleanup()
+            self.profile_instance = None
+
+class MultiURLRefreshScheduler(AdvancedWebPageRefresher):
+    def __init__(self, policies):
+        """
+        Initialize a scheduler that refreshes many URLs from one browser.
+        
+        Args:
+            policies (list): URL policies as returned by url_policy()
+        """
+        # URLs marked 'backend': 'http' are refreshed without a browser tab
+        self.http_policies = [policy for policy in policies if policy.get('backend') == 'http']
+        policies = [policy for policy in policies if policy.get('backend') != 'http']
+        super().__init__(policies[0]['url'] if policies else '')
+        self.policies = policies
+        self.http_engine = None
+        self.handles = {}
+        self.refresh_counts = {}
+        self.tickers = {}
+        # Tabs share one performance log, so per-refresh byte accounting is
+        # single-URL only; blocking itself is still applied per tab
+        self.resource_policy = None
+    
+    def open_tabs(self):
+        """Open one tab per URL and load it."""
+        for index, policy in enumerate(self.policies):
+            if index > 0:
+                # Attached to a broker lease, this opens the tab inside the lease's browser context
+                self.driver.switch_to.new_window('tab')
+            self.handles[policy['url']] = self.driver.current_window_handle
+            self.url = policy['url']
+            self.block_resources_in_tab(policy['url'])
+            if not self.load_page():
+                self.log(f"⚠️  Initial load failed for {policy['url']}, will retry on schedule")
+            self.refresh_counts[policy['url']] = 0
+    
+    def block_resources_in_tab(self, url):
+        """Apply the URL's resource policy to the current tab (no savings report)."""
+        rules = resource_policy_for(url, CONFIG.get('resource_policies'))
+        if not rules:
+            return
+        try:
+            if ResourceBlocker(self.driver, rules).enable():
+                self.log(f"✓ Resource blocking enabled for {url}")
+        except ValueError as e:
+            self.log(f"⚠️  Invalid resource policy for {url}: {e}")
+    
+    def start_http_refreshes(self):
+        """Run browserless refreshes for 'http' URLs on a background event loop."""
+        from http_refresh import AsyncHTTPRefreshEngine
+        try:
+            self.http_engine = AsyncHTTPRefreshEngine(concurrency=CONFIG.get('http_concurrency', 20), log=self.log)
+        except Exception as e:
+            self.log(f"⚠️  HTTP backend unavailable, skipping {len(self.http_policies)} URLs: {e}")
+            return
+        threading.Thread(target=self.http_engine.start, args=(self.http_policies,), daemon=True).start()
+        for policy in self.http_policies:
+            self.log(f"🌐 {policy['url']} every {policy['interval']} seconds (HTTP, no browser)")
+    
+    def start_auto_refresh(self):
+        """Refresh every URL on its own interval, earliest due first."""
+        if not self.policies and not self.http_policies:
+            self.log("✗ No URLs to monitor")
+            return
+        
+        if self.http_policies:
+            self.start_http_refreshes()
+        
+        if not self.policies:
+            # Only browserless URLs: just keep the process alive
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                self.log(f"\n\n🛑 Auto-refresh stopped by user")
+            finally:
+                self.cleanup()
+            return
+        
+        if not self.setup_driver():
+            return
+        
+        try:
+            self.open_tabs()
+            
+            self.log(f"\n🔄 Multi-URL auto-refresh started for {len(self.policies)} URLs")
+            for policy in self.policies:
+                self.log(f"📍 {policy['url']} every {policy['interval']} seconds")
+            self.log(f"\nPress Ctrl+C to stop the auto-refresh\n")
+            
+            # Priority queue keyed on each URL's next deadline (monotonic clock)
+            queue = []
+            for index, policy in enumerate(self.policies):
+                self.tickers[policy['url']] = RefreshTicker(policy['interval'], policy.get('missed_tick_policy', CONFIG.get('missed_tick_policy', 'skip')))
+                queue.append((self.tickers[policy['url']].next_due, index))
+            heapq.heapify(queue)
+            
+            while queue:
+                due, index = heapq.heappop(queue)
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                
+                policy = self.policies[index]
+                ticker = self.tickers[policy['url']]
+                if ticker.skip_missed():
+                    heapq.heappush(queue, (ticker.next_due, index))
+                    continue
+                ticker.tick()
+                self.url = policy['url']
+                self.driver.switch_to.window(self.handles[policy['url']])
+                if self.refresh_page():
+                    self.refresh_counts[policy['url']] += 1
+                    if CONFIG['show_refresh_counter']:
+                        self.log(f"📊 {policy['url']}: {self.refresh_counts[policy['url']]} refreshes")
+                else:
+                    self.log(f"⚠️  All refresh attempts failed for {policy['url']}, continuing...")
+                
+                heapq.heappush(queue, (ticker.next_due, index))
+                
+        except KeyboardInterrupt:
+            self.log(f"\n\n🛑 Auto-refresh stopped by user")
+            if CONFIG['show_refresh_counter']:
+                for url, count in self.refresh_counts.items():
+                    self.log(f"📊 {url}: {count} refreshes")
+                    if url in self.tickers:
+                        self.log(f"   {self.tickers[url].summary()}")
+        except Exception as e:
+            self.log(f"\n✗ Unexpected error: {e}")
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """Stop browserless refreshes, then close the browser."""
+        if self.http_engine:
+            self.http_engine.stop()
+            for line in self.http_engine.summary():
+                self.log(line)
+            self.http_engine.close()
+            self.http_engine = None
+        super().cleanup()
+
+def url_policy(entry):
+    """
+    Normalize a QUICK_URLS/FAVORITE_URLS entry into a policy dict.
+    
+    Entries can be a plain URL string or a dict such as
+    {'url': 'https://...', 'interval': 2} with the interval in minutes.
+    """
+    if isinstance(entry, dict):
+        policy = dict(entry)
+    else:
+        policy = {'url': entry}
+    interval_minutes = policy.get('interval', CONFIG['default_refresh_interval'])
+    policy['interval'] = int(float(interval_minutes) * 60)
+    return policy
+
+def all_url_policies():
+    """Return policies for every quick and favorite URL."""
+    all_urls = {**QUICK_URLS, **FAVORITE_URLS}
+    return [url_policy(entry) for entry in all_urls.values()]
 
 def show_quick_urls():
     """Display available quick URLs."""
@@ -209,14 +620,14 @@ def show_quick_urls():
     print("\n📋 Quick URL Selection:")
     print("-" * 40)
     
-    for key, url in all_urls.items():
-        print(f"{key}: {url}")
+    for key, entry in all_urls.items():
+        print(f"{key}: {url_policy(entry)['url']}")
     
     print("-" * 40)
     choice = input("Select a number/key or press Enter to enter custom URL: ").strip()
     
     if choice in all_urls:
-        return all_urls[choice]
+        return url_policy(all_urls[choice])['url']
     
     return None
 
@@ -281,6 +692,13 @@ def main():
         if not os.path.exists('config.py'):
             print("ℹ️  Note: config.py not found, using default settings")
         
+        policies = all_url_policies()
+        if len(policies) > 1:
+            monitor_all = input(f"\nMonitor all {len(policies)} quick/favorite URLs in one browser? (y/N): ").strip().lower()
+            if monitor_all in ['y', 'yes']:
+                MultiURLRefreshScheduler(policies).start_auto_refresh()
+                return
+        
         url, interval = get_user_input()
         
         refresher = AdvancedWebPageRefresher(url, interval)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Browser Startup Benchmark
+Compares Chrome launch time for fresh profiles on disk and on tmpfs.
+
+Each run launches Chrome, loads one page and quits, for every placement:
+
+    - default: no user-data-dir, Chrome creates its own temporary profile
+    - disk:    ephemeral profile in the system temp dir, seeded from the template
+    - tmpfs:   ephemeral profile in /dev/shm, seeded from the template
+
+Placements are interleaved run by run so drift (caches, CPU boost, other
+load) affects them equally. One warm-up launch is discarded first. The
+phases come from the driver factory's startup report.
+
+Usage:
+    python benchmark_startup.py --runs 10 --headless
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from driver_factory import DriverFactory
+from browser_profiles import BrowserInstance, prepare_template, tmpfs_available, DEFAULT_TEMPLATE_DIR, TMPFS_ROOT
+
+PHASES = ('seed_ms', 'session_ms', 'first_navigation_ms', 'quit_ms', 'total_ms')
+
+def launch_once(factory, placement, template_dir, url, headless):
+    """
+    Launch, navigate and quit once.
+
+    Returns:
+        dict: Milliseconds per phase
+    """
+    started = time.perf_counter()
+    instance = None
+    overrides = {}
+    if placement != 'default':
+        root = TMPFS_ROOT if placement == 'tmpfs' else None
+        instance = BrowserInstance.ephemeral(template_dir, root=root, log=None)
+        overrides = instance.driver_settings()
+    seeded = time.perf_counter()
+
+    try:
+        driver = factory.create('refresh', headless=headless, **overrides)
+        report = driver.startup_report
+        try:
+            driver.get(url)
+        finally:
+            quit_started = time.perf_counter()
+            driver.quit()
+            quit_ms = (time.perf_counter() - quit_started) * 1000
+    finally:
+        if instance:
+            instance.cleanup()
+
+    return {
+        'seed_ms': (seeded - started) * 1000,
+        'session_ms': report['session_ms'],
+        'first_navigation_ms': report['first_navigation_ms'],
+        'quit_ms': quit_ms,
+        'total_ms': (time.perf_counter() - started) * 1000,
+    }
+
+def print_table(results):
+    print(f"\n{'placement':<10}" + ''.join(f"{phase:>22}" for phase in PHASES))
+    for placement, samples in results.items():
+        cells = []
+        for phase in PHASES:
+            values = [sample[phase] for sample in samples]
+            cells.append(f"{statistics.median(values):>12.0f} ±{statistics.pstdev(values):>7.0f}")
+        print(f"{placement:<10}" + ''.join(f"{cell:>22}" for cell in cells))
+    print("\n(median ± standard deviation, milliseconds)")
+
+    baseline = statistics.median(sample['total_ms'] for sample in results['default'])
+    for placement, samples in results.items():
+        if placement != 'default':
+            total = statistics.median(sample['total_ms'] for sample in samples)
+            print(f"   {placement}: {total - baseline:+.0f}ms vs default ({(total / baseline - 1) * 100:+.1f}%)")
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description='Compare Chrome startup with fresh profiles on disk and on tmpfs.')
+    parser.add_argument('--runs', type=int, default=5, help='launches per placement (default: 5)')
+    parser.add_argument('--url', default='about:blank', help='page loaded after launch (default: about:blank)')
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE_DIR, help='profile template directory')
+    parser.add_argument('--headless', action='store_true', help='run Chrome headless')
+    args = parser.parse_args()
+
+    print("⏱️  Browser Startup Benchmark")
+    print("=" * 30)
+    placements = ['default', 'disk']
+    if tmpfs_available():
+        placements.append('tmpfs')
+    else:
+        print(f"⚠️ {TMPFS_ROOT} is not available, benchmarking disk placements only")
+
+    # Launch Chrome directly: a broker would hide the profile cost
+    os.environ.pop('BROWSER_BROKER_URL', None)
+    factory = DriverFactory(report_path=None, log=None)
+
+    try:
+        template_dir = prepare_template(args.template)
+        launch_once(factory, 'default', template_dir, args.url, args.headless)
+
+        results = {placement: [] for placement in placements}
+        for run in range(1, args.runs + 1):
+            for placement in placements:
+                sample = launch_once(factory, placement, template_dir, args.url, args.headless)
+                results[placement].append(sample)
+                print(f"   run {run} {placement:<8} {sample['total_ms']:.0f}ms")
+    except KeyboardInterrupt:
+        print("\n🛑 Benchmark stopped by user")
+        return
+    except Exception as e:
+        print(f"✗ Benchmark failed: {e}")
+        sys.exit(1)
+
+    print_table(results)
+
+if __name__ == "__main__":
+    main()
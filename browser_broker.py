@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Browser Broker
+A long-lived daemon that keeps warm Chrome instances and leases them out.
+
+Cold-starting Chrome is the slowest part of a short scheduled run. The
+broker starts one or more Chrome instances once, each with its own
+temporary profile and a DevTools endpoint on localhost, and serves leases
+over a small HTTP API:
+
+    POST /lease    {"isolated": true, "url": "about:blank"}
+                   -> {"lease_id", "debugger_address", "target_id", "browser_context_id",
+                       "headless", "arguments"}
+    POST /tab      {"lease_id": "...", "url": "about:blank"} -> {"target_id"}
+    POST /targets  {"lease_id": "..."} -> {"targets": [...]}
+    POST /renew    {"lease_id": "..."} -> {"renewed": true}
+    POST /release  {"lease_id": "..."}
+    GET  /status
+
+An isolated lease gets its own browser context (Target.createBrowserContext),
+so cookies and storage are not shared with other clients. Every client
+attached over debuggerAddress can see all tabs of that Chrome, so extra
+tabs are opened through /tab (inside the lease's context) and /targets
+lists the tabs a lease may use. Releasing the lease disposes the context
+and closes its tabs. The Chrome instance itself
+stays warm for the next client. Leases nobody has used for lease_ttl
+seconds are reclaimed; every lease request counts as use, and attached
+drivers send /renew heartbeats while they work.
+
+Clients attach with ChromeDriver's debuggerAddress option. driver_factory
+does this automatically for profiles without a user_data_dir when the
+BROWSER_BROKER_URL environment variable points at a running broker:
+
+    python browser_broker.py --instances 2 --port 9300 &
+    BROWSER_BROKER_URL=http://127.0.0.1:9300 python auto_refresh.py
+
+Requires the optional 'websocket-client' package (see requirements_advanced.txt).
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import signal
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+from driver_resolver import find_chrome_binary
+
+DEFAULT_BROKER_PORT = 9300
+
+CHROME_ARGUMENTS = [
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--window-size=1920,1080',
+    '--disable-blink-features=AutomationControlled',
+]
+
+class CDPConnection:
+    """Minimal synchronous client for a browser-level DevTools websocket."""
+
+    def __init__(self, ws_url, timeout=10):
+        if websocket is None:
+            raise ImportError("The browser broker requires 'websocket-client' (pip install websocket-client)")
+        self.socket = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+    def send(self, method, params=None):
+        """Send a CDP command and return its result, skipping unrelated events."""
+        with self.lock:
+            self.next_id += 1
+            message_id = self.next_id
+            self.socket.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+            while True:
+                message = json.loads(self.socket.recv())
+                if message.get('id') != message_id:
+                    continue
+                if 'error' in message:
+                    raise RuntimeError(f"{method} failed: {message['error'].get('message')}")
+                return message.get('result', {})
+
+    def close(self):
+        try:
+            self.socket.close()
+        except Exception:
+            pass
+
+class ChromeInstance:
+    def __init__(self, chrome_binary, headless=False, startup_timeout=30):
+        """
+        Launch a warm Chrome instance with its own temporary profile.
+
+        Args:
+            chrome_binary (str): Path of the Chrome executable
+            headless (bool): Run Chrome headless
+            startup_timeout (float): Seconds to wait for the DevTools endpoint
+        """
+        self.profile_dir = tempfile.mkdtemp(prefix='broker-chrome-')
+        arguments = [chrome_binary, f'--user-data-dir={self.profile_dir}', '--remote-debugging-port=0'] + CHROME_ARGUMENTS
+        if headless:
+            arguments.append('--headless=new')
+        arguments.append('about:blank')
+        self.process = subprocess.Popen(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.port, ws_path = self._wait_for_devtools(startup_timeout)
+        self.debugger_address = f'127.0.0.1:{self.port}'
+        self.cdp = CDPConnection(f'ws://{self.debugger_address}{ws_path}')
+        self.leases = set()
+
+    def _wait_for_devtools(self, timeout):
+        # With --remote-debugging-port=0 Chrome picks a free port and writes it here
+        active_port_file = os.path.join(self.profile_dir, 'DevToolsActivePort')
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Chrome exited during startup (code {self.process.returncode})")
+            try:
+                with open(active_port_file, 'r') as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    return int(lines[0]), lines[1]
+            except OSError:
+                pass
+            time.sleep(0.05)
+        raise RuntimeError("Timed out waiting for Chrome's DevTools endpoint")
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def shutdown(self):
+        """Stop Chrome and remove its temporary profile."""
+        self.cdp.close()
+        if self.alive():
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+class BrowserBroker:
+    def __init__(self, instances=1, headless=False, lease_ttl=6 * 3600, log=print):
+        """
+        Initialize the broker.
+
+        Args:
+            instances (int): Number of warm Chrome instances to keep
+            headless (bool): Run the instances headless
+            lease_ttl (float): Seconds a lease may go unused before it is reclaimed
+            log (callable): Function used for progress messages
+        """
+        self.chrome_binary = find_chrome_binary()
+        if not self.chrome_binary:
+            raise RuntimeError("Chrome is not installed (no Chrome binary found)")
+        self.instance_count = instances
+        self.headless = headless
+        self.lease_ttl = lease_ttl
+        self.log = log
+        self.instances = []
+        self.leases = {}
+        self.lock = threading.Lock()
+
+    def start_instances(self):
+        """Launch the warm Chrome instances."""
+        for _ in range(self.instance_count):
+            started = time.perf_counter()
+            instance = ChromeInstance(self.chrome_binary, self.headless)
+            self.instances.append(instance)
+            self.log(f"🔥 Chrome warm on {instance.debugger_address} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    def _healthy_instance(self):
+        # Replace instances whose Chrome died, then pick the least-leased one
+        for index, instance in enumerate(self.instances):
+            if not instance.alive():
+                self.log(f"⚠️ Chrome on {instance.debugger_address} exited, relaunching")
+                for lease_id in instance.leases:
+                    self.leases.pop(lease_id, None)
+                instance.shutdown()
+                self.instances[index] = ChromeInstance(self.chrome_binary, self.headless)
+        return min(self.instances, key=lambda instance: len(instance.leases))
+
+    def _reclaim_expired(self):
+        now = time.time()
+        for lease_id, lease in list(self.leases.items()):
+            if now - lease['last_used'] > self.lease_ttl:
+                self.log(f"♻️ Reclaiming idle lease {lease_id}")
+                self._release(lease_id)
+
+    def lease(self, isolated=True, url='about:blank'):
+        """Create a tab (in a fresh browser context when isolated) and lease it."""
+        with self.lock:
+            self._reclaim_expired()
+            instance = self._healthy_instance()
+            context_id = None
+            params = {'url': url}
+            if isolated:
+                context_id = instance.cdp.send('Target.createBrowserContext', {'disposeOnDetach': False})['browserContextId']
+                params['browserContextId'] = context_id
+            target_id = instance.cdp.send('Target.createTarget', params)['targetId']
+
+            lease_id = uuid.uuid4().hex
+            self.leases[lease_id] = {
+                'lease_id': lease_id,
+                'debugger_address': instance.debugger_address,
+                'target_id': target_id,
+                'browser_context_id': context_id,
+                # Launch settings, so clients can tell which of theirs this Chrome honours
+                'headless': self.headless,
+                'arguments': list(CHROME_ARGUMENTS),
+                'targets': [target_id],
+                'created': time.time(),
+                'last_used': time.time(),
+                'instance': instance,
+            }
+            instance.leases.add(lease_id)
+            return {key: value for key, value in self.leases[lease_id].items() if key != 'instance'}
+
+    def _touch(self, lease_id):
+        # Any request for a lease shows its client is still using it
+        lease = self.leases.get(lease_id)
+        if lease:
+            lease['last_used'] = time.time()
+        return lease
+
+    def renew(self, lease_id):
+        """Heartbeat from a client that still uses its lease; returns False for unknown leases."""
+        with self.lock:
+            return self._touch(lease_id) is not None
+
+    def open_tab(self, lease_id, url='about:blank'):
+        """Open another tab for a lease, inside its browser context; returns the target id."""
+        with self.lock:
+            lease = self._touch(lease_id)
+            if not lease:
+                return None
+            params = {'url': url}
+            if lease['browser_context_id']:
+                params['browserContextId'] = lease['browser_context_id']
+            target_id = lease['instance'].cdp.send('Target.createTarget', params)['targetId']
+            lease['targets'].append(target_id)
+            return target_id
+
+    def targets(self, lease_id):
+        """Page targets (window handles) that belong to a lease, or None for an unknown lease."""
+        with self.lock:
+            lease = self._touch(lease_id)
+            if not lease:
+                return None
+            pages = [info for info in lease['instance'].cdp.send('Target.getTargets')['targetInfos']
+                     if info.get('type') == 'page']
+            if lease['browser_context_id']:
+                # Includes popups the page opened itself
+                return [info['targetId'] for info in pages if info.get('browserContextId') == lease['browser_context_id']]
+            open_ids = {info['targetId'] for info in pages}
+            return [target_id for target_id in lease['targets'] if target_id in open_ids]
+
+    def _release(self, lease_id):
+        lease = self.leases.pop(lease_id, None)
+        if not lease:
+            return False
+        instance = lease['instance']
+        instance.leases.discard(lease_id)
+        try:
+            if lease['browser_context_id']:
+                instance.cdp.send('Target.disposeBrowserContext', {'browserContextId': lease['browser_context_id']})
+            else:
+                for target_id in lease['targets']:
+                    instance.cdp.send('Target.closeTarget', {'targetId': target_id})
+        except Exception as e:
+            self.log(f"⚠️ Could not clean up lease {lease_id}: {e}")
+        return True
+
+    def release(self, lease_id):
+        """Dispose a lease's context (or tab); returns False for unknown leases."""
+        with self.lock:
+            return self._release(lease_id)
+
+    def status(self):
+        """Instances and their lease counts."""
+        with self.lock:
+            return {
+                'instances': [
+                    {'debugger_address': instance.debugger_address, 'alive': instance.alive(), 'leases': len(instance.leases)}
+                    for instance in self.instances
+                ],
+                'leases': len(self.leases),
+            }
+
+    def shutdown(self):
+        """Release every lease and stop all Chrome instances."""
+        with self.lock:
+            for lease_id in list(self.leases):
+                self._release(lease_id)
+            for instance in self.instances:
+                instance.shutdown()
+            self.instances = []
+
+class BrokerRequestHandler(BaseHTTPRequestHandler):
+    broker = None
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        if self.path == '/status':
+            self._reply(200, self.broker.status())
+        else:
+            self._reply(404, {'error': 'not found'})
+
+    def do_POST(self):
+        try:
+            body = self._body()
+            if self.path == '/lease':
+                self._reply(200, self.broker.lease(body.get('isolated', True), body.get('url', 'about:blank')))
+            elif self.path == '/tab':
+                target_id = self.broker.open_tab(body.get('lease_id'), body.get('url', 'about:blank'))
+                self._reply(200 if target_id else 404, {'target_id': target_id})
+            elif self.path == '/targets':
+                targets = self.broker.targets(body.get('lease_id'))
+                self._reply(200 if targets is not None else 404, {'targets': targets})
+            elif self.path == '/renew':
+                renewed = self.broker.renew(body.get('lease_id'))
+                self._reply(200 if renewed else 404, {'renewed': renewed})
+            elif self.path == '/release':
+                released = self.broker.release(body.get('lease_id'))
+                self._reply(200 if released else 404, {'released': released})
+            else:
+                self._reply(404, {'error': 'not found'})
+        except Exception as e:
+            self._reply(500, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        pass
+
+class BrokerClient:
+    def __init__(self, url, timeout=10):
+        """
+        Client for a running broker.
+
+        Args:
+            url (str): Broker base URL, e.g. http://127.0.0.1:9300
+            timeout (float): HTTP timeout in seconds
+        """
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def lease(self, isolated=True, url='about:blank'):
+        """Lease a tab; returns the lease dict, or None if the broker is unreachable."""
+        try:
+            return self._request('/lease', {'isolated': isolated, 'url': url})
+        except OSError:
+            return None
+
+    def open_tab(self, lease_id, url='about:blank'):
+        """Open a tab inside the lease's browser context; returns its target id (window handle)."""
+        try:
+            return self._request('/tab', {'lease_id': lease_id, 'url': url}).get('target_id')
+        except OSError:
+            return None
+
+    def targets(self, lease_id):
+        """Window handles that belong to the lease, or None if unavailable."""
+        try:
+            return self._request('/targets', {'lease_id': lease_id}).get('targets')
+        except OSError:
+            return None
+
+    def renew(self, lease_id):
+        """Tell the broker the lease is still in use; returns False if it is gone."""
+        try:
+            return self._request('/renew', {'lease_id': lease_id}).get('renewed', False)
+        except OSError:
+            return False
+
+    def release(self, lease_id):
+        """Hand a lease back to the broker."""
+        try:
+            return self._request('/release', {'lease_id': lease_id}).get('released', False)
+        except OSError:
+            return False
+
+    def status(self):
+        """Broker status, or None if unreachable."""
+        try:
+            return self._request('/status')
+        except OSError:
+            return None
+
+def main():
+    """Run the broker until interrupted."""
+    parser = argparse.ArgumentParser(description='Keep warm Chrome instances and lease them to automation scripts.')
+    parser.add_argument('--instances', type=int, default=1, help='number of warm Chrome instances (default: 1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_BROKER_PORT, help=f'HTTP port on localhost (default: {DEFAULT_BROKER_PORT})')
+    parser.add_argument('--headless', action='store_true', help='run Chrome headless')
+    args = parser.parse_args()
+
+    print("🧰 Browser Broker")
+    print("=" * 30)
+    try:
+        broker = BrowserBroker(instances=args.instances, headless=args.headless)
+        broker.start_instances()
+    except Exception as e:
+        print(f"✗ Could not start Chrome: {e}")
+        sys.exit(1)
+
+    BrokerRequestHandler.broker = broker
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), BrokerRequestHandler)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"✓ Serving leases on http://127.0.0.1:{args.port}")
+    print(f"💡 export BROWSER_BROKER_URL=http://127.0.0.1:{args.port}")
+    print("Press Ctrl+C to stop the broker\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Broker stopped by user")
+    finally:
+        server.server_close()
+        broker.shutdown()
+        print("✓ Chrome instances closed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Browser Profiles
+Per-instance isolation so several Chrome instances can run side by side.
+
+Two Chrome instances collide when they share a remote debugging port or a
+user-data-dir: the second one cannot take the profile lock and fails with
+the DevToolsActivePort error. Each BrowserInstance therefore gets:
+
+    - a free localhost port picked by the OS
+    - a private clone of a "golden" automation profile in a temp directory
+
+Clones are copy-on-write where the filesystem supports it (APFS clonefile
+via 'cp -c', btrfs/XFS reflinks via 'cp --reflink=auto'), so even a large
+profile clones in milliseconds and only changed blocks take space. Other
+filesystems fall back to a regular copy. Chrome's lock files
+(Singleton*, DevToolsActivePort) are never carried over.
+
+Clones are deleted on cleanup() and, as a safety net, when the process exits.
+
+Fresh sessions that need no saved state can use BrowserInstance.ephemeral()
+instead of letting Chrome create a new profile on disk. The profile lives on
+tmpfs (/dev/shm), so Chrome's startup profile I/O never touches the SSD, and
+it is seeded from a pre-initialized template (see prepare_template), so
+Chrome skips first-run profile creation. Before using tmpfs the template
+size plus headroom is checked against the free memory there, falling back
+to a disk temp dir. Ephemeral profiles are removed on cleanup() and at
+exit; SIGTERM/SIGHUP become a normal exit, so Chrome is quit by the
+callers' finally blocks before the profiles go. Directories left by a
+crashed process (named after its PID) are swept on the next start.
+
+Usage:
+    instance = BrowserInstance.from_golden('~/Library/Application Support/Chrome-Automation')
+    create_driver('apply', user_data_dir=instance.profile_dir,
+                  extra_arguments=[f'--remote-debugging-port={instance.port}'])
+    ...
+    instance.cleanup()
+
+    instance = BrowserInstance.ephemeral()
+    create_driver('refresh', **instance.driver_settings())
+"""
+
+import os
+import sys
+import time
+import atexit
+import shutil
+import signal
+import socket
+import tempfile
+import subprocess
+
+# Lock and port files that tie a profile to a running Chrome
+LOCK_FILE_PATTERNS = ('Singleton*', 'DevToolsActivePort', 'lockfile')
+
+TMPFS_ROOT = '/dev/shm'
+DEFAULT_TEMPLATE_DIR = os.path.expanduser('~/.cache/browser-auto-refresh/chrome-template')
+EPHEMERAL_PREFIX = 'chrome-ephemeral-'
+
+# Caches Chrome rebuilds on demand; kept out of the template so seeding stays cheap
+TEMPLATE_SKIP_PATTERNS = ('Cache', 'Code Cache', 'GPUCache', 'ShaderCache', 'GrShaderCache',
+                          'GraphiteDawnCache', 'component_crx_cache', 'Crashpad')
+
+MB = 1024 * 1024
+
+_live_instances = []
+_signal_handlers_installed = False
+
+def find_free_port(host='127.0.0.1'):
+    """Ask the OS for a currently unused TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+def _remove_lock_files(profile_dir):
+    # Lock files can sit in the user-data-dir and in each profile directory
+    for root, dirs, files in os.walk(profile_dir):
+        for name in files + dirs:
+            if name.startswith('Singleton') or name in ('DevToolsActivePort', 'lockfile'):
+                path = os.path.join(root, name)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+def directory_size(path):
+    """Total size in bytes of the files under path (symlinks not followed)."""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def tmpfs_available(root=TMPFS_ROOT):
+    """Whether root exists and is writable (Linux exposes /dev/shm as tmpfs)."""
+    return os.path.isdir(root) and os.access(root, os.W_OK | os.X_OK)
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def sweep_orphans(root=TMPFS_ROOT):
+    """
+    Remove ephemeral profiles whose owning process no longer runs.
+
+    Returns:
+        int: Number of directories removed
+    """
+    # os.kill(pid, 0) only probes on POSIX; elsewhere it would terminate the process
+    if os.name != 'posix' or not os.path.isdir(root):
+        return 0
+    removed = 0
+    for name in os.listdir(root):
+        if not name.startswith(EPHEMERAL_PREFIX):
+            continue
+        pid = name[len(EPHEMERAL_PREFIX):].split('-')[0]
+        if not pid.isdigit() or _process_alive(int(pid)):
+            continue
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        removed += 1
+    return removed
+
+def prepare_template(template_dir=DEFAULT_TEMPLATE_DIR, log=print):
+    """
+    Create the ephemeral-profile template once by letting Chrome initialize a profile.
+
+    Chrome is started headless on a scratch profile and quit; the result,
+    minus caches and lock files, becomes the template.
+
+    Returns:
+        str: The template directory
+    """
+    template_dir = os.path.expanduser(template_dir)
+    if os.path.exists(os.path.join(template_dir, 'Local State')):
+        return template_dir
+
+    from driver_factory import create_driver
+    scratch_dir = tempfile.mkdtemp(prefix='chrome-template-')
+    try:
+        driver = create_driver('refresh', headless=True, user_data_dir=scratch_dir,
+                               extra_arguments=['--no-first-run', '--no-default-browser-check'])
+        try:
+            driver.get('about:blank')
+        finally:
+            driver.quit()
+
+        building_dir = template_dir + '.building'
+        shutil.rmtree(building_dir, ignore_errors=True)
+        shutil.copytree(scratch_dir, building_dir, symlinks=True,
+                        ignore=shutil.ignore_patterns(*LOCK_FILE_PATTERNS, *TEMPLATE_SKIP_PATTERNS))
+        shutil.rmtree(template_dir, ignore_errors=True)
+        os.replace(building_dir, template_dir)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    if log:
+        log(f"✓ Browser profile template created in {template_dir} ({directory_size(template_dir) / MB:.1f}MB)")
+    return template_dir
+
+def clone_profile(golden_dir, target_dir):
+    """
+    Copy golden_dir's contents into target_dir, copy-on-write when possible.
+
+    Returns:
+        str: 'clone' for a copy-on-write clone, 'copy' for a regular copy
+    """
+    source = os.path.join(golden_dir, '.')
+    if sys.platform == 'darwin':
+        command = ['cp', '-c', '-R', source, target_dir]
+    elif sys.platform.startswith('linux'):
+        command = ['cp', '-a', '--reflink=auto', source, target_dir]
+    else:
+        command = None
+
+    method = 'copy'
+    if command:
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+            method = 'clone'
+        except (OSError, subprocess.CalledProcessError):
+            shutil.rmtree(target_dir, ignore_errors=True)
+            os.makedirs(target_dir, exist_ok=True)
+
+    if method == 'copy':
+        shutil.copytree(golden_dir, target_dir, symlinks=True, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(*LOCK_FILE_PATTERNS))
+    _remove_lock_files(target_dir)
+    return method
+
+class BrowserInstance:
+    def __init__(self, profile_dir, port, owns_profile=True):
+        """
+        Initialize an instance description.
+
+        Args:
+            profile_dir (str): user-data-dir for this instance
+            port (int): Remote debugging port for this instance
+            owns_profile (bool): Delete profile_dir on cleanup
+        """
+        self.profile_dir = profile_dir
+        self.port = port
+        self.owns_profile = owns_profile
+        self.clone_method = None
+        self.clone_seconds = 0.0
+        self.in_memory = False
+        self.chrome_arguments = []
+        _live_instances.append(self)
+
+    def _seed(self, source_dir):
+        started = time.perf_counter()
+        try:
+            self.clone_method = clone_profile(source_dir, self.profile_dir)
+        except Exception:
+            self.cleanup()
+            raise
+        self.clone_seconds = time.perf_counter() - started
+
+    @classmethod
+    def from_golden(cls, golden_dir, prefix='chrome-instance-'):
+        """Clone a golden profile into a temp directory and pick a free port."""
+        golden_dir = os.path.expanduser(golden_dir)
+        profile_dir = tempfile.mkdtemp(prefix=prefix)
+        instance = cls(profile_dir, find_free_port())
+        if os.path.isdir(golden_dir):
+            instance._seed(golden_dir)
+        return instance
+
+    @classmethod
+    def ephemeral(cls, template_dir=DEFAULT_TEMPLATE_DIR, root=TMPFS_ROOT, min_free_mb=256,
+                  max_cache_mb=64, log=print):
+        """
+        Create a throwaway profile on tmpfs, seeded from a template.
+
+        Args:
+            template_dir (str): Pre-initialized profile to copy (None or missing: start empty)
+            root (str): tmpfs mount to place the profile in
+            min_free_mb (int): Memory that must stay free on root beyond the template's size
+            max_cache_mb (int): Chrome disk cache limit, since the cache also lives in memory
+            log (callable): Function used for progress messages
+        """
+        template_dir = os.path.expanduser(template_dir) if template_dir else None
+        if template_dir and not os.path.isdir(template_dir):
+            template_dir = None
+        template_size = directory_size(template_dir) if template_dir else 0
+
+        location = None
+        if root and tmpfs_available(root):
+            swept = sweep_orphans(root)
+            if swept and log:
+                log(f"🧹 Removed {swept} orphaned browser profiles from {root}")
+            needed = template_size + min_free_mb * MB
+            free = shutil.disk_usage(root).free
+            if free >= needed:
+                location = root
+            elif log:
+                log(f"⚠️ Only {free / MB:.0f}MB free in {root} (need {needed / MB:.0f}MB), using a disk profile")
+        elif root and log:
+            log(f"⚠️ {root} is not available, using a disk profile")
+
+        # The owner's PID in the name lets sweep_orphans spot profiles of crashed runs
+        profile_dir = tempfile.mkdtemp(prefix=f'{EPHEMERAL_PREFIX}{os.getpid()}-', dir=location)
+        instance = cls(profile_dir, find_free_port())
+        instance.in_memory = location is not None
+        instance.chrome_arguments = ['--no-first-run', '--no-default-browser-check']
+        if instance.in_memory:
+            instance.chrome_arguments.append(f'--disk-cache-size={max_cache_mb * MB}')
+        if template_dir:
+            instance._seed(template_dir)
+        install_signal_handlers()
+
+        if log:
+            where = 'in memory' if instance.in_memory else 'on disk'
+            seeded = f", seeded in {instance.clone_seconds * 1000:.0f}ms" if template_dir else ""
+            log(f"✓ Ephemeral browser profile {where}: {profile_dir}{seeded}")
+        return instance
+
+    @classmethod
+    def shared(cls, profile_dir):
+        """Use an existing profile in place (no clone), still on a free port."""
+        return cls(os.path.expanduser(profile_dir), find_free_port(), owns_profile=False)
+
+    def debugging_argument(self):
+        """Chrome flag for this instance's remote debugging port."""
+        return f'--remote-debugging-port={self.port}'
+
+    def driver_settings(self):
+        """create_driver() overrides that run Chrome on this profile."""
+        return {'user_data_dir': self.profile_dir, 'extra_arguments': list(self.chrome_arguments)}
+
+    def cleanup(self):
+        """Delete the cloned profile (shared profiles are left alone)."""
+        if self.owns_profile and self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+        self.profile_dir = None
+        if self in _live_instances:
+            _live_instances.remove(self)
+
+def cleanup_all():
+    """Remove every clone still on disk (registered with atexit)."""
+    for instance in list(_live_instances):
+        instance.cleanup()
+
+_previous_handlers = {}
+
+def _exit_on_signal(signum, frame):
+    # Deleting profiles here would pull them out from under a still-running
+    # Chrome: unwind instead, so finally blocks quit the browser first and
+    # the atexit handler removes the profiles afterwards
+    previous = _previous_handlers.get(signum)
+    if callable(previous):
+        previous(signum, frame)
+    else:
+        raise SystemExit(128 + signum)
+
+def install_signal_handlers():
+    """Turn SIGTERM/SIGHUP, which skip atexit by default, into a normal exit that runs it."""
+    global _signal_handlers_installed
+    if _signal_handlers_installed:
+        return
+    for name in ('SIGTERM', 'SIGHUP'):
+        signum = getattr(signal, name, None)
+        if signum is None:
+            continue
+        # Leave ignored signals ignored (e.g. SIGHUP under nohup)
+        if signal.getsignal(signum) == signal.SIG_IGN:
+            continue
+        try:
+            _previous_handlers[signum] = signal.signal(signum, _exit_on_signal)
+        except ValueError:
+            # Only the main thread may install handlers; atexit still applies
+            return
+    _signal_handlers_installed = True
+
+atexit.register(cleanup_all)
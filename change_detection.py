@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Change Detection
+Tells whether a refresh actually produced new content.
+
+DOMChangeDetector hashes configured regions of the page inside the
+browser (FNV-1a over each region's text or HTML) and ships back only the
+hashes - a few bytes per region instead of the full page_source. It keeps
+a short history of hashes and emits a change event naming the regions
+that changed.
+
+ScreenshotChangeDetector covers canvas-heavy pages where the DOM says
+nothing: it grabs a downscaled viewport screenshot, decodes it to a small
+grayscale NumPy array, and compares it with the previous frame using a
+difference hash plus a vectorized block diff. Decoding and diffing run on
+a worker thread so they never delay the next refresh. It needs the
+optional numpy and Pillow packages.
+
+Usage:
+    detector = DOMChangeDetector({'headlines': '#main h2', 'prices': '.price'})
+    detector.on_change(lambda event: print(event['regions']))
+    detector.check(driver)   # after each refresh
+"""
+
+import io
+import time
+import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+# Takes {name: css selector} and a mode ('text' or 'html'); returns
+# {name: hash hex string, or null when the selector matches nothing}
+REGION_HASH_SCRIPT = """
+const regions = arguments[0];
+const mode = arguments[1];
+const fnv1a = (text) => {
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193);
+    }
+    return (hash >>> 0).toString(16).padStart(8, '0') + ':' + text.length.toString(16);
+};
+const hashes = {};
+for (const [name, selector] of Object.entries(regions)) {
+    let elements = [];
+    try { elements = Array.from(document.querySelectorAll(selector)); } catch (e) {}
+    if (!elements.length) {
+        hashes[name] = null;
+        continue;
+    }
+    const content = elements.map((element) => mode === 'html' ? element.outerHTML : (element.innerText || element.textContent || ''));
+    hashes[name] = fnv1a(content.join('\\u0000'));
+}
+return hashes;
+"""
+
+class DOMChangeDetector:
+    def __init__(self, regions=None, mode='text', history=100):
+        """
+        Initialize the change detector.
+
+        Args:
+            regions (dict): Region name -> CSS selector (default: whole body)
+            mode (str): 'text' hashes visible text, 'html' hashes outerHTML
+            history (int): Number of hash snapshots to keep
+        """
+        self.regions = regions or {'page': 'body'}
+        self.mode = mode
+        self.history = deque(maxlen=history)
+        self.listeners = []
+
+    def on_change(self, callback):
+        """Register a callback that receives each change event dict."""
+        self.listeners.append(callback)
+
+    def hash_regions(self, driver):
+        """Hash every region in the browser; returns {name: hash or None}."""
+        return driver.execute_script(REGION_HASH_SCRIPT, self.regions, self.mode) or {}
+
+    def check(self, driver):
+        """
+        Hash the regions and compare with the previous snapshot.
+
+        Returns:
+            list: Names of regions that changed (empty on the first check)
+        """
+        hashes = self.hash_regions(driver)
+        previous = self.history[-1]['hashes'] if self.history else None
+        self.history.append({'time': time.time(), 'hashes': hashes})
+
+        if previous is None:
+            return []
+
+        changed = [name for name in self.regions if hashes.get(name) != previous.get(name)]
+        if changed:
+            event = {'time': time.time(), 'regions': changed, 'hashes': hashes}
+            for callback in self.listeners:
+                callback(event)
+        return changed
+
+    def change_count(self, region):
+        """Number of times a region changed within the kept history."""
+        snapshots = [snapshot['hashes'].get(region) for snapshot in self.history]
+        return sum(1 for before, after in zip(snapshots, snapshots[1:]) if before != after)
+
+class ScreenshotChangeDetector:
+    def __init__(self, threshold=0.02, frame_size=(128, 96), block_size=8, pixel_delta=24, capture_scale=0.25):
+        """
+        Initialize the screenshot change detector.
+
+        Args:
+            threshold (float): Fraction of changed blocks that counts as a change
+            frame_size (tuple): (width, height) of the grayscale frame compared
+            block_size (int): Block edge in frame pixels for the block diff
+            pixel_delta (int): Mean gray-level difference that marks a block as changed
+            capture_scale (float): Scale Chrome applies to the screenshot before sending it
+        """
+        if np is None or Image is None:
+            raise ImportError("Screenshot change detection requires numpy and Pillow (pip install numpy pillow)")
+
+        self.threshold = threshold
+        self.frame_size = frame_size
+        self.block_size = block_size
+        self.pixel_delta = pixel_delta
+        self.capture_scale = capture_scale
+        self.previous_frame = None
+        self.previous_hash = None
+        self.listeners = []
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def on_change(self, callback):
+        """Register a callback that receives each change event dict."""
+        self.listeners.append(callback)
+
+    def capture(self, driver):
+        """Grab a downscaled viewport screenshot; returns encoded image bytes."""
+        try:
+            width, height = driver.execute_script("return [window.innerWidth, window.innerHeight]")
+            result = driver.execute_cdp_cmd('Page.captureScreenshot', {
+                'format': 'jpeg',
+                'quality': 70,
+                'clip': {'x': 0, 'y': 0, 'width': width, 'height': height, 'scale': self.capture_scale}
+            })
+            return base64.b64decode(result['data'])
+        except Exception:
+            # Non-Chromium drivers: full-size PNG, downscaled on decode
+            return driver.get_screenshot_as_png()
+
+    def decode(self, image_bytes):
+        """Decode to a small grayscale float array."""
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            frame = image.convert('L').resize(self.frame_size, Image.BILINEAR)
+            return np.asarray(frame, dtype=np.float32)
+
+    def difference_hash(self, frame):
+        """64-bit difference hash (dHash) of a frame."""
+        small = np.asarray(Image.fromarray(frame.astype(np.uint8)).resize((9, 8), Image.BILINEAR), dtype=np.float32)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return int(np.packbits(bits).view('>u8')[0])
+
+    def block_diff(self, frame, previous):
+        """Fraction of blocks whose mean absolute difference exceeds pixel_delta."""
+        size = self.block_size
+        rows = frame.shape[0] // size
+        cols = frame.shape[1] // size
+        delta = np.abs(frame[:rows * size, :cols * size] - previous[:rows * size, :cols * size])
+        block_means = delta.reshape(rows, size, cols, size).mean(axis=(1, 3))
+        return float((block_means > self.pixel_delta).mean())
+
+    def compare(self, image_bytes):
+        """Decode a screenshot and compare it with the previous frame (runs on the worker)."""
+        frame = self.decode(image_bytes)
+        frame_hash = self.difference_hash(frame)
+        previous_frame, previous_hash = self.previous_frame, self.previous_hash
+        self.previous_frame, self.previous_hash = frame, frame_hash
+
+        if previous_frame is None or previous_frame.shape != frame.shape:
+            return None
+
+        event = {
+            'time': time.time(),
+            'changed_fraction': self.block_diff(frame, previous_frame),
+            'hash_distance': bin(frame_hash ^ previous_hash).count('1')
+        }
+        event['changed'] = event['changed_fraction'] >= self.threshold
+        if event['changed']:
+            for callback in self.listeners:
+                callback(event)
+        return event
+
+    def submit(self, driver):
+        """Capture now and compare in the background; returns a Future with the event."""
+        image_bytes = self.capture(driver)
+        return self.executor.submit(self.compare, image_bytes)
+
+    def close(self):
+        """Wait for pending comparisons and stop the worker."""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Conditional Refresh
+Cheap HTTP check that decides whether a full browser refresh is needed.
+
+The browser's cookies (and user agent) are copied into a pooled
+requests.Session, and each check sends a conditional GET using the
+ETag / Last-Modified validators from the previous response. A 304, or a
+body with the same hash as last time, means the page has not changed and
+the expensive driver.refresh() can be skipped. A full refresh is still
+forced once max_staleness seconds have passed since the last one.
+
+When a check finds new content, its validators and hash are held as
+pending and only adopted by mark_refreshed(), so a failed browser
+refresh is retried on the next check instead of being reported as
+unchanged.
+
+Requires the optional 'requests' package (see requirements_advanced.txt).
+"""
+
+import time
+import hashlib
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+class ConditionalRefreshChecker:
+    def __init__(self, url, max_staleness=900, pool_size=4, timeout=10):
+        """
+        Initialize the checker.
+
+        Args:
+            url (str): URL to check
+            max_staleness (float): Force a full refresh after this many seconds
+            pool_size (int): Keep-alive connections kept in the session pool
+            timeout (float): HTTP timeout in seconds
+        """
+        if requests is None:
+            raise ImportError("Conditional refresh requires 'requests' (pip install requests)")
+
+        self.url = url
+        self.max_staleness = max_staleness
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        self.pending = None
+        self.last_full_refresh = time.monotonic()
+
+    def sync_from_driver(self, driver):
+        """Copy the browser's cookies and user agent into the HTTP session."""
+        try:
+            user_agent = driver.execute_script("return navigator.userAgent")
+            if user_agent:
+                self.session.headers['User-Agent'] = user_agent
+        except Exception:
+            pass
+
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain'),
+                path=cookie.get('path', '/')
+            )
+
+    def _validators(self, response):
+        return (
+            response.headers.get('ETag') or self.etag,
+            response.headers.get('Last-Modified') or self.last_modified,
+            hashlib.sha256(response.content).hexdigest()
+        )
+
+    def _remember(self, response):
+        self.etag, self.last_modified, self.body_hash = self._validators(response)
+
+    def prime(self):
+        """Record validators and body hash for the page as currently loaded."""
+        try:
+            response = self.session.get(self.url, timeout=self.timeout)
+            if response.ok:
+                self._remember(response)
+        except requests.RequestException:
+            pass
+        self.last_full_refresh = time.monotonic()
+
+    def check(self):
+        """
+        Check whether the resource changed since the last full refresh.
+
+        Returns:
+            tuple: (needs_refresh, reason)
+        """
+        self.pending = None
+        if time.monotonic() - self.last_full_refresh >= self.max_staleness:
+            return True, 'max staleness reached'
+
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        try:
+            response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            return True, f'check failed ({e.__class__.__name__})'
+
+        if response.status_code == 304:
+            return False, 'not modified (304)'
+        if not response.ok:
+            return True, f'HTTP {response.status_code}'
+
+        validators = self._validators(response)
+        if self.body_hash is not None and validators[2] == self.body_hash:
+            # Same content the browser already shows, so the new validators are safe to use
+            self._remember(response)
+            return False, 'body unchanged'
+
+        # Adopted by mark_refreshed() once the browser actually shows this version
+        self.pending = validators
+        if self.body_hash is None:
+            return True, 'no baseline'
+        return True, 'content changed'
+
+    def mark_refreshed(self):
+        """Note that a full browser refresh just happened and adopt the pending validators."""
+        if self.pending:
+            self.etag, self.last_modified, self.body_hash = self.pending
+            self.pending = None
+        self.last_full_refresh = time.monotonic()
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
@@ -29,6 +29,59 @@ CONFIG = {
     'retry_delay': 5,  # seconds to wait before retrying failed refresh
     'max_retries': 3,  # maximum number of retry attempts
     
+    # Timing settings - refreshes land on a fixed grid; when a refresh overruns
+    # a tick, 'skip' drops the missed ticks and 'coalesce' refreshes once right away
+    'missed_tick_policy': 'skip',
+    
+    # Conditional refresh - send a cheap conditional HTTP GET (ETag/Last-Modified,
+    # else body hash) with the browser's cookies first, and only do a full browser
+    # refresh when the page changed or it has gone this long without one
+    # (requires 'requests')
+    'conditional_refresh': False,
+    'max_staleness_minutes': 15,
+    
+    # Screenshot change detection - compare a downscaled grayscale screenshot
+    # after each refresh with the previous one and log a visual change when at
+    # least this fraction of 8x8 blocks differ (requires 'numpy' and 'pillow')
+    'screenshot_change_detection': False,
+    'screenshot_change_threshold': 0.02,
+    
+    # Resource blocking - per-URL policies keyed by URL prefix ('*' matches any
+    # URL without a more specific entry). block_types: 'image', 'font', 'media',
+    # 'stylesheet', 'analytics'; block_patterns: extra Chrome URL wildcards.
+    # Each refresh reports requests blocked and bytes saved vs. a warm unblocked reload.
+    # Example: {'https://example.com': {'block_types': ['image', 'font', 'media']}}
+    'resource_policies': {},
+    
+    # Refresh metrics - record TTFB, DOMContentLoaded, load time, transfer size
+    # and the document's HTTP status for every refresh (HTTP 4xx/5xx counts as a
+    # failed refresh) and export per-URL percentiles for Prometheus and as CSV
+    # (files are written to the working directory)
+    'refresh_metrics': False,
+    'metrics_history': 1000,  # samples kept in memory
+    'metrics_prometheus_file': 'refresh_metrics.prom',
+    'metrics_csv_file': 'refresh_metrics.csv',
+    
+    # Adaptive interval - halve the interval when a refresh finds new content and
+    # back off (x1.5) when it does not, staying within these bounds (minutes).
+    # The learned interval is remembered per URL in adaptive_state_file.
+    'adaptive_interval': False,
+    'adaptive_min_interval': 1,
+    'adaptive_max_interval': 60,
+    'adaptive_state_file': 'adaptive_intervals.json',
+    
+    # Ephemeral browser profiles on tmpfs (Linux /dev/shm) instead of a new
+    # profile on disk, seeded from a pre-initialized template directory
+    # (created on first use). Falls back to disk when less than
+    # tmpfs_min_free_mb would remain free.
+    'tmpfs_profiles': False,
+    'tmpfs_root': '/dev/shm',
+    'profile_template_dir': '~/.cache/browser-auto-refresh/chrome-template',
+    'tmpfs_min_free_mb': 256,
+    
+    # Browserless HTTP backend - maximum requests in flight at once
+    'http_concurrency': 20,
+    
     # Logging settings
     'show_timestamps': True,
     'show_refresh_counter': True,
@@ -48,6 +101,12 @@ QUICK_URLS = {
 }
 
 # You can add your frequently used URLs here
+# Entries can also be dicts with a per-URL refresh interval (in minutes), used
+# when monitoring all URLs at once from a single browser:
+#     'status': {'url': 'https://your-status-page.com', 'interval': 1},
+# Pages that don't need JavaScript can skip the browser entirely with
+# 'backend': 'http' (requires 'requests'):
+#     'health': {'url': 'https://your-site.com/health', 'interval': 1, 'backend': 'http'},
 FAVORITE_URLS = {
     # Example:
     # 'dashboard': 'https://your-dashboard.com',
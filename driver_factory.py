@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Driver Factory
+One place that builds Chrome WebDrivers for every script.
+
+Scripts ask for a named profile instead of assembling Options by hand:
+    - 'refresh':  plain stability flags, for the page refreshers
+    - 'activity': adds the anti-automation flags and hides navigator.webdriver
+    - 'apply':    'activity' plus a desktop user agent and blocked notifications
+
+Keyword overrides adjust a profile (headless, user_data_dir, extra
+arguments, performance logging, ...). The compiled Options are cached per
+profile and overrides, so fallback and repeated launches reuse them.
+
+Every launch is timed phase by phase: driver resolution, chromedriver
+service spawn, browser session creation, and the first navigation. The
+timings are appended as one JSON object per line to driver_startup.jsonl.
+
+When BROWSER_BROKER_URL points at a running browser_broker.py, profiles
+without a user_data_dir attach to a leased, already-warm Chrome instead of
+launching one; quitting the driver hands the lease back. Launch flags the
+broker's Chrome was not started with make the factory launch its own
+Chrome instead; settings that cannot reach a running browser (prefs,
+headless mode) are logged. An attached driver only sees and opens tabs
+inside its lease's browser context.
+
+Usage:
+    driver = create_driver('activity', user_data_dir='/path/to/profile')
+"""
+
+import os
+import sys
+import json
+import time
+from datetime import datetime
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.command import Command
+from selenium.common.exceptions import NoSuchWindowException
+from driver_resolver import resolve_chromedriver, resolution_info
+from browser_broker import BrokerClient
+from network_capture import enable_performance_logging
+
+DESKTOP_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Seconds between lease heartbeats while an attached driver is in use
+LEASE_RENEW_INTERVAL = 60
+
+HIDE_WEBDRIVER_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+PROFILES = {
+    'refresh': {
+        'arguments': ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu'],
+        'window_size': (1920, 1080),
+    },
+    'activity': {
+        'arguments': ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu'],
+        'window_size': (1920, 1080),
+        'stealth': True,
+        'hide_webdriver': True,
+    },
+    'apply': {
+        'arguments': ['--no-sandbox', '--disable-dev-shm-usage'],
+        'window_size': (1920, 1080),
+        'stealth': True,
+        'hide_webdriver': True,
+        'user_agent': DESKTOP_USER_AGENT,
+        'prefs': {
+            'profile.default_content_setting_values.notifications': 2,
+            'profile.default_content_settings.popups': 0
+        },
+    },
+}
+
+class TimedService(Service):
+    """chromedriver Service that records how long spawning it took."""
+
+    def start(self):
+        started = time.perf_counter()
+        super().start()
+        self.start_elapsed = time.perf_counter() - started
+
+class TimedChrome(webdriver.Chrome):
+    """Chrome driver that times its first navigation and then files the startup report."""
+
+    startup_report = None
+    factory = None
+    lease_release = None
+    lease = None
+    broker = None
+    lease_renewed = 0.0
+
+    def lease_handles(self):
+        """Window handles belonging to this driver's broker lease."""
+        handles = self.broker.targets(self.lease['lease_id'])
+        return handles if handles is not None else self.lease['targets']
+
+    def execute(self, driver_command, params=None):
+        if self.lease is None:
+            return super().execute(driver_command, params)
+
+        # The broker reclaims idle leases: any command while attached keeps ours alive
+        if time.monotonic() - self.lease_renewed > LEASE_RENEW_INTERVAL:
+            self.lease_renewed = time.monotonic()
+            self.broker.renew(self.lease['lease_id'])
+
+        # Other broker clients' tabs share this Chrome: keep to our own browser context
+        if driver_command == Command.NEW_WINDOW:
+            handle = self.broker.open_tab(self.lease['lease_id'])
+            if not handle:
+                raise NoSuchWindowException("Browser broker could not open a tab for this lease")
+            self.lease['targets'].append(handle)
+            return {'value': {'handle': handle, 'type': 'tab'}}
+        if driver_command == Command.SWITCH_TO_WINDOW and params['handle'] not in self.lease_handles():
+            raise NoSuchWindowException(f"Window {params['handle']} belongs to another broker client")
+        response = super().execute(driver_command, params)
+        if driver_command == Command.W3C_GET_WINDOW_HANDLES:
+            allowed = set(self.lease_handles())
+            response['value'] = [handle for handle in response['value'] if handle in allowed]
+        return response
+
+    def get(self, url):
+        report = self.startup_report
+        if report is None:
+            return super().get(url)
+        self.startup_report = None
+        started = time.perf_counter()
+        try:
+            return super().get(url)
+        finally:
+            report['first_navigation_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            report['total_ms'] = round(report['total_ms'] + report['first_navigation_ms'], 1)
+            self.factory.write_report(report)
+
+    def quit(self):
+        # Never navigated: still record the startup phases
+        if self.startup_report is not None:
+            self.factory.write_report(self.startup_report)
+            self.startup_report = None
+        # Attached to a broker's Chrome: quitting only detaches, so give the lease back
+        try:
+            super().quit()
+        finally:
+            self.lease = None
+            if self.lease_release:
+                self.lease_release()
+                self.lease_release = None
+
+class DriverFactory:
+    def __init__(self, report_path='driver_startup.jsonl', log=print, broker_url=None):
+        """
+        Initialize the factory.
+
+        Args:
+            report_path (str): JSONL file receiving one startup timing record per launch (None to skip)
+            log (callable): Function used for progress messages
+            broker_url (str): Browser broker to attach to (default: $BROWSER_BROKER_URL)
+        """
+        self.report_path = report_path
+        self.log = log
+        self.options_cache = {}
+        broker_url = broker_url or os.environ.get('BROWSER_BROKER_URL')
+        self.broker = BrokerClient(broker_url) if broker_url else None
+
+    def profile(self, name, **overrides):
+        """Merge a named profile with overrides; 'extra_arguments' appends to 'arguments'."""
+        if name not in PROFILES:
+            raise ValueError(f"Unknown driver profile '{name}' (choose from {sorted(PROFILES)})")
+        settings = dict(PROFILES[name])
+        extra_arguments = overrides.pop('extra_arguments', [])
+        settings.update(overrides)
+        settings['arguments'] = list(settings.get('arguments', [])) + list(extra_arguments)
+        return settings
+
+    def build_options(self, settings):
+        """Compile profile settings into Chrome Options."""
+        options = Options()
+        for argument in settings['arguments']:
+            options.add_argument(argument)
+        if settings.get('headless'):
+            options.add_argument('--headless')
+        if settings.get('window_size'):
+            width, height = settings['window_size']
+            options.add_argument(f'--window-size={width},{height}')
+        if settings.get('user_data_dir'):
+            options.add_argument(f"--user-data-dir={settings['user_data_dir']}")
+        if settings.get('profile_directory'):
+            options.add_argument(f"--profile-directory={settings['profile_directory']}")
+        if settings.get('stealth'):
+            options.add_argument('--disable-blink-features=AutomationControlled')
+            options.add_experimental_option('excludeSwitches', ['enable-automation'])
+            options.add_experimental_option('useAutomationExtension', False)
+        if settings.get('user_agent'):
+            options.add_argument(f"--user-agent={settings['user_agent']}")
+        if settings.get('prefs'):
+            options.add_experimental_option('prefs', settings['prefs'])
+        if settings.get('performance_log'):
+            enable_performance_logging(options)
+        return options
+
+    def options_for(self, name, **overrides):
+        """Compiled Options for a profile, cached per profile and overrides."""
+        settings = self.profile(name, **overrides)
+        key = json.dumps(settings, sort_keys=True, default=str)
+        if key not in self.options_cache:
+            self.options_cache[key] = self.build_options(settings)
+        return settings, self.options_cache[key]
+
+    def create(self, name, **overrides):
+        """
+        Launch Chrome with a named profile, timing each startup phase.
+
+        Returns:
+            TimedChrome: The driver; its first get() completes the startup report
+        """
+        settings, options = self.options_for(name, **overrides)
+
+        # A persistent profile needs its own Chrome; everything else can use the broker
+        if self.broker and not settings.get('user_data_dir'):
+            driver = self.attach(name, settings)
+            if driver:
+                return driver
+
+        started = time.perf_counter()
+        driver_path = resolve_chromedriver(log=self.log)
+        resolved = time.perf_counter()
+
+        service = TimedService(driver_path)
+        driver = TimedChrome(service=service, options=options)
+        created = time.perf_counter()
+
+        if settings.get('hide_webdriver'):
+            driver.execute_script(HIDE_WEBDRIVER_SCRIPT)
+
+        self._start_report(driver, name, started, resolved, created, service)
+        return driver
+
+    def attach(self, name, settings):
+        """
+        Attach to a tab leased from the browser broker.
+
+        Returns:
+            TimedChrome: The attached driver, or None if no lease could be obtained
+        """
+        started = time.perf_counter()
+        lease = self.broker.lease(isolated=True)
+        if not lease:
+            if self.log:
+                self.log(f"⚠️ Browser broker at {self.broker.url} unavailable, launching Chrome")
+            return None
+        leased = time.perf_counter()
+
+        # Launch flags cannot reach a running browser: only attach if its Chrome already has them
+        broker_arguments = lease.get('arguments', [])
+        required = list(settings['arguments'])
+        if settings.get('stealth'):
+            required.append('--disable-blink-features=AutomationControlled')
+        missing = [argument for argument in required if argument not in broker_arguments]
+        if missing:
+            self.broker.release(lease['lease_id'])
+            if self.log:
+                self.log(f"⚠️ Broker Chrome was not started with {' '.join(missing)}, launching Chrome")
+            return None
+        if self.log:
+            if bool(settings.get('headless')) != bool(lease.get('headless')):
+                mode = 'headless' if lease.get('headless') else 'visible'
+                self.log(f"⚠️ Broker Chrome is {mode}; the profile's headless setting is not applied")
+            for key in ('prefs', 'profile_directory'):
+                if settings.get(key):
+                    self.log(f"⚠️ '{key}' cannot be applied to the broker's running Chrome, ignoring it")
+
+        # Performance logging is chromedriver-side, so it still works when attached
+        options = Options()
+        options.debugger_address = lease['debugger_address']
+        if settings.get('performance_log'):
+            enable_performance_logging(options)
+
+        service = driver = None
+        try:
+            service = TimedService(resolve_chromedriver(log=self.log))
+            resolved = time.perf_counter()
+            driver = TimedChrome(service=service, options=options)
+            driver.lease_release = lambda: self.broker.release(lease['lease_id'])
+            driver.switch_to.window(lease['target_id'])
+            driver.broker = self.broker
+            driver.lease = lease
+            lease.setdefault('targets', [lease['target_id']])
+            if settings.get('user_agent'):
+                driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': settings['user_agent']})
+            if settings.get('window_size'):
+                width, height = settings['window_size']
+                if f'--window-size={width},{height}' not in broker_arguments:
+                    driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
+                        'width': width, 'height': height, 'deviceScaleFactor': 0, 'mobile': False
+                    })
+            if settings.get('hide_webdriver'):
+                driver.execute_script(HIDE_WEBDRIVER_SCRIPT)
+        except Exception:
+            # Stop the chromedriver this attempt spawned, then hand the lease back
+            try:
+                if driver is not None:
+                    driver.lease = None
+                    driver.lease_release = None
+                    driver.quit()
+                elif service is not None:
+                    service.stop()
+            except Exception:
+                pass
+            self.broker.release(lease['lease_id'])
+            raise
+        created = time.perf_counter()
+
+        report = self._start_report(driver, name, leased, resolved, created, service)
+        report['lease_ms'] = round((leased - started) * 1000, 1)
+        report['total_ms'] = round((created - started) * 1000, 1)
+        report['broker'] = lease['debugger_address']
+        return driver
+
+    def _start_report(self, driver, name, started, resolved, created, service):
+        service_spawn = getattr(service, 'start_elapsed', 0.0)
+        info = resolution_info() or {}
+        driver.factory = self
+        driver.startup_report = {
+            'time': datetime.now().isoformat(),
+            'script': os.path.basename(sys.argv[0]),
+            'profile': name,
+            'driver_source': info.get('source'),
+            'chrome_version': info.get('chrome_version'),
+            'resolution_ms': round((resolved - started) * 1000, 1),
+            'service_spawn_ms': round(service_spawn * 1000, 1),
+            'session_ms': round((created - resolved - service_spawn) * 1000, 1),
+            'first_navigation_ms': None,
+            'total_ms': round((created - started) * 1000, 1),
+        }
+        if self.log:
+            report = driver.startup_report
+            attached = " (attached to broker)" if driver.lease_release else ""
+            self.log(f"⏱️  Chrome startup ({name}){attached}: resolve {report['resolution_ms']:.0f}ms, "
+                     f"service {report['service_spawn_ms']:.0f}ms, session {report['session_ms']:.0f}ms")
+        return driver.startup_report
+
+    def write_report(self, report):
+        """Append one startup record to the JSONL report."""
+        if not self.report_path:
+            return
+        try:
+            with open(self.report_path, 'a') as f:
+                f.write(json.dumps(report) + '\n')
+        except OSError as e:
+            print(f"⚠️ Could not write startup report: {e}")
+
+_factory = None
+
+def create_driver(profile, **overrides):
+    """Launch Chrome with a named profile using the shared factory."""
+    global _factory
+    if _factory is None:
+        _factory = DriverFactory()
+    return _factory.create(profile, **overrides)
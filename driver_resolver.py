@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+ChromeDriver Resolver
+Finds a matching chromedriver without a network lookup on every start.
+
+ChromeDriverManager().install() asks the internet for the latest driver
+version on each launch, which costs seconds and fails offline. The
+resolver instead caches the resolved driver path keyed by the installed
+Chrome major version:
+
+    1. Chrome binary unchanged since last run (same path and mtime) and
+       the cached driver still exists -> use it, no processes spawned
+    2. Chrome changed: read its version; a cached driver for that major
+       version is reused
+    3. Otherwise look offline for a matching driver (PATH, the
+       webdriver-manager download cache)
+    4. Only then fall back to ChromeDriverManager (network)
+
+If nothing is found, None is returned and Selenium's own driver manager
+takes over (Service() without a path). The result is also memoized for
+the process, so fallback paths such as setup_driver_fresh resolve for free.
+
+Usage:
+    service = Service(resolve_chromedriver())
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import subprocess
+from datetime import datetime
+
+DEFAULT_CACHE_PATH = os.path.expanduser('~/.cache/browser-auto-refresh/chromedriver.json')
+
+CHROME_CANDIDATES = {
+    'darwin': ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'],
+    'win32': [
+        os.path.expandvars(r'%ProgramFiles%\Google\Chrome\Application\chrome.exe'),
+        os.path.expandvars(r'%ProgramFiles(x86)%\Google\Chrome\Application\chrome.exe'),
+        os.path.expandvars(r'%LocalAppData%\Google\Chrome\Application\chrome.exe'),
+    ],
+    'linux': ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'],
+}
+
+VERSION_PATTERN = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+def find_chrome_binary():
+    """Return the path of the installed Chrome binary, or None."""
+    platform = 'linux' if sys.platform.startswith('linux') else sys.platform
+    for candidate in CHROME_CANDIDATES.get(platform, []):
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.exists(path):
+            return path
+    return None
+
+def _run_version(binary):
+    try:
+        output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+def chrome_version(binary):
+    """Full version string of a Chrome binary (e.g. '120.0.6099.109'), or None."""
+    if sys.platform == 'darwin':
+        # Info.plist avoids starting Chrome just to print its version
+        import plistlib
+        plist_path = os.path.join(binary.split('.app/')[0] + '.app', 'Contents', 'Info.plist')
+        try:
+            with open(plist_path, 'rb') as f:
+                return plistlib.load(f).get('CFBundleShortVersionString')
+        except (OSError, ValueError):
+            pass
+    elif sys.platform == 'win32':
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Google\Chrome\BLBeacon') as key:
+                return winreg.QueryValueEx(key, 'version')[0]
+        except OSError:
+            pass
+    return _run_version(binary)
+
+def driver_version(driver_path):
+    """Full version string reported by a chromedriver binary, or None."""
+    return _run_version(driver_path)
+
+def major_version(version):
+    """Major component of a version string ('120.0.6099.109' -> '120')."""
+    return version.split('.')[0] if version else None
+
+class DriverResolver:
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, allow_network=True):
+        """
+        Initialize the resolver.
+
+        Args:
+            cache_path (str): JSON file remembering resolved drivers
+            allow_network (bool): Fall back to ChromeDriverManager when nothing local matches
+        """
+        self.cache_path = cache_path
+        self.allow_network = allow_network
+        self.cache = {'chrome': {}, 'drivers': {}}
+        self.load()
+
+    def load(self):
+        """Load the resolution cache."""
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r') as f:
+                    self.cache.update(json.load(f))
+        except Exception as e:
+            print(f"⚠️ Could not load chromedriver cache: {e}")
+
+    def save(self):
+        """Save the resolution cache."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.cache, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"⚠️ Could not save chromedriver cache: {e}")
+
+    def _usable(self, path):
+        return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+    def _local_candidates(self):
+        on_path = shutil.which('chromedriver')
+        if on_path:
+            yield on_path
+        # Drivers webdriver-manager downloaded earlier: ~/.wdm/drivers/chromedriver/<os>/<version>/...
+        pattern = os.path.expanduser(os.path.join('~', '.wdm', 'drivers', 'chromedriver', '**', 'chromedriver*'))
+        for path in sorted(glob.glob(pattern, recursive=True), reverse=True):
+            if not path.endswith(('.zip', '.json')):
+                yield path
+
+    def _find_offline(self, major):
+        for path in self._local_candidates():
+            if self._usable(path) and major_version(driver_version(path)) == major:
+                return path
+        return None
+
+    def _download(self):
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+        except ImportError:
+            return None
+        try:
+            return ChromeDriverManager().install()
+        except Exception as e:
+            print(f"⚠️ ChromeDriver download failed: {e}")
+            return None
+
+    def resolve(self):
+        """
+        Resolve a chromedriver matching the installed Chrome.
+
+        Returns:
+            tuple: (driver path or None, info dict with source, chrome_version and elapsed seconds)
+        """
+        start = time.perf_counter()
+        info = {'source': None, 'chrome_version': None, 'elapsed': 0.0}
+
+        chrome = find_chrome_binary()
+        mtime = os.path.getmtime(chrome) if chrome else None
+        known = self.cache['chrome'].get(chrome or '')
+        path = None
+
+        if known and known.get('mtime') == mtime:
+            # Chrome unchanged since the last run: trust the cached major version
+            info['chrome_version'] = known.get('version')
+            major = major_version(known.get('version'))
+        else:
+            info['chrome_version'] = chrome_version(chrome) if chrome else None
+            major = major_version(info['chrome_version'])
+
+        cached = self.cache['drivers'].get(major or '')
+        if cached and self._usable(cached.get('path')):
+            path, info['source'] = cached['path'], 'cache'
+        elif major:
+            path = self._find_offline(major)
+            info['source'] = 'local' if path else None
+
+        if not path and self.allow_network:
+            path = self._download()
+            if path:
+                info['source'] = 'download'
+                major = major or major_version(driver_version(path))
+
+        changed = False
+        if chrome and info['chrome_version'] and (not known or known.get('mtime') != mtime):
+            self.cache['chrome'][chrome] = {'mtime': mtime, 'version': info['chrome_version']}
+            changed = True
+        if path and major and info['source'] != 'cache':
+            self.cache['drivers'][major] = {'path': path, 'resolved': datetime.now().isoformat()}
+            changed = True
+        if changed:
+            self.save()
+
+        info['elapsed'] = time.perf_counter() - start
+        return path, info
+
+_resolved = None
+
+def resolve_chromedriver(log=print):
+    """
+    Resolve the chromedriver path once per process and report how long it took.
+
+    Returns:
+        str: Driver path, or None to let Selenium locate a driver itself
+    """
+    global _resolved
+    if _resolved is None:
+        path, info = DriverResolver().resolve()
+        _resolved = (path, info)
+        if log:
+            if path:
+                log(f"🔧 ChromeDriver for Chrome {info['chrome_version'] or '?'} from {info['source']} "
+                    f"in {info['elapsed'] * 1000:.0f}ms")
+            else:
+                log(f"⚠️ No cached ChromeDriver found ({info['elapsed'] * 1000:.0f}ms), using Selenium Manager")
+    return _resolved[0]
+
+def resolution_info():
+    """Info dict from this process's resolution (None before resolve_chromedriver runs)."""
+    return _resolved[1] if _resolved else None
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Browserless HTTP Refresh Engine
+Keeps static pages (no JavaScript needed) alive with plain HTTP requests.
+
+AsyncHTTPRefreshEngine refreshes many URLs from one asyncio event loop:
+each URL runs on its own fixed-cadence schedule, a semaphore caps how
+many requests are in flight at once, and the blocking requests run on a
+worker pool. requests.Session is not thread-safe, so every worker thread
+keeps its own pooled keep-alive session. Every refresh reports the HTTP
+status and latency, and per-URL totals are kept for the summary.
+
+HTTPRefresher wraps the engine behind the same interface as
+WebPageRefresher (setup_driver / load_page / refresh_page /
+start_auto_refresh / cleanup), so a single URL can be switched from
+Chrome to plain HTTP without touching the caller; its refresh loop runs
+on the engine.
+
+Requires the optional 'requests' package (see requirements_advanced.txt).
+"""
+
+import time
+import asyncio
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+from auto_refresh import WebPageRefresher
+
+class AsyncHTTPRefreshEngine:
+    def __init__(self, concurrency=20, timeout=15, log=print):
+        """
+        Initialize the engine.
+
+        Args:
+            concurrency (int): Maximum requests in flight (also the connection pool size)
+            timeout (float): HTTP timeout in seconds
+            log (callable): Function used for progress messages
+        """
+        if requests is None:
+            raise ImportError("The HTTP refresh backend requires 'requests' (pip install requests)")
+
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.log = log
+        self.local = threading.local()
+        self.sessions = []
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.stopping = False
+        self.loop = None
+        self.stop_event = None
+        self.finished = threading.Event()
+        self.finished.set()
+
+    def session(self):
+        """The calling thread's keep-alive session (requests.Session is not thread-safe)."""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=1)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self.local.session = session
+            with self.lock:
+                self.sessions.append(session)
+        return session
+
+    def fetch(self, url):
+        """Fetch a URL once; returns a result dict with status and latency."""
+        start = time.monotonic()
+        result = {'url': url, 'ok': False, 'status': None, 'latency': None, 'bytes': 0, 'error': None}
+        try:
+            response = self.session().get(url, timeout=self.timeout)
+            result['status'] = response.status_code
+            result['bytes'] = len(response.content)
+            result['ok'] = response.ok
+        except requests.RequestException as e:
+            result['error'] = e.__class__.__name__
+        result['latency'] = time.monotonic() - start
+        self._record(result)
+        return result
+
+    def _record(self, result):
+        with self.lock:
+            stats = self.stats.setdefault(result['url'], {'refreshes': 0, 'errors': 0, 'latency_total': 0.0, 'last_status': None})
+            stats['refreshes'] += 1
+            stats['latency_total'] += result['latency']
+            stats['last_status'] = result['status']
+            if not result['ok']:
+                stats['errors'] += 1
+
+    async def fetch_async(self, url, semaphore):
+        """Fetch a URL on the worker pool, respecting the concurrency limit."""
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.fetch, url)
+
+    async def _refresh_loop(self, policy, semaphore):
+        loop = asyncio.get_running_loop()
+        interval = policy['interval']
+        next_due = loop.time() + interval
+        while not self.stopping:
+            try:
+                # Sleep until the deadline, waking early when stop() is called
+                await asyncio.wait_for(self.stop_event.wait(), max(next_due - loop.time(), 0))
+            except asyncio.TimeoutError:
+                pass
+            if self.stopping:
+                break
+            result = await self.fetch_async(policy['url'], semaphore)
+            self.log(self.format_result(result))
+            # Stay on the fixed grid; skip ticks missed while the request ran
+            next_due += interval
+            now = loop.time()
+            if now > next_due:
+                next_due += ((now - next_due) // interval + 1) * interval
+
+    async def run(self, policies):
+        """Refresh every policy's URL on its own interval until stop() is called."""
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._refresh_loop(policy, semaphore) for policy in policies))
+
+    def start(self, policies):
+        """Blocking entry point: run the event loop for the given policies."""
+        self.finished.clear()
+        try:
+            asyncio.run(self.run(policies))
+        finally:
+            self.loop = None
+            self.finished.set()
+
+    def stop(self):
+        """Ask every refresh loop to finish after its current request."""
+        self.stopping = True
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self.stop_event.set)
+            except RuntimeError:
+                # Loop already closed
+                pass
+
+    def format_result(self, result):
+        """One-line status for a single refresh."""
+        if result['ok']:
+            return f"✓ {result['url']} → {result['status']} in {result['latency'] * 1000:.0f}ms ({result['bytes']} bytes)"
+        reason = result['error'] or f"HTTP {result['status']}"
+        return f"✗ {result['url']} → {reason} after {result['latency'] * 1000:.0f}ms"
+
+    def summary(self):
+        """Per-URL refresh totals as printable lines."""
+        lines = []
+        with self.lock:
+            snapshot = {url: dict(stats) for url, stats in self.stats.items()}
+        for url, stats in snapshot.items():
+            mean = stats['latency_total'] / stats['refreshes'] if stats['refreshes'] else 0.0
+            lines.append(f"📊 {url}: {stats['refreshes']} refreshes, {stats['errors']} errors, "
+                         f"mean {mean * 1000:.0f}ms, last status {stats['last_status']}")
+        return lines
+
+    def close(self):
+        """Stop the event loop, then release worker threads and pooled connections."""
+        self.stop()
+        # The loop may still be handing work to the executor until it exits
+        if not self.finished.wait(self.timeout + 5):
+            self.log("⚠️ HTTP refresh loop did not stop in time")
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            sessions, self.sessions = self.sessions, []
+        for session in sessions:
+            session.close()
+
+class HTTPRefresher(WebPageRefresher):
+    """WebPageRefresher that refreshes with plain HTTP instead of Chrome."""
+
+    def __init__(self, url, refresh_interval=300, missed_tick_policy='skip'):
+        super().__init__(url, refresh_interval, missed_tick_policy)
+        self.engine = None
+
+    def setup_driver(self):
+        """Create the HTTP engine (no browser is launched)."""
+        try:
+            self.engine = AsyncHTTPRefreshEngine()
+            print("✓ HTTP refresh backend initialized (no browser)")
+            return True
+        except Exception as e:
+            print(f"✗ Error setting up HTTP backend: {e}")
+            return False
+
+    def load_page(self):
+        """Fetch the page once."""
+        print(f"Loading page: {self.url}")
+        result = self.engine.fetch(self.url)
+        print(self.engine.format_result(result))
+        return result['ok']
+
+    def refresh_page(self):
+        """Fetch the page again."""
+        result = self.engine.fetch(self.url)
+        if result['ok']:
+            print(f"✓ Page refreshed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} "
+                  f"(HTTP {result['status']}, {result['latency'] * 1000:.0f}ms)")
+        else:
+            print(self.engine.format_result(result))
+        return result['ok']
+
+    def start_auto_refresh(self):
+        """Load the page once, then refresh it on the engine's event loop."""
+        if not self.setup_driver():
+            return
+        
+        if not self.load_page():
+            self.cleanup()
+            return
+        
+        print(f"\n🔄 Auto-refresh started (HTTP, no browser)!")
+        print(f"📍 URL: {self.url}")
+        print(f"⏰ Refresh interval: {self.refresh_interval} seconds ({self.refresh_interval//60} minutes)")
+        print(f"\nPress Ctrl+C to stop the auto-refresh\n")
+        
+        try:
+            self.engine.start([{'url': self.url, 'interval': self.refresh_interval}])
+        except KeyboardInterrupt:
+            print(f"\n\n🛑 Auto-refresh stopped by user")
+        except Exception as e:
+            print(f"\n✗ Unexpected error: {e}")
+        finally:
+            self.cleanup()
+
+    def detect_changes(self):
+        """DOM change detection needs a browser; not available over plain HTTP."""
+        return None
+
+    def cleanup(self):
+        """Close the HTTP engine."""
+        if self.engine:
+            for line in self.engine.summary():
+                print(line)
+            self.engine.close()
+            self.engine = None
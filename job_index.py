@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Job Id Index
+Compact membership index for job ids seen or applied to.
+
+Job ids are reduced to 64-bit hashes. The all-time history lives in a
+file of sorted hashes that is memory-mapped and binary-searched, so it
+costs 8 bytes per id on disk and almost nothing in process memory.
+Ids seen during the current session are kept in a small in-memory set
+on top of it.
+
+Usage:
+    JobIdIndex.build('applied_jobs.idx', applied_job_ids)
+    index = JobIdIndex('applied_jobs.idx')
+    if index.add(job_id):
+        ...  # first time this id has been seen
+"""
+
+import os
+import mmap
+import hashlib
+from array import array
+from bisect import bisect_left
+
+HASH_SIZE = 8
+
+class JobIdIndex:
+    def __init__(self, path='applied_jobs.idx'):
+        """
+        Initialize the index and map the history file if it exists.
+
+        Args:
+            path (str): File of sorted 64-bit hashes written by build(),
+                or None for a session-only index
+
+        Raises:
+            ValueError: If the file exists but is not a valid index
+        """
+        self.path = path
+        self.session = set()
+        self._file = None
+        self._mmap = None
+        self._hashes = ()
+        self.open()
+
+    @staticmethod
+    def hash_id(job_id):
+        """Reduce a job id to a stable 64-bit integer."""
+        digest = hashlib.blake2b(str(job_id).encode('utf-8'), digest_size=HASH_SIZE).digest()
+        return int.from_bytes(digest, 'little')
+
+    @classmethod
+    def build(cls, path, job_ids):
+        """Write the sorted hash file for job_ids."""
+        hashes = array('Q', sorted({cls.hash_id(job_id) for job_id in job_ids}))
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            hashes.tofile(f)
+        os.replace(tmp_path, path)
+
+    def open(self):
+        """
+        Memory-map the history file (no-op if there is none or it is empty).
+
+        Raises:
+            ValueError: If the file is not a whole number of 8-byte hashes,
+                e.g. truncated by a crash; rebuild it with build()
+        """
+        self.close()
+        if not self.path or not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        if size == 0:
+            return
+        if size % HASH_SIZE:
+            raise ValueError(f"{self.path} is {size} bytes, not a multiple of {HASH_SIZE}")
+        try:
+            self._file = open(self.path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._hashes = memoryview(self._mmap).cast('Q')
+        except (TypeError, ValueError) as e:
+            # The file changed size between the check and the map
+            self.close()
+            raise ValueError(f"{self.path} is not a valid index: {e}") from e
+
+    def close(self):
+        """Release the memory map."""
+        if isinstance(self._hashes, memoryview):
+            self._hashes.release()
+        self._hashes = ()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _in_history(self, hashed):
+        position = bisect_left(self._hashes, hashed)
+        return position < len(self._hashes) and self._hashes[position] == hashed
+
+    def __contains__(self, job_id):
+        hashed = self.hash_id(job_id)
+        return hashed in self.session or self._in_history(hashed)
+
+    def __len__(self):
+        return len(self._hashes) + len(self.session)
+
+    def add(self, job_id):
+        """Mark a job id as seen; returns True if it had not been seen before."""
+        hashed = self.hash_id(job_id)
+        if hashed in self.session or self._in_history(hashed):
+            return False
+        self.session.add(hashed)
+        return True
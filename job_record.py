@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Job Record
+Compact, typed representation of a job listing.
+
+A JobRecord holds only plain, pre-parsed values - never a live
+WebElement - so listings from many keyword searches can be kept around
+without pinning remote element references or going stale when the page
+changes. When a listing actually needs to be clicked, resolve_element()
+finds its card again by job id in one script call.
+
+Parsed fields:
+    - exp_min / exp_max: experience range in years (None when unknown)
+    - posted_age_hours: listing age in hours (None when unknown)
+    - location_tokens: normalized city names
+"""
+
+import re
+
+EXPERIENCE_RANGE = re.compile(r'(\d+)\s*(?:-|to)\s*(\d+)')
+EXPERIENCE_SINGLE = re.compile(r'(\d+)\s*\+?')
+POSTED_AGE = re.compile(r'(\d+)\s*\+?\s*(minute|min|hour|hr|day|week|month)')
+LOCATION_SEPARATORS = re.compile(r'[,/|;()]+')
+
+POSTED_UNIT_HOURS = {
+    'minute': 0, 'min': 0,
+    'hour': 1, 'hr': 1,
+    'day': 24,
+    'week': 24 * 7,
+    'month': 24 * 30
+}
+
+LOCATION_ALIASES = {
+    'bangalore': 'bengaluru',
+    'gurgaon': 'gurugram',
+    'bombay': 'mumbai',
+    'calcutta': 'kolkata',
+    'madras': 'chennai',
+    'new delhi': 'delhi',
+    'delhi ncr': 'delhi'
+}
+
+LOCATION_NOISE = {'hybrid', 'remote', 'work from home', 'wfh', 'temp. wfh', 'not specified', ''}
+
+# Finds a job card by id: data attributes first, then a link whose href contains the id
+RESOLVE_CARD_SCRIPT = """
+const jobId = arguments[0];
+const cardSelector = arguments[1];
+const direct = document.querySelector(`[data-job-id="${CSS.escape(jobId)}"], [data-jid="${CSS.escape(jobId)}"]`);
+if (direct) return direct.closest(cardSelector) || direct;
+for (const link of document.querySelectorAll('a[href]')) {
+    if (link.href.includes(jobId)) return link.closest(cardSelector) || link;
+}
+return null;
+"""
+
+def parse_experience(text):
+    """Parse '2-5 Yrs' style text into (min_years, max_years)."""
+    text = (text or '').lower()
+    match = EXPERIENCE_RANGE.search(text)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = EXPERIENCE_SINGLE.search(text)
+    if match:
+        years = int(match.group(1))
+        return years, (None if '+' in match.group(0) else years)
+    return None, None
+
+def parse_posted_age_hours(text):
+    """Parse '3 Days Ago' / 'Just Now' / 'Few Hours Ago' style text into hours."""
+    text = (text or '').lower()
+    if not text:
+        return None
+    if 'just now' in text or 'few min' in text or 'today' in text:
+        return 0
+    if 'few hour' in text:
+        return 3
+    match = POSTED_AGE.search(text)
+    if match:
+        return int(match.group(1)) * POSTED_UNIT_HOURS[match.group(2)]
+    return None
+
+def parse_location_tokens(text):
+    """Split a location string into normalized city names."""
+    tokens = []
+    for part in LOCATION_SEPARATORS.split((text or '').lower()):
+        token = ' '.join(part.split())
+        token = LOCATION_ALIASES.get(token, token)
+        if token not in LOCATION_NOISE and token not in tokens:
+            tokens.append(token)
+    return tuple(tokens)
+
+class JobRecord:
+    __slots__ = (
+        'job_id', 'title', 'company', 'location', 'location_tokens',
+        'experience', 'exp_min', 'exp_max', 'posted', 'posted_age_hours',
+        'url', 'relevance'
+    )
+
+    # Containers used for Naukri job cards
+    CARD_SELECTOR = "article, .jobTuple, .srp-jobtuple-wrapper, [class*='job-tuple'], [class*='jobTuple']"
+
+    def __init__(self, job_id, title, company='Unknown Company', location='Not specified',
+                 experience='Not specified', posted='', url=None):
+        """
+        Initialize a job record, parsing the raw text fields once.
+
+        Args:
+            job_id (str): Stable job id
+            title (str): Job title
+            company (str): Company name
+            location (str): Raw location text
+            experience (str): Raw experience text, e.g. '2-5 Yrs'
+            posted (str): Raw posted text, e.g. '3 Days Ago'
+            url (str): Job details URL
+        """
+        self.job_id = job_id
+        self.title = title
+        self.company = company
+        self.location = location
+        self.location_tokens = parse_location_tokens(location)
+        self.experience = experience
+        self.exp_min, self.exp_max = parse_experience(experience)
+        self.posted = posted
+        self.posted_age_hours = parse_posted_age_hours(posted)
+        self.url = url
+        self.relevance = None
+
+    def __repr__(self):
+        return f"JobRecord({self.job_id!r}, {self.title!r}, {self.company!r})"
+
+    def resolve_element(self, driver):
+        """Find this job's card on the current page; returns None if it is not there."""
+        try:
+            return driver.execute_script(RESOLVE_CARD_SCRIPT, str(self.job_id), self.CARD_SELECTOR)
+        except Exception:
+            return None
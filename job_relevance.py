@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Job Relevance Matcher
+Scores job titles against include/exclude vocabularies in a single pass.
+
+The include and exclude terms are compiled into one regular expression
+(longest terms first), so each title is scanned once no matter how many
+terms there are. Every term must start on a word boundary. Exclude terms
+must also end on one ('java' does not rule out "JavaScript"), while
+include terms may be followed by a suffix ('swift' matches "SwiftUI",
+'mobile app' matches "mobile apps"). score_batch() goes
+further and scans a whole batch of titles with one regex pass.
+
+Each result carries a numeric score plus the matched terms, so listings
+can be ranked instead of only accepted or rejected:
+    score = sum of matched include weights - exclude_penalty * excluded terms
+"""
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+class RelevanceResult(namedtuple('RelevanceResult', ['score', 'included', 'excluded'])):
+    __slots__ = ()
+
+    @property
+    def is_relevant(self):
+        """At least one include term and no exclude terms."""
+        return bool(self.included) and not self.excluded
+
+class RelevanceMatcher:
+    def __init__(self, include_terms, exclude_terms=(), weights=None, exclude_penalty=10.0):
+        """
+        Initialize the matcher.
+
+        Args:
+            include_terms (list): Terms that make a job relevant
+            exclude_terms (list): Terms that rule a job out
+            weights (dict): Optional per-term weight for include terms (default 1.0)
+            exclude_penalty (float): Score subtracted per matched exclude term
+        """
+        self.include_terms = {term.lower() for term in include_terms}
+        self.exclude_terms = {term.lower() for term in exclude_terms}
+        self.weights = {term.lower(): weight for term, weight in (weights or {}).items()}
+        self.exclude_penalty = exclude_penalty
+
+        terms = sorted(self.include_terms | self.exclude_terms, key=len, reverse=True)
+        alternation = '|'.join(
+            re.escape(term) + ('' if term in self.include_terms else r'(?![a-z0-9])')
+            for term in terms
+        ) or r'(?!)'
+        self.pattern = re.compile(r'(?<![a-z0-9])(?:' + alternation + r')')
+
+    def _result(self, matched_terms):
+        included = sorted(term for term in matched_terms if term in self.include_terms)
+        excluded = sorted(term for term in matched_terms if term in self.exclude_terms)
+        score = sum(self.weights.get(term, 1.0) for term in included)
+        score -= self.exclude_penalty * len(excluded)
+        return RelevanceResult(score, included, excluded)
+
+    def score(self, text):
+        """Score a single title."""
+        return self._result(set(self.pattern.findall(text.lower())))
+
+    def score_batch(self, records, key=lambda record: record['title']):
+        """Score many records with one regex pass; results keep input order."""
+        texts = [key(record).lower().replace('\n', ' ') for record in records]
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        matched = [set() for _ in texts]
+        for match in self.pattern.finditer('\n'.join(texts)):
+            matched[bisect_right(starts, match.start()) - 1].add(match.group())
+
+        return [self._result(terms) for terms in matched]
+
+    def rank(self, records, key=lambda record: record['title']):
+        """Return (record, result) pairs, highest score first (stable for ties)."""
+        results = self.score_batch(records, key)
+        order = sorted(range(len(records)), key=lambda index: -results[index].score)
+        return [(records[index], results[index]) for index in order]
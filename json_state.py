@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+JSON State Files
+Small helpers for the per-run state the scripts persist between runs
+(selector stats, adaptive refresh intervals).
+
+Each file holds one top-level mapping under a named key plus a
+'last_updated' timestamp. Writes go to a temporary file that is then
+renamed over the original, so an interrupted save never leaves a torn
+file behind.
+"""
+
+import os
+import json
+from datetime import datetime
+
+def load_state(path, key, description):
+    """
+    Read the mapping stored under key.
+
+    Returns:
+        dict: The stored mapping, or {} if the file is missing or unreadable
+    """
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f).get(key, {})
+    except Exception as e:
+        print(f"⚠️ Could not load {description}: {e}")
+    return {}
+
+def save_state(path, key, value, description):
+    """
+    Atomically write value under key.
+
+    Returns:
+        bool: True if the file was written
+    """
+    try:
+        data = {
+            key: value,
+            'last_updated': datetime.now().isoformat()
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not save {description}: {e}")
+        return False
@@ -22,14 +22,11 @@ Requirements:
 import time
 import sys
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_factory import create_driver
 
 class NaukriAutoActivity:
     def __init__(self, profile_url, activity_interval=300):
@@ -48,26 +45,12 @@ class NaukriAutoActivity:
     def setup_driver(self):
         """Setup Chrome WebDriver with appropriate options."""
         try:
-            chrome_options = Options()
-            # Add options for better stability
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Automatically download and setup ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # Stealth flags and the navigator.webdriver patch come with the profile
+            self.driver = create_driver('activity')
             
             # Set up wait object for element waiting
             self.wait = WebDriverWait(self.driver, 10)
             
-            # Execute script to hide automation indicators
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
             print(f"✓ Chrome WebDriver initialized successfully")
             return True
             
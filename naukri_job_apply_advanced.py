@@ -12,24 +12,127 @@ Features:
 """
 
 import time
+import re
 import json
 import random
 import os
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
+from page_readiness import PageReadiness
+from selector_registry import SelectorRegistry
+from job_relevance import RelevanceMatcher
+from naukri_search import build_search_url
+from driver_factory import create_driver, DriverFactory
+from browser_profiles import BrowserInstance
+from session_snapshot import SessionSnapshot
+
+EXPERIENCE_NUMBERS = re.compile(r'\d+')
+
+# Extracts every job card on the page in one call. Takes the card selector and a
+# dict of field -> selector list, returns one plain record per card along with
+# the index of the selector that matched each field (-1 when none did).
+JOB_CARD_EXTRACTION_SCRIPT = """
+const cardSelector = arguments[0];
+const fieldSelectors = arguments[1];
+const text = (element) => element ? (element.innerText || element.textContent || '').trim() : '';
+return Array.from(document.querySelectorAll(cardSelector)).map((card) => {
+    const matched = {};
+    const firstMatch = (field) => {
+        const selectors = fieldSelectors[field];
+        for (let index = 0; index < selectors.length; index++) {
+            let element = null;
+            try { element = card.querySelector(selectors[index]); } catch (e) { continue; }
+            if (element) {
+                matched[field] = index;
+                return element;
+            }
+        }
+        matched[field] = -1;
+        return null;
+    };
+    const titleElement = firstMatch('title');
+    const href = titleElement ? (titleElement.href || titleElement.getAttribute('href') || '') : '';
+    let jobId = card.getAttribute('data-jid') || card.getAttribute('data-job-id')
+        || (titleElement && titleElement.getAttribute('data-jid')) || '';
+    if (!jobId && href) {
+        const match = href.match(/-(\\d+)(?:[?#]|$)/);
+        if (match) jobId = match[1];
+    }
+    return {
+        title: text(titleElement),
+        company: text(firstMatch('company')),
+        location: text(firstMatch('location')),
+        experience: text(firstMatch('experience')),
+        posted_date: text(firstMatch('posted_date')),
+        job_id: jobId || null,
+        href: href || null,
+        matched: matched
+    };
+});
+"""
+
+# Walks candidate buttons once inside the page (or inside arguments[0]), scores
+# them as apply buttons and returns the best arguments[1] with scoring reasons.
+APPLY_BUTTON_CLASSIFIER_SCRIPT = """
+const root = arguments[0] || document;
+const limit = arguments[1];
+const candidates = new Set(root.querySelectorAll(
+    "button, a, input[type='submit'], input[type='button'], [role='button'], .btn"
+));
+const isVisible = (element) => {
+    if (!element.getClientRects().length) return false;
+    const style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+};
+const isEnabled = (element) => !element.disabled && element.getAttribute('aria-disabled') !== 'true';
+const ranked = [];
+for (const element of candidates) {
+    const text = (element.innerText || element.value || '').trim().toLowerCase();
+    const attr = (name) => (element.getAttribute(name) || '').toLowerCase();
+    const signals = [
+        [text === 'apply' || text === 'apply now', 5, 'text is apply'],
+        [text.includes('apply'), 3, 'text mentions apply'],
+        [attr('aria-label').includes('apply'), 2, 'aria-label'],
+        [attr('title').includes('apply'), 2, 'title'],
+        [attr('data-ga-track').includes('apply'), 2, 'data-ga-track'],
+        [attr('class').includes('apply'), 1, 'class'],
+        [attr('id').includes('apply'), 1, 'id']
+    ];
+    let score = 0;
+    const reasons = [];
+    for (const [matched, weight, reason] of signals) {
+        if (matched) {
+            score += weight;
+            reasons.push(reason);
+        }
+    }
+    if (!score) continue;
+    if (text.includes('applied')) {
+        score -= 10;
+        reasons.push('already applied');
+    }
+    if (score <= 0 || !isVisible(element) || !isEnabled(element)) continue;
+    ranked.push({element: element, text: text, score: score, reasons: reasons});
+}
+ranked.sort((a, b) => b.score - a.score);
+return ranked.slice(0, limit);
+"""
 
 class AdvancedJobApply:
-    def __init__(self):
+    def __init__(self, isolated_profile=True, broker_url=None):
         self.driver = None
+        self.isolated_profile = isolated_profile
+        self.broker_url = broker_url
+        self.instance = None
         self.wait = None
+        self.readiness = None
+        self.search_params = {'keyword': 'ios developer'}
         self.applied_count = 0
         self.found_count = 0
         self.skipped_count = 0
@@ -47,6 +150,58 @@ class AdvancedJobApply:
             'email': ''   # Will ask user
         }
         
+        # Selectors for job cards and the fields inside them
+        self.job_card_selectors = [
+            # Modern Naukri job card selectors
+            "article[data-jid]",
+            "div[data-job-id]",
+            "article[data-job-id]", 
+            ".srp-jobtuple-wrapper",
+            ".jobTuple",
+            ".job-tuple", 
+            ".cust-job-tuple",
+            ".styles_jhc__job-tuple__jAWS4",
+            "[class*='job-tuple']",
+            "[class*='jobTuple']"
+        ]
+        self.title_selectors = [
+            "a[data-jid]",
+            "a[href*='/job-listings-']", 
+            "a[href*='/jobs-']",
+            ".styles_jd__job-title__rZ4Xy a",
+            ".styles_jhc__job-title__2s2pY a",
+            "[class*='job-title'] a",
+            "a[data-job-title]",
+            ".title a",
+            ".jobTupleHeader a",
+            ".job-title a",
+            "h3 a",
+            "h4 a"
+        ]
+        self.company_selectors = [
+            ".styles_jhc__company-name__2dD8V",
+            ".styles_jd__company-name__1bM3z", 
+            "[class*='company-name']",
+            "[class*='companyName']",
+            ".subTitle a",
+            ".companyInfo .ellipsis",
+            ".comp-name a",
+            "[data-company-name]"
+        ]
+        self.location_selectors = [".locWdth, .location, .job-location, [data-job-location]"]
+        self.exp_selectors = [".expwdth, .experience, .job-experience, [data-job-experience]"]
+        self.date_selectors = [".jobTupleFooter .fleft, .posted-date, .job-posted-date, [data-posted-date]"]
+        
+        # Relevance vocabularies - broader iOS and mobile keywords, only
+        # clearly irrelevant positions excluded
+        self.relevance = RelevanceMatcher(
+            ['ios', 'iphone', 'swift', 'objective-c', 'xcode', 'mobile app', 'mobile application', 'mobile developer', 'app developer', 'mobile development'],
+            ['android only', 'backend only', 'devops', 'data scientist', 'data analyst', 'manual testing only']
+        )
+        
+        # Learned selector ranking, persisted between runs
+        self.selector_registry = SelectorRegistry('selector_stats.json')
+        
         # Calculate current experience
         self.calculate_experience()
         
@@ -76,59 +231,69 @@ class AdvancedJobApply:
         
         print("\n✅ Contact information saved!")
     
+    def setup_browser_from_broker(self):
+        """Attach to a warm browser broker tab and restore the saved Naukri session into it"""
+        print(f"🚀 Attaching to browser broker at {self.broker_url}...")
+        try:
+            # No user_data_dir: the 'apply' profile attaches to a leased, isolated context
+            self.driver = DriverFactory(broker_url=self.broker_url).create('apply')
+            self.wait = WebDriverWait(self.driver, 20)
+            self.readiness = PageReadiness(self.driver, timeout=10)
+            
+            snapshot = SessionSnapshot()
+            if snapshot.exists() and snapshot.restore(self.driver):
+                print("✅ Restored saved Naukri session into the leased browser")
+            else:
+                print("💡 No saved session (run naukri_session_activity.py once); log in manually")
+            return True
+        except Exception as e:
+            print(f"❌ Browser broker setup failed: {e}")
+            return False
+    
     def setup_browser(self):
         """Setup Chrome browser with stealth settings using separate automation profile"""
-        print("🚀 Setting up browser...")
+        if self.broker_url:
+            return self.setup_browser_from_broker()
         
-        options = Options()
+        print("🚀 Setting up browser...")
         
         # Use separate automation profile to avoid conflicts
-        import os
         automation_profile_dir = os.path.expanduser("~/Library/Application Support/Chrome-Automation")
-        options.add_argument(f"--user-data-dir={automation_profile_dir}")
-        options.add_argument("--profile-directory=AutomationProfile")
-        
-        # Fix DevToolsActivePort issues
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--remote-debugging-port=9222')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-plugins')
-        
-        # Stealth settings
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        # Disable notifications and popups
-        prefs = {
-            "profile.default_content_setting_values.notifications": 2,
-            "profile.default_content_settings.popups": 0
-        }
-        options.add_experimental_option("prefs", prefs)
         
         try:
-            self.driver = webdriver.Chrome(options=options)
-            self.wait = WebDriverWait(self.driver, 20)
+            # Each run gets its own debugging port and, once the automation profile
+            # exists, its own copy-on-write clone of it, so runs can go in parallel
+            if self.isolated_profile and os.path.isdir(automation_profile_dir):
+                self.instance = BrowserInstance.from_golden(automation_profile_dir)
+                print(f"🧬 Cloned automation profile ({self.instance.clone_method}) in {self.instance.clone_seconds * 1000:.0f}ms")
+            else:
+                # First run (or isolation off): log in once here and the session is kept
+                self.instance = BrowserInstance.shared(automation_profile_dir)
             
-            # Hide automation indicators
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            # Stealth flags, user agent and notification prefs come with the 'apply' profile
+            self.driver = create_driver(
+                'apply',
+                user_data_dir=self.instance.profile_dir,
+                profile_directory='AutomationProfile',
+                # Fix DevToolsActivePort issues
+                extra_arguments=['--disable-gpu', self.instance.debugging_argument(), '--disable-extensions', '--disable-plugins']
+            )
+            self.wait = WebDriverWait(self.driver, 20)
+            self.readiness = PageReadiness(self.driver, timeout=10)
             
             print("✅ Browser ready with existing profile!")
             return True
         except Exception as e:
             print(f"❌ Browser setup failed: {e}")
-            print("💡 Tip: Make sure Chrome is closed before running the script")
+            if not (self.instance and self.instance.owns_profile):
+                print("💡 Tip: Make sure Chrome is closed before running the script")
             return False
     
     def wait_for_login(self):
         """Wait for user to login to Naukri and detect login status"""
         print("\n🔐 Checking Naukri.com login status...")
         self.driver.get("https://www.naukri.com")
-        time.sleep(3)
+        self.readiness.page_ready(timeout=5)
         
         try:
             # Check if already logged in by looking for profile elements
@@ -177,71 +342,34 @@ class AdvancedJobApply:
         print("✅ Proceeding with job search...")
         return True
     
-    def search_recent_ios_jobs(self):
-        """Search for iOS developer jobs without filters"""
-        print("\n🔍 Searching for iOS developer jobs (no filters applied)...")
+    def search_recent_ios_jobs(self, experience=None, freshness_days=None):
+        """
+        Search for iOS developer jobs with every filter encoded in one search URL
         
-        # Navigate to basic iOS jobs search without any filters
-        search_url = "https://www.naukri.com/ios-developer-jobs?k=ios%20developer"
-        self.driver.get(search_url)
-        time.sleep(3)
+        Args:
+            experience (int): Years of experience to filter for, or None for all levels
+            freshness_days (int): Only jobs posted within this many days, or None for any
+        """
+        filters = []
+        if experience is not None:
+            self.search_params['experience'] = experience
+            filters.append(f"{experience} years experience")
+        if freshness_days:
+            self.search_params['freshness_days'] = freshness_days
+            filters.append(f"last {freshness_days} days")
+        print(f"\n🔍 Searching for iOS developer jobs ({', '.join(filters) or 'no filters applied'})...")
+        
+        # One navigation to the filtered results replaces typing and clicking filters
+        self.load_search_results()
         
-        print("✅ Search page loaded - showing all iOS developer jobs")
+        print("✅ Search page loaded")
         return True
     
-    def apply_experience_filter(self):
-        """Apply experience filter for 1-4 years"""
-        try:
-            # Look for experience filter options
-            experience_filters = [
-                "//span[contains(text(), '1-4 years')]",
-                "//label[contains(text(), '1-4 years')]",
-                "//span[contains(text(), '1-3 years')]",
-                "//label[contains(text(), '1-3 years')]",
-                "//input[@value='1-4']",
-                "//input[@value='1-3']"
-            ]
-            
-            for filter_xpath in experience_filters:
-                try:
-                    filter_element = self.driver.find_element(By.XPATH, filter_xpath)
-                    if filter_element.is_displayed():
-                        filter_element.click()
-                        print("✅ Applied experience filter (1-4 years)")
-                        return
-                except:
-                    continue
-                    
-        except Exception as e:
-            print(f"⚠️ Experience filter not applied: {e}")
-    
-    def apply_recent_filter(self):
-        """Apply filter for recently posted jobs (few minutes to 7 days)"""
-        try:
-            # Look for date posted filter - prioritize broader ranges first
-            date_filters = [
-                "//span[contains(text(), 'Last 7 days')]",
-                "//label[contains(text(), 'Last 7 days')]",
-                "//span[contains(text(), 'Last 3 days')]",
-                "//label[contains(text(), 'Last 3 days')]",
-                "//span[contains(text(), 'Today')]",
-                "//label[contains(text(), 'Today')]",
-                "//span[contains(text(), 'Few hours ago')]",
-                "//label[contains(text(), 'Few hours ago')]"
-            ]
-            
-            for filter_xpath in date_filters:
-                try:
-                    filter_element = self.driver.find_element(By.XPATH, filter_xpath)
-                    if filter_element.is_displayed():
-                        filter_element.click()
-                        print("✅ Applied recent jobs filter (Last 7 days)")
-                        return
-                except:
-                    continue
-                    
-        except Exception as e:
-            print(f"⚠️ Recent filter not applied: {e}")
+    def load_search_results(self):
+        """Navigate to the search URL built from the current search parameters"""
+        search_url = build_search_url(**self.search_params)
+        self.driver.get(search_url)
+        self.readiness.page_ready(", ".join(self.job_card_selectors), timeout=10)
     
     def find_and_apply_jobs(self, max_applications=5):
         """Find jobs and apply to them with form filling"""
@@ -249,29 +377,20 @@ class AdvancedJobApply:
         
         try:
             # Wait for job listings
-            time.sleep(5)
+            ready, elapsed = self.readiness.page_ready(", ".join(self.job_card_selectors), timeout=10)
+            print(f"⏱️ Job listings {'ready' if ready else 'not ready'} after {elapsed:.1f}s")
             
             # Find job cards with updated selectors
-            job_card_selectors = [
-                # Modern Naukri job card selectors
-                "article[data-jid]",
-                "div[data-job-id]",
-                "article[data-job-id]", 
-                ".srp-jobtuple-wrapper",
-                ".jobTuple",
-                ".job-tuple", 
-                ".cust-job-tuple",
-                ".styles_jhc__job-tuple__jAWS4",
-                "[class*='job-tuple']",
-                "[class*='jobTuple']"
-            ]
-            
             job_cards = []
-            for selector in job_card_selectors:
+            card_selector = None
+            for selector in self.selector_registry.rank('job_card', self.job_card_selectors):
                 try:
+                    lookup_start = time.monotonic()
                     cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    self.selector_registry.record('job_card', selector, bool(cards), time.monotonic() - lookup_start)
                     if cards:
                         job_cards = cards
+                        card_selector = selector
                         print(f"✅ Found job cards using selector: {selector}")
                         break
                 except:
@@ -284,7 +403,19 @@ class AdvancedJobApply:
             print(f"📋 Found {len(job_cards)} job listings")
             self.found_count = len(job_cards)
             
-            for i, job_card in enumerate(job_cards[:max_applications * 2]):  # Check more jobs
+            # Extract every card's details in a single round trip
+            batch_info = self.extract_all_job_info(card_selector)
+            if len(batch_info) == len(job_cards):
+                # Score the whole page at once and visit the best matches first
+                ranked = self.relevance.rank(list(zip(job_cards, batch_info)), key=lambda pair: pair[1]['title'])
+                candidates = []
+                for (job_card, job_info), relevance in ranked:
+                    job_info['relevance'] = relevance
+                    candidates.append((job_card, job_info))
+            else:
+                candidates = [(job_card, None) for job_card in job_cards]
+            
+            for i, (job_card, job_info) in enumerate(candidates[:max_applications * 2]):  # Check more jobs
                 if self.applied_count >= max_applications:
                     break
                     
@@ -293,10 +424,11 @@ class AdvancedJobApply:
                 try:
                     # Scroll to job card
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", job_card)
-                    time.sleep(2)
+                    self.readiness.element_in_viewport(job_card, timeout=2)
                     
                     # Get job details
-                    job_info = self.extract_job_info(job_card)
+                    if job_info is None:
+                        job_info = self.extract_job_info(job_card)
                     
                     if self.is_suitable_job(job_info):
                         if self.apply_to_job(job_card, job_info):
@@ -318,70 +450,90 @@ class AdvancedJobApply:
         except Exception as e:
             print(f"❌ Error in job search: {e}")
     
-    def extract_job_info(self, job_card):
-        """Extract job information from job card"""
-        job_info = {
+    def extract_all_job_info(self, card_selector):
+        """Extract job information from every job card in one script call"""
+        if not card_selector:
+            return []
+        
+        field_selectors = {
+            'title': self.selector_registry.rank('title', self.title_selectors),
+            'company': self.selector_registry.rank('company', self.company_selectors),
+            'location': self.location_selectors,
+            'experience': self.exp_selectors,
+            'posted_date': self.date_selectors
+        }
+        
+        try:
+            records = self.driver.execute_script(JOB_CARD_EXTRACTION_SCRIPT, card_selector, field_selectors) or []
+        except Exception as e:
+            print(f"⚠️ Batch extraction failed, falling back to per-card lookups: {str(e)[:100]}")
+            return []
+        
+        defaults = self.default_job_info()
+        jobs = []
+        for record in records:
+            matched = record.pop('matched', {})
+            for group in ('title', 'company'):
+                self.selector_registry.record_match(group, field_selectors[group], matched.get(group, -1))
+            
+            job_info = dict(defaults)
+            for key, value in record.items():
+                if value:
+                    job_info[key] = value
+            jobs.append(job_info)
+        
+        print(f"⚡ Extracted {len(jobs)} job cards in one round trip")
+        return jobs
+    
+    def default_job_info(self):
+        """Placeholder values for fields missing from a job card"""
+        return {
             'title': 'Unknown Job',
             'company': 'Unknown Company',
             'location': 'Unknown Location',
             'experience': 'Not specified',
-            'posted_date': 'Unknown'
+            'posted_date': 'Unknown',
+            'job_id': None,
+            'href': None
         }
+    
+    def extract_job_info(self, job_card):
+        """Extract job information from job card"""
+        job_info = self.default_job_info()
         
         try:
             # Job title - updated selectors
-            title_selectors = [
-                "a[data-jid]",
-                "a[href*='/job-listings-']", 
-                "a[href*='/jobs-']",
-                ".styles_jd__job-title__rZ4Xy a",
-                ".styles_jhc__job-title__2s2pY a",
-                "[class*='job-title'] a",
-                "a[data-job-title]",
-                ".title a",
-                ".jobTupleHeader a",
-                ".job-title a",
-                "h3 a",
-                "h4 a"
-            ]
-            for selector in title_selectors:
+            for selector in self.selector_registry.rank('title', self.title_selectors):
+                lookup_start = time.monotonic()
                 try:
                     title_element = job_card.find_element(By.CSS_SELECTOR, selector)
+                    self.selector_registry.record('title', selector, True, time.monotonic() - lookup_start)
                     job_info['title'] = title_element.text.strip()
                     break
                 except:
+                    self.selector_registry.record('title', selector, False, time.monotonic() - lookup_start)
                     continue
         except:
             pass
             
         try:
             # Company name - updated selectors
-            company_selectors = [
-                ".styles_jhc__company-name__2dD8V",
-                ".styles_jd__company-name__1bM3z", 
-                "[class*='company-name']",
-                "[class*='companyName']",
-                ".subTitle a",
-                ".companyInfo .ellipsis",
-                ".comp-name a",
-                "[data-company-name]"
-            ]
-            for selector in company_selectors:
+            for selector in self.selector_registry.rank('company', self.company_selectors):
+                lookup_start = time.monotonic()
                 try:
                     company_element = job_card.find_element(By.CSS_SELECTOR, selector)
+                    self.selector_registry.record('company', selector, True, time.monotonic() - lookup_start)
                     job_info['company'] = company_element.text.strip()
                     break
                 except:
+                    self.selector_registry.record('company', selector, False, time.monotonic() - lookup_start)
                     continue
         except:
             pass
             
         try:
             # Location - updated selectors
-            location_selectors = [
-                ".locWdth, .location, .job-location, [data-job-location]"
-            ]
-            for selector in location_selectors:
+            for selector in self.location_selectors:
                 try:
                     location_element = job_card.find_element(By.CSS_SELECTOR, selector)
                     job_info['location'] = location_element.text.strip()
@@ -393,10 +545,7 @@ class AdvancedJobApply:
             
         try:
             # Experience - updated selectors
-            exp_selectors = [
-                ".expwdth, .experience, .job-experience, [data-job-experience]"
-            ]
-            for selector in exp_selectors:
+            for selector in self.exp_selectors:
                 try:
                     exp_element = job_card.find_element(By.CSS_SELECTOR, selector)
                     job_info['experience'] = exp_element.text.strip()
@@ -408,10 +557,7 @@ class AdvancedJobApply:
             
         try:
             # Posted date - updated selectors
-            date_selectors = [
-                ".jobTupleFooter .fleft, .posted-date, .job-posted-date, [data-posted-date]"
-            ]
-            for selector in date_selectors:
+            for selector in self.date_selectors:
                 try:
                     date_element = job_card.find_element(By.CSS_SELECTOR, selector)
                     job_info['posted_date'] = date_element.text.strip()
@@ -425,27 +571,23 @@ class AdvancedJobApply:
     
     def is_suitable_job(self, job_info):
         """Check if job is suitable for application - more lenient criteria"""
-        title = job_info['title'].lower()
         experience = job_info['experience'].lower()
         
-        # Broader iOS and mobile keywords
-        ios_terms = ['ios', 'iphone', 'swift', 'objective-c', 'xcode', 'mobile app', 'mobile application', 'mobile developer', 'app developer', 'mobile development']
-        has_ios_term = any(term in title for term in ios_terms)
+        relevance = job_info.get('relevance') or self.relevance.score(job_info['title'])
+        job_info['relevance'] = relevance
+        has_ios_term = bool(relevance.included)
         
         # If title is "Unknown Job", assume it might be suitable (since we're on iOS search page)
         if job_info['title'] == 'Unknown Job':
             has_ios_term = True
         
-        # Only exclude clearly irrelevant positions
-        exclude_terms = ['android only', 'backend only', 'devops', 'data scientist', 'data analyst', 'manual testing only']
-        has_exclude_term = any(term in title for term in exclude_terms)
+        has_exclude_term = bool(relevance.excluded)
         
         # Check experience range (1-4 years) - be flexible with parsing
         suitable_experience = True
         if experience and experience != 'not specified':
             # Extract numbers from experience string
-            import re
-            exp_numbers = re.findall(r'\d+', experience)
+            exp_numbers = EXPERIENCE_NUMBERS.findall(experience)
             if exp_numbers:
                 min_exp = int(exp_numbers[0])
                 max_exp = int(exp_numbers[-1]) if len(exp_numbers) > 1 else min_exp
@@ -464,6 +606,8 @@ class AdvancedJobApply:
         print(f"   📍 Location: {job_info['location']}")
         print(f"   💼 Experience: {job_info['experience']}")
         print(f"   📅 Posted: {job_info['posted_date']}")
+        print(f"   🎯 Relevance score: {relevance.score:g} (matched: {', '.join(relevance.included) or 'none'}"
+              f"{'; excluded: ' + ', '.join(relevance.excluded) if relevance.excluded else ''})")
         print(f"   ✅ iOS relevant: {has_ios_term}, Experience suitable: {suitable_experience}, Recent: {is_recent}")
         
         return has_ios_term and not has_exclude_term and suitable_experience
@@ -506,9 +650,10 @@ class AdvancedJobApply:
                             print(f"   ✅ Found title link with selector: {selector}")
                             # Scroll to element and click
                             self.driver.execute_script("arguments[0].scrollIntoView(true);", title_link)
-                            time.sleep(1)
-                            # Store current window handle
+                            self.readiness.element_in_viewport(title_link, timeout=1)
+                            # Store current window handles
                             original_window = self.driver.current_window_handle
+                            handles_before = self.driver.window_handles
                             
                             # Try different methods to open in new tab
                             try:
@@ -538,7 +683,8 @@ class AdvancedJobApply:
                                         print(f"   ⚠️ JavaScript click failed: {str(js_click_error)[:100]}...")
                                         continue
                             
-                            time.sleep(5)  # Give more time for new tab to open
+                            # Wait for the new tab to open rather than sleeping
+                            self.readiness.window_opened(handles_before, timeout=5)
                             
                             # Check if a new tab was opened
                             try:
@@ -558,6 +704,9 @@ class AdvancedJobApply:
                             except Exception as tab_error:
                                 print(f"   ⚠️ Tab switching error: {tab_error}")
                             
+                            ready, elapsed = self.readiness.page_ready(timeout=10)
+                            print(f"   ⏱️ Job details page {'ready' if ready else 'not ready'} after {elapsed:.1f}s")
+                            
                             title_clicked = True
                             print(f"   ✅ Successfully clicked job title")
                             break
@@ -601,8 +750,8 @@ class AdvancedJobApply:
                     # Click the apply button with improved error handling
                     try:
                         # Scroll to element and wait
-                        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", apply_button)
-                        time.sleep(2)
+                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", apply_button)
+                        self.readiness.element_in_viewport(apply_button, timeout=2)
                         
                         # Try different click methods
                         try:
@@ -624,7 +773,7 @@ class AdvancedJobApply:
                     except Exception as click_error:
                         print(f"   ❌ All click methods failed: {str(click_error)[:100]}...")
                         continue
-                    time.sleep(3)
+                    self.readiness.dom_settled(timeout=3)
                     
                     # Handle application process
                     if 'company website' in button_text or 'external' in button_text:
@@ -658,77 +807,27 @@ class AdvancedJobApply:
             traceback.print_exc()
             return False
     
-    def find_apply_buttons(self, context=None):
-        """Find all apply buttons on the page"""
-        if context is None:
-            context = self.driver
-            
-        apply_selectors = [
-            # Modern Naukri selectors
-            "button[data-ga-track*='apply']",
-            "a[data-ga-track*='apply']",
-            "button[data-ga-track*='Apply']",
-            "a[data-ga-track*='Apply']",
-            ".styles_apply-button__2mQCg",
-            ".styles_jhc__apply-button__3F_bI",
-            "button[class*='apply']",
-            "a[class*='apply']",
-            # Legacy selectors
-            ".apply-button",
-            ".btn-apply",
-            "[data-ga-track='Apply']",
-            ".applyButton",
-            "button[title*='Apply']",
-            "a[title*='Apply']",
-            ".job-apply-btn",
-            # Generic button selectors - catch all buttons and filter by text
-            "button",
-            "a[role='button']",
-            "input[type='submit']",
-            "input[type='button']",
-            ".btn",
-            "[role='button']"
-        ]
+    def find_apply_buttons(self, context=None, limit=5):
+        """Find apply buttons on the page, best match first"""
+        # The classifier runs against the whole document unless a job card is given
+        root = None if context is None or context is self.driver else context
+        
+        try:
+            ranked = self.driver.execute_script(APPLY_BUTTON_CLASSIFIER_SCRIPT, root, limit) or []
+        except Exception as e:
+            print(f"   ⚠️ Apply button classifier failed: {str(e)[:100]}")
+            return []
         
         buttons = []
-        for selector in apply_selectors:
-            try:
-                elements = context.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    if element.is_displayed() and element.is_enabled():
-                        element_text = element.text.strip().lower()
-                        element_title = (element.get_attribute('title') or '').lower()
-                        element_aria_label = (element.get_attribute('aria-label') or '').lower()
-                        element_data_track = (element.get_attribute('data-ga-track') or '').lower()
-                        element_class = (element.get_attribute('class') or '').lower()
-                        element_id = (element.get_attribute('id') or '').lower()
-                        
-                        # Check if it's actually an apply button by various attributes
-                        apply_indicators = [
-                            'apply' in element_text,
-                            'apply now' in element_text,
-                            element_text == 'apply',
-                            'apply' in element_title,
-                            'apply' in element_aria_label,
-                            'apply' in element_data_track,
-                            'apply' in element_class,
-                            'apply' in element_id
-                        ]
-                        
-                        if any(apply_indicators):
-                            buttons.append(element)
-                            print(f"   🔍 Found apply button: Text='{element.text}', Class='{element.get_attribute('class')}', Selector='{selector}'")
-            except Exception as e:
-                print(f"   ⚠️ Error with selector {selector}: {e}")
-                continue
+        for candidate in ranked:
+            buttons.append(candidate['element'])
+            print(f"   🔍 Apply button candidate: Text='{candidate['text']}', Score={candidate['score']}, Reasons={', '.join(candidate['reasons'])}")
                 
         return buttons
     
     def handle_naukri_application(self):
         """Handle Naukri's internal application form"""
         try:
-            time.sleep(3)
-            
             # Look for application form or popup
             form_selectors = [
                 ".popup-content",
@@ -737,6 +836,7 @@ class AdvancedJobApply:
                 "[role='dialog']",
                 ".application-form"
             ]
+            self.readiness.element_present(", ".join(form_selectors), timeout=3)
             
             form_found = False
             for selector in form_selectors:
@@ -887,7 +987,7 @@ class AdvancedJobApply:
                 if submit_btn.is_displayed() and submit_btn.is_enabled():
                     submit_btn.click()
                     print("   ✅ Application submitted!")
-                    time.sleep(3)
+                    self.readiness.dom_settled(timeout=3)
                     return True
             except:
                 continue
@@ -899,7 +999,7 @@ class AdvancedJobApply:
         """Handle application on company website"""
         try:
             print("   🌐 Handling external application...")
-            time.sleep(5)
+            self.readiness.page_ready(timeout=5)
             
             # Check if we're on a different domain
             current_url = self.driver.current_url
@@ -917,7 +1017,7 @@ class AdvancedJobApply:
     def fill_external_application_form(self):
         """Fill application form on external company website"""
         try:
-            time.sleep(3)
+            self.readiness.element_present("form, input", timeout=3)
             
             # Look for common form fields
             common_fields = {
@@ -973,10 +1073,13 @@ class AdvancedJobApply:
     
     def cleanup(self):
         """Close browser"""
+        self.selector_registry.save()
         if self.driver:
             print("\n🧹 Closing browser...")
             self.driver.quit()
             print("✅ Done!")
+        if self.instance:
+            self.instance.cleanup()
 
 def main():
     print("🎯 Advanced Naukri iOS Job Auto-Apply")
@@ -985,8 +1088,8 @@ def main():
     print("\n🔍 SEARCH CRITERIA:")
     print("   • Job Type: iOS/Mobile development roles")
     print("   • Location: All over India (no location restrictions)")
-    print("   • Experience: All levels (no experience filter)")
-    print("   • Posted: All recent jobs (no date filter)")
+    print("   • Experience: All levels unless you set a filter below")
+    print("   • Posted: Any time unless you set a freshness window below")
     print("\n⚠️ FEATURES:")
     print("   • Uses Chrome browser with automation profile (requires manual login)")
     print("   • Fills application forms automatically")
@@ -1000,12 +1103,35 @@ def main():
     except ValueError:
         max_apps = 5
     
-    confirm = input(f"\n🚀 Apply to {max_apps} iOS jobs (All levels, All India, No filters)? (y/N): ").strip().lower()
+    # Filters go straight into the search URL
+    try:
+        experience = int(input("Filter by years of experience (Enter for all levels): ").strip() or -1)
+    except ValueError:
+        experience = -1
+    experience = experience if experience >= 0 else None
+    try:
+        freshness_days = int(input("Only jobs posted within how many days? (Enter for any): ").strip() or 0)
+    except ValueError:
+        freshness_days = 0
+    
+    levels = f"{experience} years" if experience is not None else "All levels"
+    posted = f"last {freshness_days} days" if freshness_days > 0 else "any time"
+    confirm = input(f"\n🚀 Apply to {max_apps} iOS jobs ({levels}, All India, posted {posted})? (y/N): ").strip().lower()
     if confirm != 'y':
         print("❌ Cancelled")
         return
     
-    job_apply = AdvancedJobApply()
+    # A warm broker tab skips the Chrome launch; it starts from the saved session, not the profile
+    broker_url = os.environ.get('BROWSER_BROKER_URL')
+    if broker_url and input(f"Attach to the browser broker at {broker_url}? (Y/n): ").strip().lower() == 'n':
+        broker_url = None
+    
+    isolated = True
+    if not broker_url:
+        # A clone discards logins made during the run; use the shared profile to log in once
+        isolated = input("Run in an isolated profile clone (allows parallel runs)? (Y/n): ").strip().lower() != 'n'
+    
+    job_apply = AdvancedJobApply(isolated_profile=isolated, broker_url=broker_url)
     
     try:
         # Get contact information
@@ -1013,7 +1139,7 @@ def main():
         
         if job_apply.setup_browser():
             job_apply.wait_for_login()
-            job_apply.search_recent_ios_jobs()
+            job_apply.search_recent_ios_jobs(experience, freshness_days if freshness_days > 0 else None)
             job_apply.find_and_apply_jobs(max_apps)
             job_apply.print_summary()
         else:
@@ -9,12 +9,11 @@ import json
 import random
 import os
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from driver_factory import create_driver
 
 class SimpleJobApply:
     def __init__(self):
@@ -26,13 +25,9 @@ class SimpleJobApply:
         """Setup Chrome browser"""
         print("🚀 Setting up browser...")
         
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1920,1080')
-        
         try:
-            self.driver = webdriver.Chrome(options=options)
+            # Same plain options as before the factory: no stealth flags, UA or prefs
+            self.driver = create_driver('refresh', arguments=['--no-sandbox', '--disable-dev-shm-usage'])
             print("✅ Browser ready!")
             return True
         except Exception as e:
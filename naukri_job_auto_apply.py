@@ -17,26 +17,46 @@ import json
 import random
 import os
 from datetime import datetime, timedelta
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_factory import create_driver
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
+from application_journal import ApplicationJournal
+from job_index import JobIdIndex
+from job_relevance import RelevanceMatcher
+from job_record import JobRecord
+from naukri_search import build_search_url, NAUKRI_BASE_URL
+from network_capture import NetworkCapture
+
+# Search result XHRs that carry the job listings as JSON
+SEARCH_API_PATTERNS = ['/jobapi/v3/search', '/jobapi/v4/search']
+
+# Reads every listing's title link in one call so duplicates can be dropped
+# before any per-card lookups
+JOB_LINKS_SCRIPT = """
+return arguments[0].map((card) => {
+    const link = card.querySelector(arguments[1]);
+    return link ? (link.href || link.getAttribute('href')) : null;
+});
+"""
 
 class NaukriJobAutoApply:
-    def __init__(self):
+    def __init__(self, use_network_capture=False):
         self.driver = None
         self.wait = None
+        self.use_network_capture = use_network_capture
+        self.network_capture = None
         self.applied_jobs = set()
+        self.journal = ApplicationJournal('applied_jobs_journal.jsonl', legacy_path='applied_jobs_history.json')
+        self.seen_index = None
         self.session_stats = {
             'jobs_found': 0,
             'jobs_applied': 0,
             'jobs_skipped': 0,
+            'duplicates_skipped': 0,
             'errors': 0,
             'start_time': datetime.now()
         }
@@ -53,29 +73,57 @@ class NaukriJobAutoApply:
             "iOS Swift Developer"
         ]
         
+        # iOS terms that should be present, and irrelevant positions to exclude
+        self.relevance = RelevanceMatcher(
+            ['ios', 'iphone', 'swift', 'objective-c', 'xcode', 'cocoa'],
+            ['android', 'java', 'backend', 'devops', 'qa', 'testing', 'manual']
+        )
+        
         # Load previous application history
         self.load_application_history()
         
     def load_application_history(self):
         """Load previously applied job IDs to avoid duplicates"""
         try:
-            if os.path.exists('applied_jobs_history.json'):
-                with open('applied_jobs_history.json', 'r') as f:
-                    data = json.load(f)
-                    self.applied_jobs = set(data.get('applied_jobs', []))
-                    print(f"📋 Loaded {len(self.applied_jobs)} previously applied jobs")
+            self.applied_jobs = self.journal.load()
+            if self.applied_jobs:
+                print(f"📋 Loaded {len(self.applied_jobs)} previously applied jobs")
         except Exception as e:
             print(f"⚠️ Could not load application history: {e}")
+        
+        # All-time history as a memory-mapped index; rebuilt only when the journal is newer
+        index_path = 'applied_jobs.idx'
+        try:
+            journal_mtime = os.path.getmtime(self.journal.path) if os.path.exists(self.journal.path) else 0
+            if not os.path.exists(index_path) or os.path.getmtime(index_path) < journal_mtime:
+                JobIdIndex.build(index_path, self.applied_jobs)
+            try:
+                self.seen_index = JobIdIndex(index_path)
+            except ValueError as e:
+                print(f"⚠️ Job index is damaged ({e}), rebuilding from application history")
+                JobIdIndex.build(index_path, self.applied_jobs)
+                self.seen_index = JobIdIndex(index_path)
+        except Exception as e:
+            print(f"⚠️ Could not build job index: {e}")
+            # Keep deduplicating this run from the loaded history alone
+            self.seen_index = JobIdIndex(None)
+            for job_id in self.applied_jobs:
+                self.seen_index.add(job_id)
+    
+    def record_application(self, job_data):
+        """Durably record a single application as soon as it is made"""
+        self.applied_jobs.add(job_data.job_id)
+        try:
+            self.journal.append(job_data.job_id, job_data.title, job_data.company)
+        except Exception as e:
+            print(f"⚠️ Could not record application: {e}")
             
     def save_application_history(self):
-        """Save applied job IDs for future reference"""
+        """Flush the application journal at the end of a session"""
+        # Each application was already fsync'd when it was made; compaction
+        # happens periodically inside the journal itself
         try:
-            data = {
-                'applied_jobs': list(self.applied_jobs),
-                'last_updated': datetime.now().isoformat()
-            }
-            with open('applied_jobs_history.json', 'w') as f:
-                json.dump(data, f, indent=2)
+            self.journal.close()
         except Exception as e:
             print(f"⚠️ Could not save application history: {e}")
     
@@ -83,21 +131,16 @@ class NaukriJobAutoApply:
         """Initialize Chrome WebDriver with stealth settings"""
         print("🚀 Setting up Chrome WebDriver...")
         
-        chrome_options = Options()
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        # Stealth flags, user agent and the navigator.webdriver patch come with the profile
+        self.driver = create_driver('apply', performance_log=self.use_network_capture)
         self.wait = WebDriverWait(self.driver, 20)
         
-        # Execute script to hide automation indicators
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.use_network_capture:
+            self.network_capture = NetworkCapture(self.driver, SEARCH_API_PATTERNS)
+            if self.network_capture.enable():
+                print("📡 Network capture enabled for job listings")
+            else:
+                self.network_capture = None
         
         print("✅ WebDriver setup complete")
     
@@ -140,34 +183,17 @@ class NaukriJobAutoApply:
             print("✅ Already logged in!")
             return True
     
-    def search_ios_jobs(self, keyword, location="", experience=""):
-        """Search for iOS developer jobs"""
+    def search_ios_jobs(self, keyword, location="", experience="", freshness_days=None, page=1):
+        """Search for iOS developer jobs by navigating straight to the results URL"""
         print(f"🔍 Searching for: {keyword}")
         
-        # Navigate to jobs search page
-        search_url = "https://www.naukri.com/jobs-search"
-        self.driver.get(search_url)
-        self.human_delay(2, 4)
-        
         try:
-            # Enter job keyword
-            keyword_input = self.wait.until(EC.presence_of_element_located((By.ID, "qsb-keyword-sugg")))
-            keyword_input.clear()
-            keyword_input.send_keys(keyword)
-            self.human_delay(1, 2)
-            
-            # Enter location if provided
-            if location:
-                location_input = self.driver.find_element(By.ID, "qsb-location-sugg")
-                location_input.clear()
-                location_input.send_keys(location)
-                self.human_delay(1, 2)
-            
-            # Click search button
-            search_btn = self.driver.find_element(By.CSS_SELECTOR, ".qsbSubmit")
-            search_btn.click()
-            
-            self.human_delay(3, 5)
+            # Keyword, location and filters are all encoded in the URL;
+            # get_job_listings waits for the results to render
+            search_url = build_search_url(keyword, location, experience, freshness_days, page)
+            if self.network_capture:
+                self.network_capture.reset()
+            self.driver.get(search_url)
             print(f"✅ Search completed for: {keyword}")
             return True
             
@@ -177,6 +203,74 @@ class NaukriJobAutoApply:
     
     def get_job_listings(self):
         """Extract job listings from search results"""
+        if self.network_capture:
+            jobs = self.get_job_listings_from_network()
+            if jobs is not None:
+                return jobs
+            print("⚠️ No job listings in the captured search responses, falling back to page scraping")
+        
+        return self.get_job_listings_from_dom()
+    
+    def get_job_listings_from_network(self):
+        """Build job listings from the search page's JSON responses; None if no job entries were found"""
+        responses = self.network_capture.collect_json(timeout=10)
+        if not responses:
+            return None
+        
+        jobs = []
+        listed = 0
+        for response in responses:
+            # Captured bodies are any JSON; only search results carry jobDetails
+            if not isinstance(response, dict):
+                continue
+            for job in response.get('jobDetails') or []:
+                job_data = self.job_record_from_api(job)
+                if job_data is None:
+                    continue
+                listed += 1
+                if not self.seen_index.add(job_data.job_id):
+                    self.session_stats['duplicates_skipped'] += 1
+                    continue
+                jobs.append(job_data)
+        
+        # No entries at all (API shape changed, unreadable bodies): let the DOM path try
+        if not listed:
+            return None
+        
+        print(f"📡 Captured {listed} job listings from network responses")
+        self.session_stats['jobs_found'] += len(jobs)
+        return jobs
+    
+    def job_record_from_api(self, job):
+        """Convert one entry of the search API's jobDetails list into a JobRecord"""
+        try:
+            placeholders = {item.get('type'): item.get('label', '') for item in job.get('placeholders') or []}
+            job_url = job.get('jdURL') or ''
+            if job_url.startswith('/'):
+                job_url = NAUKRI_BASE_URL + job_url
+            
+            # Without either there is no stable id; a placeholder would collide across jobs
+            if not job_url and not job.get('jobId'):
+                return None
+            
+            # Same id scheme as DOM scraping so history lookups line up
+            job_id = self.extract_job_id(job_url) if job_url else str(job.get('jobId'))
+            
+            return JobRecord(
+                job_id,
+                (job.get('title') or '').strip(),
+                company=(job.get('companyName') or 'Unknown Company').strip(),
+                location=placeholders.get('location') or 'Not specified',
+                experience=placeholders.get('experience') or 'Not specified',
+                posted=job.get('footerPlaceholderLabel') or '',
+                url=job_url or None
+            )
+        except Exception as e:
+            print(f"⚠️ Error parsing captured job: {e}")
+            return None
+    
+    def get_job_listings_from_dom(self):
+        """Extract job listings by scraping the rendered job cards"""
         jobs = []
         
         try:
@@ -187,7 +281,16 @@ class NaukriJobAutoApply:
             
             print(f"📋 Found {len(job_elements)} job listings")
             
-            for job_element in job_elements:
+            # Drop listings already seen under another keyword (or applied to before)
+            try:
+                job_links = self.driver.execute_script(JOB_LINKS_SCRIPT, job_elements, ".title a, .jobTupleHeader .ellipsis")
+            except Exception:
+                job_links = [None] * len(job_elements)
+            
+            for job_element, job_link in zip(job_elements, job_links):
+                if job_link and not self.seen_index.add(self.extract_job_id(job_link)):
+                    self.session_stats['duplicates_skipped'] += 1
+                    continue
                 try:
                     job_data = self.extract_job_data(job_element)
                     if job_data:
@@ -232,18 +335,25 @@ class NaukriJobAutoApply:
             except:
                 location = "Not specified"
             
+            # Posted date
+            try:
+                posted_element = job_element.find_element(By.CSS_SELECTOR, ".jobTupleFooter .fleft, .job-post-day, .posted-date")
+                posted = posted_element.text.strip()
+            except:
+                posted = ""
+            
             # Extract job ID from URL
             job_id = self.extract_job_id(job_url)
             
-            return {
-                'id': job_id,
-                'title': title,
-                'company': company,
-                'experience': experience,
-                'location': location,
-                'url': job_url,
-                'element': job_element
-            }
+            return JobRecord(
+                job_id,
+                title,
+                company=company,
+                location=location,
+                experience=experience,
+                posted=posted,
+                url=job_url
+            )
             
         except Exception as e:
             print(f"⚠️ Error extracting job data: {e}")
@@ -264,38 +374,32 @@ class NaukriJobAutoApply:
     
     def is_ios_relevant(self, job_data):
         """Check if job is relevant for iOS development"""
-        title = job_data['title'].lower()
-        
-        # iOS keywords that should be present
-        ios_terms = ['ios', 'iphone', 'swift', 'objective-c', 'xcode', 'cocoa']
-        
-        # Check if any iOS terms are in the title
-        has_ios_term = any(term in title for term in ios_terms)
-        
-        # Exclude irrelevant positions
-        exclude_terms = ['android', 'java', 'backend', 'devops', 'qa', 'testing', 'manual']
-        has_exclude_term = any(term in title for term in exclude_terms)
-        
-        return has_ios_term and not has_exclude_term
+        if job_data.relevance is None:
+            job_data.relevance = self.relevance.score(job_data.title)
+        return job_data.relevance.is_relevant
     
     def apply_to_job(self, job_data):
         """Apply to a specific job"""
-        job_id = job_data['id']
+        job_id = job_data.job_id
         
         # Check if already applied
         if job_id in self.applied_jobs:
-            print(f"⏭️ Already applied to: {job_data['title']} at {job_data['company']}")
+            print(f"⏭️ Already applied to: {job_data.title} at {job_data.company}")
             self.session_stats['jobs_skipped'] += 1
             return False
         
-        print(f"\n🎯 Applying to: {job_data['title']}")
-        print(f"   Company: {job_data['company']}")
-        print(f"   Location: {job_data['location']}")
-        print(f"   Experience: {job_data['experience']}")
+        print(f"\n🎯 Applying to: {job_data.title}")
+        print(f"   Company: {job_data.company}")
+        print(f"   Location: {job_data.location}")
+        print(f"   Experience: {job_data.experience}")
         
         try:
-            # Click on the job to open details
-            job_element = job_data['element']
+            # Re-resolve the job card by id only now that we interact with it
+            job_element = job_data.resolve_element(self.driver)
+            if job_element is None:
+                print(f"⚠️ Job card no longer on the page: {job_data.title}")
+                self.session_stats['jobs_skipped'] += 1
+                return False
             self.driver.execute_script("arguments[0].scrollIntoView(true);", job_element)
             self.human_delay(1, 2)
             
@@ -325,18 +429,18 @@ class NaukriJobAutoApply:
                 self.handle_application_popup()
                 
                 # Mark as applied
-                self.applied_jobs.add(job_id)
+                self.record_application(job_data)
                 self.session_stats['jobs_applied'] += 1
                 
-                print(f"✅ Successfully applied to: {job_data['title']}")
+                print(f"✅ Successfully applied to: {job_data.title}")
                 return True
             else:
-                print(f"⚠️ No apply button found for: {job_data['title']}")
+                print(f"⚠️ No apply button found for: {job_data.title}")
                 self.session_stats['jobs_skipped'] += 1
                 return False
                 
         except Exception as e:
-            print(f"❌ Failed to apply to {job_data['title']}: {e}")
+            print(f"❌ Failed to apply to {job_data.title}: {e}")
             self.session_stats['errors'] += 1
             return False
     
@@ -393,7 +497,13 @@ class NaukriJobAutoApply:
             if self.search_ios_jobs(keyword, location):
                 jobs = self.get_job_listings()
                 
-                for job in jobs:
+                # Score the batch once and try the most relevant listings first
+                ranked_jobs = []
+                for job, relevance in self.relevance.rank(jobs, key=lambda job: job.title):
+                    job.relevance = relevance
+                    ranked_jobs.append(job)
+                
+                for job in ranked_jobs:
                     if applications_made >= max_applications:
                         break
                         
@@ -404,7 +514,7 @@ class NaukriJobAutoApply:
                         # Add delay between applications
                         self.human_delay(3, 7)
                     else:
-                        print(f"⏭️ Skipping non-iOS job: {job['title']}")
+                        print(f"⏭️ Skipping non-iOS job: {job.title}")
                         self.session_stats['jobs_skipped'] += 1
             
             # Delay between keyword searches
@@ -424,6 +534,7 @@ class NaukriJobAutoApply:
         print(f"🔍 Jobs Found: {self.session_stats['jobs_found']}")
         print(f"✅ Jobs Applied: {self.session_stats['jobs_applied']}")
         print(f"⏭️ Jobs Skipped: {self.session_stats['jobs_skipped']}")
+        print(f"🔁 Duplicates Skipped: {self.session_stats['duplicates_skipped']}")
         print(f"❌ Errors: {self.session_stats['errors']}")
         print(f"📋 Total Applied (All Time): {len(self.applied_jobs)}")
         print("=" * 60)
@@ -437,6 +548,9 @@ class NaukriJobAutoApply:
     
     def cleanup(self):
         """Clean up resources"""
+        self.journal.close()
+        if self.seen_index:
+            self.seen_index.close()
         if self.driver:
             print("\n🧹 Cleaning up...")
             self.driver.quit()
@@ -464,12 +578,14 @@ def main():
     print(f"\n🎯 Will search for iOS positions in: {'Any location' if not location else location}")
     print(f"📊 Maximum applications: {max_apps}")
     
+    use_network_capture = input("Read listings from the page's network responses (faster)? (y/N): ").strip().lower() == 'y'
+    
     confirm = input("\n🚀 Start auto-application? (y/N): ").strip().lower()
     if confirm != 'y':
         print("❌ Cancelled by user")
         return
     
-    auto_apply = NaukriJobAutoApply()
+    auto_apply = NaukriJobAutoApply(use_network_capture=use_network_capture)
     
     try:
         auto_apply.setup_driver()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Naukri Search URL Builder
+Encodes a whole job search - keyword, location, experience, freshness and
+page - into a single Naukri search URL, so one navigation replaces typing
+into the search form and clicking filters.
+
+Example:
+    build_search_url("iOS Developer", location="Bangalore", experience=2, freshness_days=7, page=2)
+    -> https://www.naukri.com/ios-developer-jobs-in-bangalore-2?k=ios%20developer&l=bangalore&experience=2&jobAge=7
+"""
+
+import re
+from urllib.parse import urlencode, quote
+
+NAUKRI_BASE_URL = "https://www.naukri.com"
+
+# Freshness windows offered by Naukri's "Freshness" filter, in days
+FRESHNESS_WINDOWS = (1, 3, 7, 15, 30)
+
+def slugify(text):
+    """Turn 'iOS Developer' into 'ios-developer' for the URL path."""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+def freshness_window(days):
+    """Round a freshness request up to the nearest window Naukri supports."""
+    for window in FRESHNESS_WINDOWS:
+        if days <= window:
+            return window
+    return FRESHNESS_WINDOWS[-1]
+
+def build_search_url(keyword, location="", experience=None, freshness_days=None, page=1):
+    """
+    Build a Naukri search results URL.
+
+    Args:
+        keyword (str): Search keyword, e.g. 'iOS Developer'
+        location (str): City name, or empty for all locations
+        experience (int): Years of experience to filter for, or None
+        freshness_days (int): Only jobs posted within this many days, or None
+        page (int): Results page number (1-based)
+
+    Returns:
+        str: Search results URL
+    """
+    path = f"{slugify(keyword)}-jobs"
+    if location:
+        path += f"-in-{slugify(location)}"
+    if page and page > 1:
+        path += f"-{page}"
+
+    params = {'k': keyword.lower()}
+    if location:
+        params['l'] = location.lower()
+    if experience not in (None, ''):
+        params['experience'] = int(experience)
+    if freshness_days:
+        params['jobAge'] = freshness_window(freshness_days)
+
+    return f"{NAUKRI_BASE_URL}/{path}?{urlencode(params, quote_via=quote)}"
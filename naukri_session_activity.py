@@ -17,60 +17,101 @@ import time
 import sys
 import os
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_factory import create_driver
+from session_snapshot import SessionSnapshot
+from browser_profiles import BrowserInstance, prepare_template, tmpfs_available
 
 class NaukriSessionActivity:
-    def __init__(self, profile_url, activity_interval=300):
+    def __init__(self, profile_url, activity_interval=300, tmpfs_profile=False):
         """
         Initialize the Naukri session-aware auto activity script.
         
         Args:
             profile_url (str): Your Naukri profile URL
             activity_interval (int): Interval between activities in seconds
+            tmpfs_profile (bool): Keep fresh-session profiles in memory (/dev/shm)
         """
         self.profile_url = profile_url
         self.activity_interval = activity_interval
+        self.tmpfs_profile = tmpfs_profile
         self.driver = None
         self.wait = None
+        self.snapshot = SessionSnapshot()
+        self.profile_instance = None
         
+    def fresh_profile_settings(self):
+        """create_driver() overrides for a fresh session: an ephemeral tmpfs profile when enabled."""
+        if not self.tmpfs_profile:
+            return {}
+        try:
+            template_dir = prepare_template()
+        except Exception as e:
+            print(f"⚠️  Could not create browser profile template: {e}")
+            template_dir = None
+        try:
+            self.profile_instance = BrowserInstance.ephemeral(template_dir)
+        except OSError as e:
+            print(f"⚠️  Could not create ephemeral profile: {e}")
+            return {}
+        return self.profile_instance.driver_settings()
+    
+    def setup_driver_from_snapshot(self):
+        """
+        Start a fresh minimal profile and restore the saved Naukri session into it.
+        
+        The restored session is only trusted if the profile page loads without
+        a login redirect; a stale snapshot is deleted so the full profile is
+        used to capture a new one.
+        """
+        try:
+            self.driver = create_driver('activity', **self.fresh_profile_settings())
+            self.wait = WebDriverWait(self.driver, 15)
+            restored = self.snapshot.restore(self.driver)
+            if restored:
+                self.driver.get(self.profile_url)
+                time.sleep(3)
+                if not self.is_login_page(self.driver.current_url):
+                    print(f"✓ Restored Naukri session snapshot ({restored} cookies) into a fresh profile")
+                    return True
+            print("⚠️  Session snapshot has expired, capturing a new one from the Chrome profile")
+            self.snapshot.delete()
+        except Exception as e:
+            print(f"⚠️  Could not restore session snapshot: {e}")
+        self.cleanup()
+        self.driver = None
+        return False
+    
+    def update_session_snapshot(self):
+        """Save the session snapshot the first time, and again whenever cookies rotate."""
+        try:
+            if self.snapshot.refresh_if_rotated(self.driver):
+                print(f"💾 Session snapshot updated ({self.snapshot.path})")
+        except Exception as e:
+            print(f"⚠️  Could not update session snapshot: {e}")
+    
     def setup_driver_with_profile(self):
-        """Setup Chrome WebDriver using existing user profile."""
+        """Setup Chrome WebDriver with the saved session, or the existing user profile once to create it."""
+        if self.snapshot.exists() and self.setup_driver_from_snapshot():
+            return True
+        
         try:
-            chrome_options = Options()
+            profile = {}
             
             # Try to use existing Chrome user data directory
             user_data_dir = os.path.expanduser("~/Library/Application Support/Google/Chrome")
             if os.path.exists(user_data_dir):
-                chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-                chrome_options.add_argument("--profile-directory=Default")
-                print("✓ Using existing Chrome profile for session continuity")
+                profile = {'user_data_dir': user_data_dir, 'profile_directory': 'Default'}
+                print("✓ Using existing Chrome profile once to capture a session snapshot")
             
-            # Add stability options
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Setup service
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver = create_driver('activity', **profile)
             
             # Set up wait object
             self.wait = WebDriverWait(self.driver, 15)
             
-            # Hide automation indicators
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
             print(f"✓ Chrome WebDriver initialized with session support")
             return True
             
@@ -81,14 +122,7 @@ class NaukriSessionActivity:
     def setup_driver_fresh(self):
         """Setup Chrome WebDriver with fresh session."""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver = create_driver('refresh', **self.fresh_profile_settings())
             self.wait = WebDriverWait(self.driver, 15)
             
             print(f"✓ Chrome WebDriver initialized with fresh session")
@@ -98,13 +132,18 @@ class NaukriSessionActivity:
             print(f"✗ Error setting up WebDriver: {e}")
             return False
     
+    def is_login_page(self, url):
+        """Whether a URL is one of Naukri's login pages."""
+        url = url.lower()
+        return 'login' in url or 'signin' in url or 'auth' in url
+    
     def handle_login_if_needed(self):
         """Handle login process if user is redirected to login page."""
         try:
             current_url = self.driver.current_url.lower()
             
             # Check if we're on a login page
-            if 'login' in current_url or 'signin' in current_url or 'auth' in current_url:
+            if self.is_login_page(current_url):
                 print("\n🔐 Detected login page. Please log in manually.")
                 print("📋 Steps:")
                 print("   1. Complete login in the browser window that opened")
@@ -327,11 +366,14 @@ class NaukriSessionActivity:
             self.cleanup()
             return
         
+        # Logged in: later runs restore this instead of loading the full profile
+        self.update_session_snapshot()
+        
         print(f"\n🚀 Naukri Session-Aware Auto Activity started!")
         print(f"📍 Profile URL: {self.profile_url}")
         print(f"⏰ Activity interval: {self.activity_interval} seconds ({self.activity_interval//60} minutes)")
         print(f"\n📋 Enhanced features:")
-        print(f"   ✅ Uses existing browser session when possible")
+        print(f"   ✅ Restores a saved session snapshot into a fresh profile")
         print(f"   ✅ Handles login redirects automatically")
         print(f"   ✅ Smart button detection with multiple strategies")
         print(f"   ✅ Better error recovery")
@@ -348,6 +390,7 @@ class NaukriSessionActivity:
                     activity_count += 1
                     failed_attempts = 0  # Reset failure counter on success
                     print(f"📊 Total activities completed: {activity_count}")
+                    self.update_session_snapshot()
                 else:
                     failed_attempts += 1
                     print(f"⚠️  Activity failed (attempt {failed_attempts}/{max_failures})")
@@ -378,9 +421,12 @@ class NaukriSessionActivity:
                 print("✓ Browser closed successfully")
             except Exception as e:
                 print(f"⚠️  Error closing browser: {e}")
+        if self.profile_instance:
+            self.profile_instance.cleanup()
+            self.profile_instance = None
 
 def get_user_input():
-    """Get profile URL and activity interval from user."""
+    """Get profile URL, activity interval and profile placement from user."""
     print("=" * 70)
     print("🎯 Naukri Session-Aware Auto Activity Script")
     print("=" * 70)
@@ -416,14 +462,19 @@ def get_user_input():
             print("❌ Please enter a valid number")
     
     interval_seconds = int(interval_minutes * 60)
-    return url, interval_seconds
+    
+    # Fresh sessions start faster from a profile in memory (Linux only)
+    tmpfs_profile = False
+    if tmpfs_available():
+        tmpfs_profile = input("\nKeep fresh browser profiles in memory (/dev/shm) for faster startup? (y/N): ").strip().lower() == 'y'
+    return url, interval_seconds, tmpfs_profile
 
 def main():
     """Main function."""
     try:
-        url, interval = get_user_input()
+        url, interval, tmpfs_profile = get_user_input()
         
-        activity_bot = NaukriSessionActivity(url, interval)
+        activity_bot = NaukriSessionActivity(url, interval, tmpfs_profile=tmpfs_profile)
         activity_bot.start_auto_activity()
         
     except KeyboardInterrupt:
@@ -18,15 +18,12 @@ import sys
 import os
 import random
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_factory import create_driver
 
 class NaukriStealthActivity:
     def __init__(self, profile_url, activity_interval=300):
@@ -46,32 +43,21 @@ class NaukriStealthActivity:
     def setup_stealth_driver(self):
         """Setup Chrome WebDriver with advanced stealth options."""
         try:
-            chrome_options = Options()
-            
-            # Advanced stealth options
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            # Anti-detection measures
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Additional stealth options
-            chrome_options.add_argument("--disable-extensions-file-access-check")
-            chrome_options.add_argument("--disable-extensions-http-throttling")
-            chrome_options.add_argument("--disable-extensions-except")
-            chrome_options.add_argument("--disable-component-extensions-with-background-pages")
-            chrome_options.add_argument("--disable-default-apps")
-            chrome_options.add_argument("--disable-background-timer-throttling")
-            chrome_options.add_argument("--disable-renderer-backgrounding")
-            chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-            chrome_options.add_argument("--disable-client-side-phishing-detection")
-            chrome_options.add_argument("--disable-sync")
-            chrome_options.add_argument("--metrics-recording-only")
-            chrome_options.add_argument("--no-report-upload")
+            # Base and anti-detection flags come from the 'activity' profile
+            stealth_arguments = [
+                "--disable-extensions-file-access-check",
+                "--disable-extensions-http-throttling",
+                "--disable-extensions-except",
+                "--disable-component-extensions-with-background-pages",
+                "--disable-default-apps",
+                "--disable-background-timer-throttling",
+                "--disable-renderer-backgrounding",
+                "--disable-backgrounding-occluded-windows",
+                "--disable-client-side-phishing-detection",
+                "--disable-sync",
+                "--metrics-recording-only",
+                "--no-report-upload",
+            ]
             
             # User agent randomization
             user_agents = [
@@ -79,11 +65,14 @@ class NaukriStealthActivity:
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             ]
-            chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
             
-            # Setup service
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # navigator.webdriver is patched by stealth_js below, so not by the factory
+            self.driver = create_driver(
+                'activity',
+                extra_arguments=stealth_arguments,
+                user_agent=random.choice(user_agents),
+                hide_webdriver=False
+            )
             
             # Advanced stealth JavaScript execution
             stealth_js = """
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Network Capture Helpers
+Reads Chrome DevTools Protocol network events from the performance log.
+
+Chrome has to be started with performance logging enabled:
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+NetworkCapture then watches for responses whose URL matches one of the
+given patterns and returns their decoded JSON bodies, which lets a
+script read structured data the page itself fetched instead of scraping
+the rendered DOM.
+"""
+
+import json
+import time
+import base64
+
+def enable_performance_logging(options):
+    """Turn on the performance log that carries CDP network events."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+def read_performance_log(driver):
+    """Drain the performance log and return the CDP messages as dicts."""
+    messages = []
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return messages
+
+    for entry in entries:
+        try:
+            messages.append(json.loads(entry['message'])['message'])
+        except (KeyError, ValueError):
+            continue
+    return messages
+
+class NetworkCapture:
+    def __init__(self, driver, url_patterns):
+        """
+        Initialize network capture.
+
+        Args:
+            driver: Selenium Chrome WebDriver started with performance logging
+            url_patterns (list): Substrings identifying the responses to capture
+        """
+        self.driver = driver
+        self.url_patterns = list(url_patterns)
+
+    def enable(self):
+        """Enable the CDP Network domain; returns False if unavailable."""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            return True
+        except Exception as e:
+            print(f"⚠️ Network capture unavailable: {e}")
+            return False
+
+    def reset(self):
+        """Discard events from earlier navigations."""
+        read_performance_log(self.driver)
+
+    def _matches(self, url):
+        return any(pattern in url for pattern in self.url_patterns)
+
+    def _response_body(self, request_id):
+        result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        return body
+
+    def collect_json(self, timeout=10, settle_time=0.5):
+        """
+        Wait for matching responses to finish loading and return their JSON bodies.
+
+        Returns as soon as at least one matching response has finished and no
+        other matching request is still pending for settle_time seconds.
+        """
+        deadline = time.monotonic() + timeout
+        pending = set()
+        finished = []
+        bodies = []
+        last_activity = time.monotonic()
+
+        while time.monotonic() < deadline:
+            for message in read_performance_log(self.driver):
+                method = message.get('method')
+                params = message.get('params', {})
+                request_id = params.get('requestId')
+
+                if method == 'Network.responseReceived':
+                    if self._matches(params.get('response', {}).get('url', '')):
+                        pending.add(request_id)
+                        last_activity = time.monotonic()
+                elif method == 'Network.loadingFinished' and request_id in pending:
+                    pending.discard(request_id)
+                    finished.append(request_id)
+                    last_activity = time.monotonic()
+                elif method == 'Network.loadingFailed' and request_id in pending:
+                    pending.discard(request_id)
+
+            for request_id in finished:
+                try:
+                    bodies.append(json.loads(self._response_body(request_id)))
+                except Exception as e:
+                    print(f"⚠️ Could not read captured response: {str(e)[:100]}")
+            finished = []
+
+            if bodies and not pending and time.monotonic() - last_activity >= settle_time:
+                break
+            time.sleep(0.2)
+
+        return bodies
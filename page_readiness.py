@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Page Readiness Helpers
+Waits on concrete page signals instead of fixed time.sleep() calls.
+
+Each wait returns as soon as its signal is seen, or gives up when its
+timeout budget runs out, so a fast page costs milliseconds instead of
+the worst-case sleep.
+
+Signals:
+    - document.readyState reaching 'complete'
+    - an expected element appearing
+    - network idle (no fetch/XHR in flight and no new resources for a
+      short quiet period)
+    - DOM mutations settling (no mutations for a short quiet period)
+    - a new window/tab opening
+    - an element scrolled into the viewport
+"""
+
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Resolves once no DOM mutation has been seen for arguments[0] ms, or after
+# arguments[1] ms at the latest. Reports whether the DOM actually settled.
+DOM_SETTLED_SCRIPT = """
+const quietMs = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const root = document.documentElement || document;
+let quietTimer = null;
+let finished = false;
+const finish = (settled) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(deadlineTimer);
+    done(settled);
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+quietTimer = setTimeout(() => finish(true), quietMs);
+const deadlineTimer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+# Counts fetch/XHR requests in flight and every resource entry observed.
+# The resource timing buffer stops at 250 entries and never lists pending
+# requests, so its length alone reports idle too early. Idempotent: it is
+# registered for new documents and re-run on each poll.
+NETWORK_TRACKER_SCRIPT = """
+if (!window.__readinessTracker) {
+    const tracker = {inflight: 0, resources: 0};
+    window.__readinessTracker = tracker;
+    const settle = () => { tracker.inflight = Math.max(tracker.inflight - 1, 0); };
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function(...args) {
+            tracker.inflight++;
+            try {
+                return originalFetch.apply(this, args).finally(settle);
+            } catch (error) {
+                settle();
+                throw error;
+            }
+        };
+    }
+    if (window.XMLHttpRequest) {
+        const originalSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function(...args) {
+            tracker.inflight++;
+            this.addEventListener('loadend', settle, {once: true});
+            try {
+                return originalSend.apply(this, args);
+            } catch (error) {
+                this.removeEventListener('loadend', settle);
+                settle();
+                throw error;
+            }
+        };
+    }
+    if (window.PerformanceObserver) {
+        try {
+            new PerformanceObserver((list) => { tracker.resources += list.getEntries().length; })
+                .observe({type: 'resource', buffered: true});
+        } catch (error) {}
+    }
+}
+"""
+
+NETWORK_STATE_SCRIPT = NETWORK_TRACKER_SCRIPT + """
+return [window.__readinessTracker.inflight, window.__readinessTracker.resources];
+"""
+
+ELEMENT_IN_VIEWPORT_SCRIPT = """
+const rect = arguments[0].getBoundingClientRect();
+return rect.bottom > 0 && rect.right > 0
+    && rect.top < (window.innerHeight || document.documentElement.clientHeight)
+    && rect.left < (window.innerWidth || document.documentElement.clientWidth);
+"""
+
+class PageReadiness:
+    def __init__(self, driver, timeout=10, poll_frequency=0.2):
+        """
+        Initialize the readiness helper.
+
+        Args:
+            driver: Selenium WebDriver instance
+            timeout (float): Default timeout budget for each wait in seconds
+            poll_frequency (float): Seconds between polls for polled signals
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.track_network()
+
+    def track_network(self):
+        """Install the request tracker in every new document, before page scripts run (Chrome only)."""
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NETWORK_TRACKER_SCRIPT})
+            return True
+        except (AttributeError, WebDriverException):
+            # No CDP: the tracker is installed on the first poll instead
+            return False
+
+    def _wait(self, timeout):
+        """Create a WebDriverWait for the given budget."""
+        return WebDriverWait(self.driver, max(timeout, 0), poll_frequency=self.poll_frequency)
+
+    def document_ready(self, timeout=None):
+        """Wait for document.readyState to reach 'complete'."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            self._wait(timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == 'complete'
+            )
+            return True
+        except (TimeoutException, WebDriverException):
+            return False
+
+    def element_present(self, selector, timeout=None, by=By.CSS_SELECTOR):
+        """Wait for an element to appear; returns the element or None."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return self._wait(timeout).until(EC.presence_of_element_located((by, selector)))
+        except (TimeoutException, WebDriverException):
+            return None
+
+    def network_idle(self, idle_time=0.5, timeout=None):
+        """Wait until no fetch/XHR is in flight and no new resource has loaded for idle_time seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        last_count = None
+        quiet_since = time.monotonic()
+
+        while time.monotonic() < deadline:
+            try:
+                inflight, count = self.driver.execute_script(NETWORK_STATE_SCRIPT)
+            except WebDriverException:
+                return False
+
+            now = time.monotonic()
+            if inflight or count != last_count:
+                last_count = count
+                quiet_since = now
+            elif now - quiet_since >= idle_time:
+                return True
+            time.sleep(self.poll_frequency)
+
+        return False
+
+    def dom_settled(self, quiet_time=0.5, timeout=None):
+        """Wait until the DOM has not mutated for quiet_time seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        if timeout <= 0:
+            return False
+        previous_timeout = None
+        try:
+            previous_timeout = self.driver.timeouts.script
+            # The async script needs a little headroom over its own deadline
+            self.driver.set_script_timeout(timeout + 2)
+            return bool(self.driver.execute_async_script(
+                DOM_SETTLED_SCRIPT, int(quiet_time * 1000), int(timeout * 1000)
+            ))
+        except (TimeoutException, WebDriverException):
+            return False
+        finally:
+            if previous_timeout is not None:
+                try:
+                    self.driver.set_script_timeout(previous_timeout)
+                except WebDriverException:
+                    pass
+
+    def window_opened(self, previous_handles, timeout=None):
+        """Wait for a new window/tab to appear after previous_handles was taken."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            self._wait(timeout).until(EC.new_window_is_opened(list(previous_handles)))
+            return True
+        except (TimeoutException, WebDriverException):
+            return False
+
+    def element_in_viewport(self, element, timeout=None):
+        """Wait for an element to be scrolled into the viewport."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            self._wait(timeout).until(
+                lambda driver: driver.execute_script(ELEMENT_IN_VIEWPORT_SCRIPT, element)
+            )
+            return True
+        except (TimeoutException, WebDriverException):
+            return False
+
+    def page_ready(self, selector=None, timeout=None, network_idle=True, dom_settled=False):
+        """
+        Wait for a page to become usable within a single timeout budget.
+
+        Checks readyState first, then the expected element (if any), then
+        network idle and DOM settling. Each step only gets whatever budget
+        the previous steps left over.
+
+        Returns:
+            tuple: (ready, elapsed_seconds)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        remaining = lambda: max(deadline - time.monotonic(), 0)
+
+        ready = self.document_ready(remaining())
+        if ready and selector:
+            ready = self.element_present(selector, remaining()) is not None
+        if ready and network_idle:
+            ready = self.network_idle(timeout=remaining())
+        if ready and dom_settled:
+            ready = self.dom_settled(timeout=remaining())
+
+        return ready, time.monotonic() - start
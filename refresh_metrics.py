@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Refresh Metrics
+Per-refresh timing and HTTP status, with Prometheus and CSV export.
+
+After every load or refresh, RefreshMetrics reads the Navigation Timing
+entry (TTFB, DOMContentLoaded, load) and a Resource Timing summary from
+the page, and takes the main document's HTTP status from the CDP events
+in the performance log (see network_capture.py). A 4xx/5xx status means
+the refresh failed even though the browser loaded a page.
+
+Samples are kept in an in-process ring buffer. export() writes:
+    - a Prometheus text-format file (for node_exporter's textfile
+      collector) with per-URL latency quantiles and refresh/failure counts
+    - a CSV with per-URL percentiles of each metric
+"""
+
+import io
+import os
+import csv
+import time
+from collections import deque
+
+# Returns navigation timing (ms since navigation start) and a resource summary
+NAVIGATION_TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) return null;
+const resources = performance.getEntriesByType('resource');
+let resourceBytes = 0;
+let slowest = 0;
+for (const entry of resources) {
+    resourceBytes += entry.transferSize || 0;
+    slowest = Math.max(slowest, entry.duration);
+}
+return {
+    ttfb: nav.responseStart - nav.startTime,
+    dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+    load: nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+    document_bytes: nav.transferSize || 0,
+    status: nav.responseStatus || null,
+    resource_count: resources.length,
+    resource_bytes: resourceBytes,
+    slowest_resource: slowest
+};
+"""
+
+# (sample field, Prometheus metric name, help text, scale from sample units)
+EXPORTED_METRICS = (
+    ('ttfb', 'refresh_ttfb_seconds', 'Time to first byte of the main document', 0.001),
+    ('dom_content_loaded', 'refresh_dom_content_loaded_seconds', 'Time until DOMContentLoaded finished', 0.001),
+    ('load', 'refresh_load_seconds', 'Time until the load event finished', 0.001),
+    ('transfer_bytes', 'refresh_transfer_bytes', 'Bytes transferred for the document and its resources', 1),
+)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+def main_frame_id(driver):
+    """CDP frame id of the current tab's main frame, or None without CDP."""
+    try:
+        return driver.execute_cdp_cmd('Page.getFrameTree', {})['frameTree']['frame']['id']
+    except Exception:
+        return None
+
+def document_status(messages, frame_id=None, url=None):
+    """
+    Find the main document's HTTP status in CDP network events.
+
+    The last Document response for the tab's main frame (a CDP frame id,
+    see main_frame_id) wins, so redirects resolve to their final status;
+    without a frame match, the last Document response for the page URL
+    is used.
+    """
+    by_frame = None
+    by_url = None
+    for message in messages:
+        if message.get('method') != 'Network.responseReceived':
+            continue
+        params = message.get('params', {})
+        if params.get('type') != 'Document':
+            continue
+        response = params.get('response', {})
+        if frame_id and params.get('frameId') == frame_id:
+            by_frame = response.get('status')
+        elif url and response.get('url') == url:
+            by_url = response.get('status')
+    status = by_frame if by_frame is not None else by_url
+    return int(status) if status is not None else None
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RefreshMetrics:
+    def __init__(self, history=1000, prometheus_path='refresh_metrics.prom', csv_path='refresh_metrics.csv'):
+        """
+        Initialize the metrics store.
+
+        Args:
+            history (int): Number of samples kept in the ring buffer
+            prometheus_path (str): Prometheus text-format output file (None to skip)
+            csv_path (str): Per-URL percentile CSV output file (None to skip)
+        """
+        self.samples = deque(maxlen=history)
+        self.prometheus_path = prometheus_path
+        self.csv_path = csv_path
+        self.totals = {}
+
+    def collect(self, driver, url, messages):
+        """
+        Measure the page just loaded in the current tab and record a sample.
+
+        Args:
+            driver: Selenium WebDriver
+            url (str): URL the sample is filed under
+            messages (list): CDP messages drained from the performance log
+        """
+        try:
+            timing = driver.execute_script(NAVIGATION_TIMING_SCRIPT) or {}
+        except Exception:
+            timing = {}
+        frame_id = main_frame_id(driver)
+        try:
+            current_url = driver.current_url
+        except Exception:
+            current_url = url
+
+        status = document_status(messages, frame_id, current_url) or timing.get('status')
+        sample = {
+            'time': time.time(),
+            'url': url,
+            'status': status,
+            'ttfb': timing.get('ttfb'),
+            'dom_content_loaded': timing.get('dom_content_loaded'),
+            'load': timing.get('load'),
+            'transfer_bytes': timing.get('document_bytes', 0) + timing.get('resource_bytes', 0) if timing else None,
+            'resource_count': timing.get('resource_count'),
+            'slowest_resource': timing.get('slowest_resource'),
+        }
+        sample['ok'] = status is None or status < 400
+        self.record(sample)
+        return sample
+
+    def record(self, sample):
+        """Add a sample to the ring buffer and the running totals."""
+        self.samples.append(sample)
+        totals = self.totals.setdefault(sample['url'], {'refreshes': 0, 'failures': 0, 'last_status': None})
+        totals['refreshes'] += 1
+        if not sample['ok']:
+            totals['failures'] += 1
+        if sample['status'] is not None:
+            totals['last_status'] = sample['status']
+
+    def percentiles(self, url, field):
+        """Percentiles of one field for one URL over the buffered samples."""
+        values = sorted(sample[field] for sample in self.samples if sample['url'] == url and sample[field] is not None)
+        if not values:
+            return None
+        stats = {f'p{int(q * 100)}': percentile(values, q) for q in QUANTILES}
+        stats.update({'count': len(values), 'sum': sum(values), 'max': values[-1]})
+        return stats
+
+    def format_sample(self, sample):
+        """One-line timing summary for a refresh."""
+        parts = [f"HTTP {sample['status']}" if sample['status'] else "HTTP ?"]
+        for field, label in (('ttfb', 'TTFB'), ('dom_content_loaded', 'DCL'), ('load', 'load')):
+            if sample[field] is not None:
+                parts.append(f"{label} {sample[field]:.0f}ms")
+        if sample['transfer_bytes'] is not None:
+            parts.append(f"{sample['transfer_bytes'] // 1024} KB")
+        return ', '.join(parts)
+
+    def _write_atomic(self, path, text):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', newline='') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def prometheus_text(self):
+        """Render every URL's metrics in Prometheus text exposition format."""
+        lines = []
+        for field, name, help_text, scale in EXPORTED_METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for url in self.totals:
+                stats = self.percentiles(url, field)
+                if not stats:
+                    continue
+                label = _label(url)
+                for q in QUANTILES:
+                    lines.append(f'{name}{{url="{label}",quantile="{q}"}} {stats[f"p{int(q * 100)}"] * scale:g}')
+                lines.append(f'{name}_sum{{url="{label}"}} {stats["sum"] * scale:g}')
+                lines.append(f'{name}_count{{url="{label}"}} {stats["count"]}')
+
+        for name, key, help_text, kind in (
+            ('refresh_total', 'refreshes', 'Refreshes performed', 'counter'),
+            ('refresh_failures_total', 'failures', 'Refreshes that returned an HTTP error status', 'counter'),
+            ('refresh_last_status', 'last_status', 'HTTP status of the most recent refresh', 'gauge'),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for url, totals in self.totals.items():
+                if totals[key] is not None:
+                    lines.append(f'{name}{{url="{_label(url)}"}} {totals[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def csv_text(self):
+        """Render per-URL percentiles of every metric as CSV."""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['url', 'metric', 'count', 'p50', 'p90', 'p99', 'max', 'refreshes', 'failures', 'last_status'])
+        for url, totals in self.totals.items():
+            for field, _, _, _ in EXPORTED_METRICS:
+                stats = self.percentiles(url, field)
+                if stats:
+                    writer.writerow([url, field, stats['count'], round(stats['p50'], 1), round(stats['p90'], 1),
+                                     round(stats['p99'], 1), round(stats['max'], 1),
+                                     totals['refreshes'], totals['failures'], totals['last_status']])
+        return output.getvalue()
+
+    def export(self):
+        """Write the Prometheus and CSV files."""
+        if self.prometheus_path:
+            self._write_atomic(self.prometheus_path, self.prometheus_text())
+        if self.csv_path:
+            self._write_atomic(self.csv_path, self.csv_text())
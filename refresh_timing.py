@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Refresh Timing
+Drift-free, fixed-cadence refresh scheduling on time.monotonic().
+
+Sleeping for the full interval after each refresh makes the real period
+interval + refresh time + retry delays, so the schedule slowly drifts.
+RefreshTicker instead keeps absolute deadlines on a fixed grid
+(start + n * interval) and sleeps only until the next one.
+
+When a refresh overruns one or more whole intervals, the missed-tick
+policy decides what happens:
+    - 'skip':     drop the missed ticks and wait for the next grid point
+    - 'coalesce': fold all missed ticks into one immediate refresh, then
+                  continue from the next grid point after it
+
+Lateness (how long after its deadline each tick actually fired) is
+recorded for every tick.
+
+AdaptiveIntervalPolicy moves the interval with the page's observed change
+rate: a refresh that found new content halves the interval, and every
+unchanged refresh backs it off exponentially, always within the
+configured bounds. The learned interval is persisted per URL, so the next
+run starts where the last one left off.
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from json_state import load_state, save_state
+
+MISSED_TICK_POLICIES = ('skip', 'coalesce')
+
+class RefreshTicker:
+    def __init__(self, interval, missed_tick_policy='skip', history=1000,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the ticker; the first tick is one interval from now.
+
+        Args:
+            interval (float): Refresh period in seconds
+            missed_tick_policy (str): 'skip' or 'coalesce'
+            history (int): Number of lateness samples to keep
+            clock (callable): Monotonic time source in seconds
+            sleep (callable): Function used to wait for a deadline
+        """
+        if missed_tick_policy not in MISSED_TICK_POLICIES:
+            raise ValueError(f"missed_tick_policy must be one of {MISSED_TICK_POLICIES}")
+        self.interval = interval
+        self.missed_tick_policy = missed_tick_policy
+        self.clock = clock
+        self.sleep = sleep
+        self.next_due = clock() + interval
+        self.lateness = deque(maxlen=history)
+        self.ticks = 0
+        self.missed_ticks = 0
+
+    def set_interval(self, interval):
+        """Change the period; the grid restarts from the current deadline."""
+        self.next_due += interval - self.interval
+        self.interval = interval
+
+    def wait(self):
+        """Sleep until the next deadline, then record the tick; returns its lateness."""
+        self.skip_missed()
+        delay = self.next_due - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+        return self.tick()
+
+    def skip_missed(self):
+        """
+        Under 'skip', move a deadline overrun by a whole interval to the next grid point.
+
+        Returns:
+            bool: True if the deadline moved, so nothing should fire yet
+        """
+        overrun = self.clock() - self.next_due
+        if self.missed_tick_policy != 'skip' or overrun < self.interval:
+            return False
+        # The current deadline and every grid point up to now never fire
+        missed = int(overrun // self.interval) + 1
+        self.missed_ticks += missed
+        self.next_due += missed * self.interval
+        return True
+
+    def tick(self):
+        """Record a tick at the current time and schedule the next deadline."""
+        now = self.clock()
+        due = self.next_due
+        lateness = max(now - due, 0.0)
+        self.lateness.append(lateness)
+        self.ticks += 1
+
+        # Grid points passed while this tick was overdue are folded into it
+        missed = int(lateness // self.interval)
+        self.missed_ticks += missed
+        self.next_due = due + (missed + 1) * self.interval
+        return lateness
+
+    def stats(self):
+        """Summarize recorded lateness in seconds."""
+        samples = sorted(self.lateness)
+        if not samples:
+            return {'ticks': 0, 'missed': self.missed_ticks, 'mean': 0.0, 'p95': 0.0, 'max': 0.0}
+        return {
+            'ticks': self.ticks,
+            'missed': self.missed_ticks,
+            'mean': sum(samples) / len(samples),
+            'p95': samples[min(int(len(samples) * 0.95), len(samples) - 1)],
+            'max': samples[-1]
+        }
+
+    def summary(self):
+        """One-line human-readable lateness summary."""
+        stats = self.stats()
+        return (f"⏱️  Ticks: {stats['ticks']}, missed: {stats['missed']}, "
+                f"lateness mean {stats['mean'] * 1000:.0f}ms / p95 {stats['p95'] * 1000:.0f}ms / max {stats['max'] * 1000:.0f}ms")
+
+class AdaptiveIntervalPolicy:
+    def __init__(self, url, min_interval, max_interval, initial_interval=None,
+                 backoff=1.5, speedup=0.5, path='adaptive_intervals.json'):
+        """
+        Initialize the policy; a persisted interval for the URL takes precedence.
+
+        Args:
+            url (str): URL the state is stored under
+            min_interval (float): Shortest allowed interval in seconds
+            max_interval (float): Longest allowed interval in seconds
+            initial_interval (float): Starting interval when nothing is persisted
+            backoff (float): Factor applied after a refresh with no change
+            speedup (float): Factor applied after a refresh that found a change
+            path (str): JSON file holding per-URL state
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Adaptive interval bounds must satisfy 0 < min_interval <= max_interval")
+        self.url = url
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.speedup = speedup
+        self.path = path
+        self.urls = {}
+        self.dirty = False
+        self.load()
+
+        state = self.urls.get(url)
+        if state is None:
+            state = {'interval': initial_interval or min_interval, 'changes': 0, 'unchanged': 0}
+            self.urls[url] = state
+        self.state = state
+        self.state['interval'] = self._clamp(state['interval'])
+
+    @property
+    def interval(self):
+        """Current interval in seconds."""
+        return self.state['interval']
+
+    def _clamp(self, interval):
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def load(self):
+        """Load per-URL state from disk."""
+        self.urls = load_state(self.path, 'urls', 'adaptive interval state')
+
+    def save(self):
+        """Save per-URL state to disk if anything changed."""
+        if not self.dirty:
+            return
+        if save_state(self.path, 'urls', self.urls, 'adaptive interval state'):
+            self.dirty = False
+
+    def observe(self, changed):
+        """
+        Record whether the last refresh found new content.
+
+        Returns:
+            float: The interval to use from now on, in seconds
+        """
+        if changed:
+            self.state['changes'] += 1
+            interval = self.state['interval'] * self.speedup
+        else:
+            self.state['unchanged'] += 1
+            interval = self.state['interval'] * self.backoff
+        self.state['interval'] = self._clamp(interval)
+        self.state['last_observed'] = datetime.now().isoformat()
+        self.dirty = True
+        return self.state['interval']
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Resource Blocking
+Stops refreshes from re-downloading resources nobody looks at.
+
+A resource policy names resource types (images, fonts, media,
+stylesheets, analytics) and extra URL patterns to block. The types are
+expanded into URL patterns and handed to Chrome with the CDP command
+Network.setBlockedURLs, so blocked requests fail inside the browser
+before they reach the network.
+
+ResourceBlocker also measures what a refresh cost: it reads the CDP
+network events from the performance log (see network_capture.py) and
+counts requests, transferred bytes and blocked requests. Savings are
+reported against a warm, unblocked reload rather than the cold first
+load, so what the HTTP cache saves is not credited to blocking.
+
+Policies live in CONFIG['resource_policies'], keyed by URL prefix:
+    'resource_policies': {
+        '*': {'block_types': ['analytics']},
+        'https://www.example.com': {'block_types': ['image', 'font', 'media'],
+                                    'block_patterns': ['*adservice*']},
+    }
+"""
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) for each resource type
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*'],
+    'font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*.ogg*', '*.wav*'],
+    'stylesheet': ['*.css*'],
+    'analytics': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*facebook.net*', '*hotjar.com*', '*clarity.ms*', '*segment.io*'
+    ],
+}
+
+def resource_policy_for(url, policies):
+    """Return the policy with the longest URL prefix matching url ('*' is the fallback)."""
+    best = None
+    for prefix, policy in (policies or {}).items():
+        if prefix != '*' and url.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    if best is not None:
+        return policies[best]
+    return (policies or {}).get('*')
+
+def blocked_url_patterns(policy):
+    """Expand a policy's resource types and extra patterns into URL patterns."""
+    patterns = []
+    for resource_type in policy.get('block_types', []):
+        if resource_type not in RESOURCE_TYPE_PATTERNS:
+            raise ValueError(f"Unknown resource type '{resource_type}' (choose from {sorted(RESOURCE_TYPE_PATTERNS)})")
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    patterns.extend(policy.get('block_patterns', []))
+    return list(dict.fromkeys(patterns))
+
+def format_bytes(count):
+    """Human-readable byte count."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(count) < 1024:
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+def measure_network(messages):
+    """
+    Summarize CDP network events from one page load.
+
+    Returns:
+        dict: requests sent, requests finished, bytes transferred, requests blocked
+    """
+    stats = {'requests': 0, 'finished': 0, 'bytes': 0, 'blocked': 0}
+    for message in messages:
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            stats['requests'] += 1
+        elif method == 'Network.loadingFinished':
+            stats['finished'] += 1
+            stats['bytes'] += int(params.get('encodedDataLength', 0))
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            stats['blocked'] += 1
+    return stats
+
+class ResourceBlocker:
+    def __init__(self, driver, policy):
+        """
+        Initialize the blocker.
+
+        Args:
+            driver: Selenium Chrome WebDriver
+            policy (dict): {'block_types': [...], 'block_patterns': [...]}
+        """
+        self.driver = driver
+        self.patterns = blocked_url_patterns(policy)
+        self.baseline = None
+        self.totals = {'refreshes': 0, 'blocked': 0, 'bytes': 0, 'bytes_saved': 0}
+
+    def enable(self):
+        """Start blocking in the current tab; returns False if CDP is unavailable."""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+            return True
+        except Exception as e:
+            print(f"⚠️ Resource blocking unavailable: {e}")
+            return False
+
+    def disable(self):
+        """Stop blocking in the current tab."""
+        try:
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        except Exception:
+            pass
+
+    def record_baseline(self, messages):
+        """Use a warm, unblocked reload's network events as the comparison baseline."""
+        self.baseline = measure_network(messages)
+        return self.baseline
+
+    def record_refresh(self, messages):
+        """
+        Measure a blocked refresh against the baseline.
+
+        Returns:
+            dict: measure_network() fields plus bytes_saved and requests_saved
+        """
+        stats = measure_network(messages)
+        baseline = self.baseline or stats
+        stats['bytes_saved'] = max(baseline['bytes'] - stats['bytes'], 0)
+        stats['requests_saved'] = max(baseline['finished'] - stats['finished'], 0)
+
+        self.totals['refreshes'] += 1
+        self.totals['blocked'] += stats['blocked']
+        self.totals['bytes'] += stats['bytes']
+        self.totals['bytes_saved'] += stats['bytes_saved']
+        return stats
+
+    def format_refresh(self, stats):
+        """One-line report for a single refresh."""
+        return (f"🚫 Blocked {stats['blocked']} requests, transferred {format_bytes(stats['bytes'])} "
+                f"in {stats['finished']} requests (saved {format_bytes(stats['bytes_saved'])} "
+                f"and {stats['requests_saved']} requests vs. warm unblocked load)")
+
+    def summary(self):
+        """One-line report for the whole run."""
+        totals = self.totals
+        return (f"🚫 {totals['refreshes']} refreshes: {totals['blocked']} requests blocked, "
+                f"{format_bytes(totals['bytes'])} transferred, {format_bytes(totals['bytes_saved'])} saved")
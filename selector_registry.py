@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Selector Registry
+Learns which CSS selectors currently match the site's markup.
+
+Each selector group (job cards, titles, companies, ...) keeps hit/miss
+counts and lookup latency per selector. Stats are saved to disk between
+runs so the selectors that have been winning are tried first. When a
+different selector starts winning a group, the old counts are decayed
+so the ranking adapts quickly to markup changes; that switch is also
+logged, which makes site drift visible.
+"""
+
+from json_state import load_state, save_state
+
+class SelectorRegistry:
+    def __init__(self, path='selector_stats.json', decay=0.5):
+        """
+        Initialize the selector registry.
+
+        Args:
+            path (str): JSON file used to persist stats between runs
+            decay (float): Factor applied to a group's counts when a new winner appears
+        """
+        self.path = path
+        self.decay = decay
+        self.groups = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load selector stats from disk."""
+        self.groups = load_state(self.path, 'groups', 'selector stats')
+
+    def save(self):
+        """Save selector stats to disk if anything changed."""
+        if not self.dirty:
+            return
+        if save_state(self.path, 'groups', self.groups, 'selector stats'):
+            self.dirty = False
+
+    def _group(self, group):
+        return self.groups.setdefault(group, {'winner': None, 'selectors': {}})
+
+    def _score(self, stats):
+        # Laplace-smoothed hit rate, so unseen selectors sit at 0.5
+        return (stats['hits'] + 1) / (stats['hits'] + stats['misses'] + 2)
+
+    def rank(self, group, selectors):
+        """Return selectors ordered by hit rate, then latency, then original order."""
+        known = self._group(group)['selectors']
+        empty = {'hits': 0, 'misses': 0, 'latency_total': 0.0, 'latency_count': 0}
+
+        def sort_key(item):
+            index, selector = item
+            stats = known.get(selector, empty)
+            latency = stats['latency_total'] / stats['latency_count'] if stats['latency_count'] else 0.0
+            return (-self._score(stats), latency, index)
+
+        return [selector for _, selector in sorted(enumerate(selectors), key=sort_key)]
+
+    def record(self, group, selector, hit, latency=None):
+        """Record a lookup result for a selector; latency is in seconds."""
+        entry = self._group(group)
+        stats = entry['selectors'].setdefault(
+            selector, {'hits': 0, 'misses': 0, 'latency_total': 0.0, 'latency_count': 0}
+        )
+
+        if hit:
+            stats['hits'] += 1
+        else:
+            stats['misses'] += 1
+        if latency is not None:
+            stats['latency_total'] += latency
+            stats['latency_count'] += 1
+        self.dirty = True
+
+        # A selector becomes the winner once it overtakes the current one
+        winner = entry['winner']
+        if hit and winner != selector:
+            winner_stats = entry['selectors'].get(winner)
+            if winner_stats is None:
+                entry['winner'] = selector
+            elif stats['hits'] > winner_stats['hits']:
+                print(f"🔀 Selector drift in '{group}': {winner} → {selector}")
+                for other in entry['selectors'].values():
+                    if other is not stats:
+                        other['hits'] *= self.decay
+                        other['misses'] *= self.decay
+                entry['winner'] = selector
+
+    def record_match(self, group, ranked_selectors, matched_index):
+        """Record one lookup that tried ranked_selectors in order and stopped at matched_index (-1 for none)."""
+        tried = ranked_selectors if matched_index < 0 else ranked_selectors[:matched_index + 1]
+        for index, selector in enumerate(tried):
+            self.record(group, selector, index == matched_index)
+
+    def summary(self, group):
+        """Return (selector, hits, misses) tuples for a group, best first."""
+        known = self._group(group)['selectors']
+        ranked = self.rank(group, list(known))
+        return [(selector, known[selector]['hits'], known[selector]['misses']) for selector in ranked]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Session Snapshot
+Keeps a Naukri login without loading the whole personal Chrome profile.
+
+Pointing Chrome at the full personal profile just to stay logged in makes
+it load history, extensions and caches (tens of seconds), and fails while
+the user's own Chrome is open. Only a handful of cookies and localStorage
+entries actually carry the login, so SessionSnapshot exports those for
+naukri.com into a small JSON file and restores them into a fresh,
+minimal profile:
+
+    - cookies are read and written through CDP (Network.getAllCookies /
+      Network.setCookies), which includes HttpOnly cookies
+    - localStorage is read from a naukri.com page and written back after
+      a lightweight same-origin navigation
+
+The snapshot is refreshed whenever the cookie values change (sessions
+rotate their tokens), so the saved copy stays valid. Cookies that have
+already expired are not restored, and a snapshot that no longer logs in
+should be deleted so the caller can bootstrap a new one. The file holds live
+session tokens and is written with owner-only permissions.
+"""
+
+import os
+import json
+import time
+import hashlib
+from datetime import datetime
+from urllib.parse import urlparse
+
+LOCAL_STORAGE_EXPORT_SCRIPT = """
+const items = {};
+for (let i = 0; i < localStorage.length; i++) {
+    const key = localStorage.key(i);
+    items[key] = localStorage.getItem(key);
+}
+return items;
+"""
+
+LOCAL_STORAGE_IMPORT_SCRIPT = """
+const items = arguments[0];
+for (const [key, value] of Object.entries(items)) {
+    localStorage.setItem(key, value);
+}
+return Object.keys(items).length;
+"""
+
+# Fields Network.setCookies accepts from a captured cookie
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+class SessionSnapshot:
+    def __init__(self, path='naukri_session.json', domain='naukri.com', origin='https://www.naukri.com'):
+        """
+        Initialize the snapshot.
+
+        Args:
+            path (str): File the snapshot is stored in
+            domain (str): Cookies for this domain and its subdomains are kept
+            origin (str): Origin whose localStorage is kept
+        """
+        self.path = path
+        self.domain = domain
+        self.origin = origin
+        self.fingerprint = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def delete(self):
+        """Remove a stale snapshot."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.fingerprint = None
+
+    def load(self):
+        """Read the snapshot file; returns None if missing or unreadable."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.fingerprint = data.get('fingerprint')
+            return data
+        except (OSError, ValueError):
+            return None
+
+    def _matches_domain(self, cookie_domain):
+        cookie_domain = (cookie_domain or '').lstrip('.')
+        return cookie_domain == self.domain or cookie_domain.endswith('.' + self.domain)
+
+    def read_cookies(self, driver):
+        """Current cookies for the domain, in Network.setCookies form."""
+        try:
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+        except Exception:
+            # Only sees the current page's cookies, but better than nothing
+            cookies = [dict(cookie, expires=cookie.get('expiry')) for cookie in driver.get_cookies()]
+
+        kept = []
+        for cookie in cookies:
+            if not self._matches_domain(cookie.get('domain')):
+                continue
+            compact = {field: cookie[field] for field in COOKIE_FIELDS if cookie.get(field) not in (None, '')}
+            if cookie.get('session') or compact.get('expires', 0) <= 0:
+                compact.pop('expires', None)
+            kept.append(compact)
+        return kept
+
+    def cookies_fingerprint(self, cookies):
+        """Hash of cookie names and values; changes when the session rotates."""
+        pairs = sorted((cookie['domain'], cookie['name'], cookie['value']) for cookie in cookies)
+        return hashlib.sha256(json.dumps(pairs).encode('utf-8')).hexdigest()
+
+    def _on_origin(self, driver):
+        try:
+            return urlparse(driver.current_url).netloc == urlparse(self.origin).netloc
+        except Exception:
+            return False
+
+    def save(self, driver, cookies=None):
+        """Export cookies (and localStorage, when on the origin) to the snapshot file."""
+        cookies = cookies if cookies is not None else self.read_cookies(driver)
+        previous = self.load() or {}
+        local_storage = previous.get('local_storage', {})
+        if self._on_origin(driver):
+            local_storage = driver.execute_script(LOCAL_STORAGE_EXPORT_SCRIPT) or {}
+
+        data = {
+            'saved': datetime.now().isoformat(),
+            'origin': self.origin,
+            'fingerprint': self.cookies_fingerprint(cookies),
+            'cookies': cookies,
+            'local_storage': local_storage,
+        }
+        tmp_path = self.path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.fingerprint = data['fingerprint']
+        return len(cookies)
+
+    def restore(self, driver):
+        """
+        Load the snapshot into a fresh browser profile.
+
+        Returns:
+            int: Number of cookies restored (0 if there is no snapshot or every cookie expired)
+        """
+        data = self.load()
+        if not data:
+            return 0
+        now = time.time()
+        # Session cookies carry no 'expires'
+        cookies = [cookie for cookie in data.get('cookies', []) if cookie.get('expires', now + 1) > now]
+        if not cookies:
+            return 0
+
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+
+        if data.get('local_storage'):
+            # localStorage is per origin: visit a small page on it first
+            driver.get(self.origin.rstrip('/') + '/robots.txt')
+            driver.execute_script(LOCAL_STORAGE_IMPORT_SCRIPT, data['local_storage'])
+        return len(cookies)
+
+    def refresh_if_rotated(self, driver):
+        """Re-save the snapshot if the session cookies changed; returns True if saved."""
+        cookies = self.read_cookies(driver)
+        if not cookies or self.cookies_fingerprint(cookies) == self.fingerprint:
+            return False
+        self.save(driver, cookies)
+        return True
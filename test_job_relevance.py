@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Regression tests for RelevanceMatcher's term boundaries.
+
+Usage:
+    python -m pytest test_job_relevance.py
+"""
+
+from job_relevance import RelevanceMatcher
+
+def make_matcher():
+    return RelevanceMatcher(
+        ['ios', 'swift', 'mobile app', 'mobile application'],
+        ['java', 'intern']
+    )
+
+def test_include_term_matches_as_prefix():
+    result = make_matcher().score('SwiftUI Developer')
+    assert result.included == ['swift']
+    assert result.is_relevant
+
+def test_include_phrase_matches_plural():
+    result = make_matcher().score('Engineer for Mobile Apps')
+    assert result.included == ['mobile app']
+    assert result.is_relevant
+
+def test_exclude_term_needs_whole_word():
+    matcher = make_matcher()
+    assert matcher.score('iOS and JavaScript Developer').is_relevant
+    assert matcher.score('International iOS Team Lead').is_relevant
+    assert matcher.score('iOS and Java Developer').excluded == ['java']
+
+def test_batch_matches_single_scoring():
+    matcher = make_matcher()
+    titles = ['SwiftUI Developer', 'Mobile Apps Lead', 'Java Intern', 'Designer']
+    batch = matcher.score_batch([{'title': title} for title in titles])
+    assert batch == [matcher.score(title) for title in titles]
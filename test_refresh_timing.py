@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Fake-clock tests for RefreshTicker's missed-tick policies.
+
+Usage:
+    python -m pytest test_refresh_timing.py
+"""
+
+from refresh_timing import RefreshTicker
+
+class FakeClock:
+    """Monotonic clock that only moves when slept on or advanced."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def run_ticker(policy, refresh_durations):
+    """Fire ticks at interval=60, each followed by a refresh of the given duration; return fire times."""
+    clock = FakeClock()
+    ticker = RefreshTicker(60, policy, clock=clock, sleep=clock.sleep)
+    fired = []
+    for duration in refresh_durations:
+        ticker.wait()
+        fired.append(clock.now)
+        clock.now += duration
+    return fired, ticker
+
+def test_skip_waits_for_next_grid_slot():
+    # The refresh at 120 runs until 270, overrunning the 180 and 240 slots
+    fired, ticker = run_ticker('skip', [1, 150, 1, 1, 1])
+    assert fired == [60, 120, 300, 360, 420]
+    assert ticker.missed_ticks == 2
+
+def test_coalesce_fires_once_then_resumes_grid():
+    fired, ticker = run_ticker('coalesce', [1, 150, 1, 1, 1])
+    assert fired == [60, 120, 270, 300, 360]
+    assert ticker.missed_ticks == 1
+
+def test_late_tick_within_interval_still_fires():
+    fired, ticker = run_ticker('skip', [1, 90, 1, 1])
+    assert fired == [60, 120, 210, 240]
+    assert ticker.missed_ticks == 0
@@ -9,7 +9,7 @@ import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import DriverResolver
 
 def test_webdriver_setup():
     print("🔧 WebDriver Diagnostic Test")
@@ -27,12 +27,16 @@ def test_webdriver_setup():
         chrome_options.add_argument('--window-size=1920,1080')
         print("✅ Chrome options configured")
         
-        print("\nStep 3: Installing/updating ChromeDriver...")
+        print("\nStep 3: Resolving ChromeDriver...")
         try:
-            driver_path = ChromeDriverManager().install()
-            print(f"✅ ChromeDriver installed at: {driver_path}")
+            driver_path, info = DriverResolver().resolve()
+            if driver_path:
+                print(f"✅ ChromeDriver for Chrome {info['chrome_version']} from {info['source']}: {driver_path} "
+                      f"({info['elapsed'] * 1000:.0f}ms)")
+            else:
+                print(f"⚠️ No ChromeDriver found ({info['elapsed'] * 1000:.0f}ms), Selenium Manager will locate one")
         except Exception as e:
-            print(f"❌ ChromeDriver installation failed: {e}")
+            print(f"❌ ChromeDriver resolution failed: {e}")
             return False
         
         print("\nStep 4: Creating WebDriver service...")